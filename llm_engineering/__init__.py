@@ -1,4 +1,14 @@
-from llm_engineering import application, domain, infrastructure
+import importlib
+from typing import Any
+
 from llm_engineering.settings import settings
 
 __all__ = ["settings", "application", "domain", "infrastructure"]
+
+
+def __getattr__(name: str) -> Any:
+    # The subpackages are imported on first use to keep `import llm_engineering` fast.
+    if name in {"application", "domain", "infrastructure"}:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 import time
 from abc import ABC, abstractmethod
+from functools import cache
 from tempfile import mkdtemp
 
 import chromedriver_autoinstaller
@@ -8,10 +9,13 @@ from selenium.webdriver.chrome.options import Options
 
 from llm_engineering.domain.documents import NoSQLBaseDocument
 
-# Check if the current version of chromedriver exists
-# and if it doesn't exist, download it automatically,
-# then add chromedriver to path
-chromedriver_autoinstaller.install()
+
+@cache
+def install_chromedriver() -> None:
+    # Check if the current version of chromedriver exists
+    # and if it doesn't exist, download it automatically,
+    # then add chromedriver to path
+    chromedriver_autoinstaller.install()
 
 
 class BaseCrawler(ABC):
@@ -23,6 +27,8 @@ class BaseCrawler(ABC):
 
 class BaseSeleniumCrawler(BaseCrawler, ABC):
     def __init__(self, scroll_limit: int = 5) -> None:
+        install_chromedriver()
+
         options = webdriver.ChromeOptions()
 
         options.add_argument("--no-sandbox")
@@ -1,3 +1,14 @@
+from .batcher import EmbeddingMicroBatcher
+from .cache import EmbeddingCache
 from .embeddings import CrossEncoderModelSingleton, EmbeddingModelSingleton
+from .onnx_backend import InferenceBackend
+from .pool import EmbeddingProcessPool
 
-__all__ = ["EmbeddingModelSingleton", "CrossEncoderModelSingleton"]
+__all__ = [
+    "EmbeddingCache",
+    "EmbeddingMicroBatcher",
+    "EmbeddingModelSingleton",
+    "CrossEncoderModelSingleton",
+    "EmbeddingProcessPool",
+    "InferenceBackend",
+]
@@ -0,0 +1,131 @@
+import queue
+import time
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Callable
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent embedding requests into a single forward pass.
+
+    Requests are collected until `max_batch_size` texts are queued or `max_wait_ms` passed since the first queued
+    request. While a batch is being encoded, new requests accumulate in the queue, so under load the batches grow
+    naturally, while a request arriving on an idle batcher waits at most `max_wait_ms`.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], NDArray[np.float32]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        assert max_batch_size > 0, f"'max_batch_size' should be greater than 0. Got {max_batch_size}."
+
+        self._encode = encode
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_ms / 1000
+
+        self._queue: queue.Queue[tuple[str, Future] | None] = queue.Queue()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    def submit(self, input_text: str) -> Future:
+        """
+        Queues the input text to be embedded in the next batch.
+
+        Args:
+            input_text (str): The input text to embed.
+
+        Returns:
+            Future: A future resolved with the embedding of the input text.
+        """
+
+        self._ensure_started()
+
+        future = Future()
+        self._queue.put((input_text, future))
+
+        return future
+
+    def __call__(self, input_text: list[str]) -> NDArray[np.float32]:
+        """
+        Embeds the input text, batching it together with the requests of other callers.
+
+        Args:
+            input_text (list[str]): The input text to embed.
+
+        Returns:
+            NDArray[np.float32]: The embeddings of the input text, in the same order.
+        """
+
+        futures = [self.submit(text) for text in input_text]
+
+        return np.stack([future.result() for future in futures]) if len(futures) > 0 else np.array([])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="embedding-micro-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self._max_wait_seconds
+            is_closing = False
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    is_closing = True
+
+                    break
+
+                batch.append(item)
+
+            self._process(batch)
+
+            if is_closing:
+                return
+
+    def _process(self, batch: list[tuple[str, Future]]) -> None:
+        input_text = [text for text, _ in batch]
+        try:
+            embeddings = self._encode(input_text)
+            if len(embeddings) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} embeddings, got {len(embeddings)}.")
+        except Exception as e:
+            logger.exception("Failed to embed the batched requests.")
+
+            for _, future in batch:
+                future.set_exception(e)
+
+            return
+
+        for (_, future), embedding in zip(batch, embeddings, strict=True):
+            future.set_result(embedding)
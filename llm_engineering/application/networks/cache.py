@@ -0,0 +1,182 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application.utils.misc import batch
+
+
+class EmbeddingCache:
+    """
+    A persistent, content-addressed cache of embeddings backed by a local SQLite database.
+
+    Entries are keyed by (model_id, content hash). Once the stored vectors exceed `max_size_bytes`,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_bytes: int) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._max_size_bytes = max_size_bytes
+
+        self._lock = Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._size_bytes = 0
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """
+        Computes the content hash used as cache key. It uses the same md5 digest as the chunk IDs.
+
+        Args:
+            content (str): The text that is embedded.
+
+        Returns:
+            str: The hex digest of the content.
+        """
+
+        return hashlib.md5(content.encode()).hexdigest()
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._connect()
+
+            return self._size_bytes
+
+    def get_many(self, model_id: str, keys: list[str]) -> dict[str, NDArray[np.float32]]:
+        """
+        Looks up the embeddings of the given content hashes.
+
+        Args:
+            model_id (str): The identifier of the model, and of its backend, that generated the embeddings.
+            keys (list[str]): The content hashes to look up.
+
+        Returns:
+            dict[str, NDArray[np.float32]]: The cached embeddings. Keys that are not cached are missing.
+        """
+
+        unique_keys = list(dict.fromkeys(keys))
+        if len(unique_keys) == 0:
+            return {}
+
+        hits = {}
+        with self._lock:
+            connection = self._connect()
+            for keys_batch in batch(unique_keys, size=500):
+                placeholders = ",".join("?" for _ in keys_batch)
+                rows = connection.execute(
+                    "SELECT content_hash, vector FROM embeddings "
+                    f"WHERE model_id = ? AND content_hash IN ({placeholders})",
+                    [model_id, *keys_batch],
+                ).fetchall()
+                for content_hash, vector in rows:
+                    hits[content_hash] = np.frombuffer(vector, dtype=np.float32)
+
+            if len(hits) > 0:
+                now = time.time()
+                connection.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model_id = ? AND content_hash = ?",
+                    [(now, model_id, content_hash) for content_hash in hits],
+                )
+                connection.commit()
+
+        return hits
+
+    def put_many(self, model_id: str, embeddings: dict[str, NDArray[np.float32]]) -> None:
+        """
+        Stores the embeddings of the given content hashes and evicts old entries if the cache is full.
+
+        Args:
+            model_id (str): The identifier of the model, and of its backend, that generated the embeddings.
+            embeddings (dict[str, NDArray[np.float32]]): The embeddings mapped by content hash.
+        """
+
+        if len(embeddings) == 0:
+            return
+
+        now = time.time()
+        rows = []
+        for content_hash, embedding in embeddings.items():
+            vector = np.asarray(embedding, dtype=np.float32).tobytes()
+            rows.append((model_id, content_hash, vector, len(vector), now))
+
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_id, content_hash, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.commit()
+            self._size_bytes = self._compute_size(connection)
+
+            if self._size_bytes > self._max_size_bytes:
+                self._evict(connection)
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM embeddings")
+            connection.commit()
+            self._size_bytes = 0
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # Evict down to 90% of the budget to avoid evicting on every insert once the cache is full.
+        target_size_bytes = int(self._max_size_bytes * 0.9)
+        bytes_to_free = self._size_bytes - target_size_bytes
+
+        rows = connection.execute(
+            "SELECT rowid, size FROM embeddings ORDER BY last_access ASC, rowid ASC",
+        )
+        rowids_to_delete = []
+        freed_bytes = 0
+        for rowid, size in rows:
+            if freed_bytes >= bytes_to_free:
+                break
+            rowids_to_delete.append((rowid,))
+            freed_bytes += size
+
+        connection.executemany("DELETE FROM embeddings WHERE rowid = ?", rowids_to_delete)
+        connection.commit()
+        self._size_bytes -= freed_bytes
+
+        logger.info(
+            f"Evicted {len(rowids_to_delete)} embeddings ({freed_bytes} bytes) from the cache located at {self._cache_dir}."
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+            connection = sqlite3.connect(self._cache_dir / "embeddings.sqlite", check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (model_id, content_hash)
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)")
+            connection.commit()
+
+            self._connection = connection
+            self._size_bytes = self._compute_size(connection)
+
+        return self._connection
+
+    @staticmethod
+    def _compute_size(connection: sqlite3.Connection) -> int:
+        (size_bytes,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()
+
+        return size_bytes
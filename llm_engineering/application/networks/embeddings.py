@@ -1,6 +1,7 @@
+from contextlib import contextmanager
 from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Generator, Optional
 
 import numpy as np
 from loguru import logger
@@ -8,10 +9,13 @@ from numpy.typing import NDArray
 from sentence_transformers.SentenceTransformer import SentenceTransformer
 from sentence_transformers.cross_encoder import CrossEncoder
 from transformers import AutoTokenizer
+from transformers.modeling_outputs import BaseModelOutput, SequenceClassifierOutput
 
 from llm_engineering.settings import settings
 
 from .base import SingletonMeta
+from .onnx_backend import PARITY_CHECK_INPUT_TEXT, InferenceBackend, cosine_drift, load_onnx_model
+from .pool import EmbeddingProcessPool
 
 
 class EmbeddingModelSingleton(metaclass=SingletonMeta):
@@ -21,12 +25,14 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
     def __init__(
         self,
-        model_id: str = settings.TEXT_EMBEDDING_MODEL_ID,
-        device: str = settings.RAG_MODEL_DEVICE,
+        model_id: str | None = None,
+        device: str | None = None,
         cache_dir: Optional[Path] = None,
+        backend: str | None = None,
     ) -> None:
-        self._model_id = model_id
-        self._device = device
+        self._model_id = model_id or settings.TEXT_EMBEDDING_MODEL_ID
+        self._backend = InferenceBackend(backend or settings.RAG_MODEL_BACKEND)
+        self._device = _resolve_device(device or settings.RAG_MODEL_DEVICE, self._backend)
 
         self._model = SentenceTransformer(
             self._model_id,
@@ -34,6 +40,24 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
             cache_folder=str(cache_dir) if cache_dir else None,
         )
         self._model.eval()
+        self._process_pool: EmbeddingProcessPool | None = None
+
+        self._parity: dict[str, float] | None = None
+        if self._backend != InferenceBackend.TORCH:
+            reference_embeddings = self._model.encode(PARITY_CHECK_INPUT_TEXT)
+
+            transformer = self._model[0]
+            transformer.auto_model = load_onnx_model(
+                transformer.auto_model,
+                tokenizer=self._model.tokenizer,
+                model_id=self._model_id,
+                backend=self._backend,
+                cache_dir=settings.RAG_MODEL_ONNX_CACHE_DIR,
+                output_class=BaseModelOutput,
+            )
+
+            self._parity = cosine_drift(reference_embeddings, self._model.encode(PARITY_CHECK_INPUT_TEXT))
+            logger.info(f"Loaded {self._model_id=} with the {self._backend} backend.", **self._parity)
 
     @property
     def model_id(self) -> str:
@@ -46,6 +70,67 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
         return self._model_id
 
+    @property
+    def backend(self) -> InferenceBackend:
+        """
+        Returns the inference backend used to run the model.
+
+        Returns:
+            InferenceBackend: The inference backend used to run the model.
+        """
+
+        return self._backend
+
+    @property
+    def parity(self) -> dict[str, float] | None:
+        """
+        Returns the cosine drift of the ONNX backend against torch, measured when the model was loaded.
+
+        Returns:
+            dict[str, float] | None: The mean and max cosine drift, or None for the torch backend.
+        """
+
+        return self._parity
+
+    @property
+    def process_pool(self) -> EmbeddingProcessPool | None:
+        """
+        Returns the worker processes encoding with copies of this model, if started.
+
+        Returns:
+            EmbeddingProcessPool | None: The running process pool, or None to encode in the current process.
+        """
+
+        return self._process_pool
+
+    @contextmanager
+    def start_process_pool(self, num_workers: int) -> Generator[EmbeddingProcessPool, None, None]:
+        """
+        Starts `num_workers` worker processes, each loading its own copy of this model, for the duration of the
+        context.
+
+        Args:
+            num_workers (int): The number of worker processes.
+
+        Yields:
+            EmbeddingProcessPool: The running process pool.
+        """
+
+        if self._process_pool is not None:
+            raise RuntimeError(f"A process pool is already running for {self._model_id=}.")
+
+        with EmbeddingProcessPool(
+            model_id=self._model_id,
+            num_workers=num_workers,
+            backend=self._backend,
+            onnx_cache_dir=settings.RAG_MODEL_ONNX_CACHE_DIR,
+        ) as pool:
+            self._process_pool = pool
+            try:
+                yield pool
+            finally:
+                self._process_pool = None
+
     @cached_property
     def embedding_size(self) -> int:
         """
@@ -81,8 +166,28 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
         return self._model.tokenizer
 
+    def count_tokens(self, input_text: list[str]) -> list[int]:
+        """
+        Counts the number of tokens the model sees for each input text, including special tokens and truncation.
+
+        Args:
+            input_text (list[str]): The input text to count the tokens for.
+
+        Returns:
+            list[int]: The number of tokens of each input text.
+        """
+
+        encodings = self._model.tokenizer(
+            input_text,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.max_input_length,
+        )
+
+        return [len(input_ids) for input_ids in encodings["input_ids"]]
+
     def __call__(
-        self, input_text: str | list[str], to_list: bool = True
+        self, input_text: str | list[str], to_list: bool = True, batch_size: int = 32
     ) -> NDArray[np.float32] | list[float] | list[list[float]]:
         """
         Generates embeddings for the input text using the pre-trained transformer model.
@@ -90,13 +195,14 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
         Args:
             input_text (str): The input text to generate embeddings for.
             to_list (bool): Whether to return the embeddings as a list or numpy array. Defaults to True.
+            batch_size (int): The number of input texts encoded in a single forward pass. Defaults to 32.
 
         Returns:
             Union[np.ndarray, list]: The embeddings generated for the input text.
         """
 
         try:
-            embeddings = self._model.encode(input_text)
+            embeddings = self._model.encode(input_text, batch_size=batch_size)
         except Exception:
             logger.error(f"Error generating embeddings for {self._model_id=} and {input_text=}")
 
@@ -111,15 +217,17 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 class CrossEncoderModelSingleton(metaclass=SingletonMeta):
     def __init__(
         self,
-        model_id: str = settings.RERANKING_CROSS_ENCODER_MODEL_ID,
-        device: str = settings.RAG_MODEL_DEVICE,
+        model_id: str | None = None,
+        device: str | None = None,
+        backend: str | None = None,
     ) -> None:
         """
         A singleton class that provides a pre-trained cross-encoder model for scoring pairs of input text.
         """
 
-        self._model_id = model_id
-        self._device = device
+        self._model_id = model_id or settings.RERANKING_CROSS_ENCODER_MODEL_ID
+        self._backend = InferenceBackend(backend or settings.RAG_MODEL_BACKEND)
+        self._device = _resolve_device(device or settings.RAG_MODEL_DEVICE, self._backend)
 
         self._model = CrossEncoder(
             model_name=self._model_id,
@@ -127,6 +235,34 @@ class CrossEncoderModelSingleton(metaclass=SingletonMeta):
         )
         self._model.model.eval()
 
+        self._parity: dict[str, float] | None = None
+        if self._backend != InferenceBackend.TORCH:
+            pairs = list(
+                zip(PARITY_CHECK_INPUT_TEXT, PARITY_CHECK_INPUT_TEXT[1:] + PARITY_CHECK_INPUT_TEXT[:1], strict=True)
+            )
+            reference_scores = self._model.predict(pairs)
+
+            self._model.model = load_onnx_model(
+                self._model.model,
+                tokenizer=self._model.tokenizer,
+                model_id=self._model_id,
+                backend=self._backend,
+                cache_dir=settings.RAG_MODEL_ONNX_CACHE_DIR,
+                output_class=SequenceClassifierOutput,
+            )
+
+            scores = self._model.predict(pairs)
+            self._parity = {"max_abs_score_drift": float(np.abs(reference_scores - scores).max())}
+            logger.info(f"Loaded {self._model_id=} with the {self._backend} backend.", **self._parity)
+
+    @property
+    def backend(self) -> InferenceBackend:
+        return self._backend
+
+    @property
+    def parity(self) -> dict[str, float] | None:
+        return self._parity
+
     def __call__(self, pairs: list[tuple[str, str]], to_list: bool = True) -> NDArray[np.float32] | list[float]:
         scores = self._model.predict(pairs)
 
@@ -134,3 +270,12 @@ class CrossEncoderModelSingleton(metaclass=SingletonMeta):
             scores = scores.tolist()
 
         return scores
+
+
+def _resolve_device(device: str, backend: InferenceBackend) -> str:
+    if backend != InferenceBackend.TORCH and device != "cpu":
+        logger.warning(f"The {backend} backend runs on CPU. Ignoring {device=}.")
+
+        return "cpu"
+
+    return device
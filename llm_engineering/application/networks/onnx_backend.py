@@ -0,0 +1,194 @@
+from enum import StrEnum
+from pathlib import Path
+
+import numpy as np
+import torch
+from loguru import logger
+from numpy.typing import NDArray
+from torch import nn
+from transformers import PreTrainedModel, PreTrainedTokenizerBase
+from transformers.modeling_outputs import ModelOutput
+
+
+class InferenceBackend(StrEnum):
+    TORCH = "torch"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx-int8"
+
+
+PARITY_CHECK_INPUT_TEXT = [
+    "What is retrieval-augmented generation?",
+    "Qdrant is a vector database used to store the embeddings of the chunks.",
+    "The feature pipeline cleans, chunks and embeds the raw documents crawled from LinkedIn, Medium and GitHub.",
+    "def chunk_text(text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> list[str]:",
+]
+
+
+class OnnxModel(nn.Module):
+    """
+    A drop-in replacement of a Hugging Face model that runs the forward pass with ONNX Runtime on CPU.
+
+    It returns the first output of the exported model (e.g., the last hidden state or the logits) wrapped in
+    `output_class`, so it works both with `return_dict=True` and with tuple indexing.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        config,
+        input_names: list[str],
+        output_class: type[ModelOutput],
+    ) -> None:
+        super().__init__()
+
+        self.config = config
+        self._input_names = input_names
+        self._output_class = output_class
+        # The loss is None at inference time, so the first output of the model maps to the next field.
+        self._output_field = next(field for field in output_class.__dataclass_fields__ if field != "loss")
+
+        ort = _import_onnxruntime()
+
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = torch.get_num_threads()
+        self._session = ort.InferenceSession(
+            str(model_path), sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+
+        # sentence-transformers infers the device from the first parameter of the model.
+        self._device_anchor = nn.Parameter(torch.empty(0), requires_grad=False)
+
+    def forward(self, return_dict: bool = False, **inputs: torch.Tensor) -> ModelOutput:
+        input_ids = inputs["input_ids"]
+        onnx_inputs = {}
+        for name in self._input_names:
+            value = inputs.get(name)
+            if value is None:
+                value = torch.zeros_like(input_ids)
+            onnx_inputs[name] = value.cpu().numpy().astype(np.int64)
+
+        (output,) = self._session.run(["output"], onnx_inputs)
+
+        return self._output_class(**{self._output_field: torch.from_numpy(output)})
+
+
+def load_onnx_model(
+    model: PreTrainedModel,
+    tokenizer: PreTrainedTokenizerBase,
+    model_id: str,
+    backend: InferenceBackend,
+    cache_dir: Path,
+    output_class: type[ModelOutput],
+) -> OnnxModel:
+    """
+    Loads the ONNX version of a Hugging Face model, exporting and quantizing it on first use.
+
+    The exported graphs are cached in `cache_dir`, under a directory derived from the model ID.
+
+    Args:
+        model (PreTrainedModel): The PyTorch model to export.
+        tokenizer (PreTrainedTokenizerBase): The tokenizer of the model, used to build the graph inputs.
+        model_id (str): The identifier of the model.
+        backend (InferenceBackend): Either the ONNX fp32 or the dynamically quantized int8 backend.
+        cache_dir (Path): The directory where the exported graphs are cached.
+        output_class (type[ModelOutput]): The output class mimicked by the ONNX model.
+
+    Returns:
+        OnnxModel: The model running on ONNX Runtime.
+    """
+
+    assert backend != InferenceBackend.TORCH, "The torch backend doesn't need an ONNX model."
+
+    _import_onnxruntime()
+
+    input_names = [
+        name for name in tokenizer.model_input_names if name in {"input_ids", "attention_mask", "token_type_ids"}
+    ]
+
+    model_dir = Path(cache_dir) / model_id.replace("/", "--")
+    model_path = model_dir / "model.onnx"
+    if not model_path.exists():
+        logger.info(f"Exporting {model_id=} to ONNX at {model_path}.")
+
+        model_dir.mkdir(parents=True, exist_ok=True)
+        _export(model, tokenizer, input_names=input_names, output_path=model_path)
+
+    if backend == InferenceBackend.ONNX_INT8:
+        fp32_model_path = model_path
+        model_path = model_dir / "model.int8.onnx"
+        if not model_path.exists():
+            logger.info(f"Quantizing {model_id=} to int8 at {model_path}.")
+
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(fp32_model_path, model_path, weight_type=QuantType.QInt8)
+
+    return OnnxModel(model_path, config=model.config, input_names=input_names, output_class=output_class)
+
+
+def cosine_drift(reference: NDArray[np.float32], candidate: NDArray[np.float32]) -> dict[str, float]:
+    """
+    Computes how far the candidate vectors drifted from the reference vectors as 1 - cosine similarity.
+
+    Args:
+        reference (NDArray[np.float32]): The reference vectors, e.g., computed with the torch backend.
+        candidate (NDArray[np.float32]): The candidate vectors, e.g., computed with an ONNX backend.
+
+    Returns:
+        dict[str, float]: The mean and max cosine drift across vectors.
+    """
+
+    reference = np.atleast_2d(np.asarray(reference, dtype=np.float32))
+    candidate = np.atleast_2d(np.asarray(candidate, dtype=np.float32))
+
+    similarity = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1) + 1e-12
+    )
+    drift = 1.0 - similarity
+
+    return {"mean_cosine_drift": float(drift.mean()), "max_cosine_drift": float(drift.max())}
+
+
+def _import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError(
+            "The ONNX backends require ONNX Runtime. Install it with `poetry install --extras onnx`."
+        ) from e
+
+    return onnxruntime
+
+
+def _export(
+    model: PreTrainedModel, tokenizer: PreTrainedTokenizerBase, input_names: list[str], output_path: Path
+) -> None:
+    class _FirstOutput(nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+
+            self.model = model
+
+        def forward(self, *args: torch.Tensor) -> torch.Tensor:
+            return self.model(**dict(zip(input_names, args, strict=True)), return_dict=False)[0]
+
+    wrapper = _FirstOutput().eval()
+    dummy_inputs = tokenizer(PARITY_CHECK_INPUT_TEXT[:2], padding=True, return_tensors="pt")
+    args = tuple(dummy_inputs[name] for name in input_names)
+
+    with torch.no_grad():
+        dummy_output = wrapper(*args)
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["output"] = {0: "batch", 1: "sequence"} if dummy_output.dim() == 3 else {0: "batch"}
+
+    torch.onnx.export(
+        wrapper,
+        args,
+        str(output_path),
+        input_names=input_names,
+        output_names=["output"],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+        do_constant_folding=True,
+    )
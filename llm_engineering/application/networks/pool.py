@@ -0,0 +1,268 @@
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing.synchronize import Semaphore
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Iterator
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+
+class EmbeddingProcessPool:
+    """
+    A pool of worker processes that encode batches of text with their own copy of a sentence-transformer model.
+
+    Each worker is pinned to a disjoint slice of the available CPU cores and sets its torch thread count to the
+    size of its slice, so the workers don't compete for the same cores. Batches are streamed to the workers through
+    a bounded queue and the embeddings are yielded back in submission order.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        num_workers: int,
+        device: str = "cpu",
+        backend: str = "torch",
+        onnx_cache_dir: Path | None = None,
+        max_pending_batches: int | None = None,
+        timeout: float = 600.0,
+    ) -> None:
+        assert num_workers > 0, f"'num_workers' should be greater than 0. Got {num_workers}."
+
+        self._model_id = model_id
+        self._num_workers = num_workers
+        self._max_pending_batches = max_pending_batches or 2 * num_workers
+        self._timeout = timeout
+
+        context = mp.get_context("spawn")
+        self._input_queue = context.Queue(maxsize=self._max_pending_batches)
+        self._output_queue = context.Queue()
+        # Released by each worker once its model is loaded.
+        self._ready = context.Semaphore(0)
+        self._num_ready = 0
+        self._lock = Lock()
+        self._call_id = 0
+
+        self._workers = []
+        for cores in self.split_cores(num_workers):
+            worker = context.Process(
+                target=_encode_worker,
+                args=(
+                    model_id,
+                    device,
+                    backend,
+                    onnx_cache_dir,
+                    cores,
+                    self._input_queue,
+                    self._output_queue,
+                    self._ready,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        logger.info(f"Started {num_workers} embedding worker processes for {model_id=}.")
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @staticmethod
+    def split_cores(num_workers: int) -> list[list[int]]:
+        """
+        Splits the CPU cores available to the current process into contiguous slices, one per worker.
+
+        Args:
+            num_workers (int): The number of slices to split the cores into.
+
+        Returns:
+            list[list[int]]: The cores assigned to each worker.
+        """
+
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+
+        if num_workers > len(cores):
+            logger.warning(f"More embedding workers ({num_workers}) than CPU cores ({len(cores)}). Cores are shared.")
+
+            return [[cores[i % len(cores)]] for i in range(num_workers)]
+
+        slices = np.array_split(np.array(cores), num_workers)
+
+        return [cores_slice.tolist() for cores_slice in slices]
+
+    def wait_until_ready(self) -> None:
+        """
+        Blocks until every worker process has loaded its model, e.g., to keep the loading time out of a benchmark.
+
+        Raises:
+            RuntimeError: If a worker dies while loading its model.
+            TimeoutError: If the workers aren't ready within the timeout.
+        """
+
+        waited = 0.0
+        while self._num_ready < len(self._workers):
+            if self._ready.acquire(timeout=1.0):
+                self._num_ready += 1
+
+                continue
+
+            waited += 1.0
+            dead_workers = [worker for worker in self._workers if not worker.is_alive()]
+            if len(dead_workers) > 0:
+                raise RuntimeError(f"{len(dead_workers)} embedding worker process(es) died unexpectedly.")
+            if waited >= self._timeout:
+                raise TimeoutError(f"The worker processes didn't load the model in {self._timeout} seconds.")
+
+    def imap(self, batches: Iterable[list[str]]) -> Iterator[NDArray[np.float32]]:
+        """
+        Encodes the batches in the worker processes.
+
+        At most `max_pending_batches` batches are in flight at once, so the input iterable is consumed lazily.
+
+        Args:
+            batches (Iterable[list[str]]): The batches of text to encode. Each batch is a single forward pass.
+
+        Yields:
+            NDArray[np.float32]: The embeddings of each batch, in the same order as the batches.
+
+        Raises:
+            RuntimeError: If a worker fails to encode a batch or dies.
+            TimeoutError: If no embeddings are received from the workers within the timeout.
+        """
+
+        with self._lock:
+            # Results of a previous call that was abandoned midway are tagged with an older call ID and dropped.
+            self._call_id += 1
+            call_id = self._call_id
+
+            batches = iter(batches)
+            results = {}
+            num_submitted = 0
+            num_yielded = 0
+            is_exhausted = False
+            while True:
+                while not is_exhausted and num_submitted - num_yielded - len(results) < self._max_pending_batches:
+                    try:
+                        batch = next(batches)
+                    except StopIteration:
+                        is_exhausted = True
+
+                        break
+
+                    self._input_queue.put((call_id, num_submitted, batch))
+                    num_submitted += 1
+
+                if is_exhausted and num_yielded == num_submitted:
+                    return
+
+                while num_yielded not in results:
+                    result_call_id, task_id, embeddings, error = self._get_result()
+                    if result_call_id != call_id:
+                        continue
+                    if error is not None:
+                        raise RuntimeError(f"Embedding worker failed to encode batch {task_id}: {error}")
+
+                    results[task_id] = embeddings
+
+                yield results.pop(num_yielded)
+                num_yielded += 1
+
+    def close(self) -> None:
+        """
+        Stops the worker processes after they finish the batches already submitted.
+        """
+
+        for _ in self._workers:
+            self._input_queue.put(None)
+
+        for worker in self._workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                logger.warning(f"Embedding worker {worker.pid} didn't stop in time. Terminating it.")
+
+                worker.terminate()
+                worker.join()
+
+        self._workers = []
+        self._input_queue.close()
+        self._output_queue.close()
+
+        logger.info("Stopped the embedding worker processes.")
+
+    def _get_result(self) -> tuple[int, int, NDArray[np.float32] | None, str | None]:
+        waited = 0.0
+        while True:
+            try:
+                return self._output_queue.get(timeout=1.0)
+            except queue.Empty:
+                waited += 1.0
+
+            dead_workers = [worker for worker in self._workers if not worker.is_alive()]
+            if len(dead_workers) > 0:
+                raise RuntimeError(f"{len(dead_workers)} embedding worker process(es) died unexpectedly.")
+            if waited >= self._timeout:
+                raise TimeoutError(f"No embeddings received from the worker processes in {self._timeout} seconds.")
+
+    def __enter__(self) -> "EmbeddingProcessPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _encode_worker(
+    model_id: str,
+    device: str,
+    backend: str,
+    onnx_cache_dir: Path | None,
+    cores: list[int],
+    input_queue: mp.Queue,
+    output_queue: mp.Queue,
+    ready: Semaphore,
+) -> None:
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    from sentence_transformers.SentenceTransformer import SentenceTransformer
+
+    torch.set_num_threads(len(cores))
+
+    model = SentenceTransformer(model_id, device=device)
+    model.eval()
+
+    if backend != "torch":
+        from transformers.modeling_outputs import BaseModelOutput
+
+        from .onnx_backend import InferenceBackend, load_onnx_model
+
+        transformer = model[0]
+        transformer.auto_model = load_onnx_model(
+            transformer.auto_model,
+            tokenizer=model.tokenizer,
+            model_id=model_id,
+            backend=InferenceBackend(backend),
+            cache_dir=onnx_cache_dir,
+            output_class=BaseModelOutput,
+        )
+
+    ready.release()
+
+    while True:
+        task = input_queue.get()
+        if task is None:
+            break
+
+        call_id, task_id, input_text = task
+        try:
+            embeddings = model.encode(input_text, batch_size=len(input_text))
+            output_queue.put((call_id, task_id, np.asarray(embeddings, dtype=np.float32), None))
+        except Exception as e:
+            output_queue.put((call_id, task_id, None, repr(e)))
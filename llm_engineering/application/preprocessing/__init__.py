@@ -1,5 +1,6 @@
 from .dispatchers import ChunkingDispatcher, CleaningDispatcher, EmbeddingDispatcher
 from .llm_processor import LLMProcessorFactory, BaseLLMProcessor, DocumentLLMProcessor, TechnicalDocumentLLMProcessor, DataDocumentLLMProcessor
+from .streaming import stream_feature_engineering
 
 __all__ = [
     "CleaningDispatcher", 
@@ -9,5 +10,6 @@ __all__ = [
     "BaseLLMProcessor",
     "DocumentLLMProcessor", 
     "TechnicalDocumentLLMProcessor",
-    "DataDocumentLLMProcessor"
+    "DataDocumentLLMProcessor",
+    "stream_feature_engineering",
 ]
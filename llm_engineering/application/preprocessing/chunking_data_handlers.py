@@ -11,7 +11,7 @@ from llm_engineering.domain.cleaned_documents import (
     CleanedRepositoryDocument,
 )
 
-from .operations import chunk_article, chunk_text
+from .operations import chunk_article, chunk_text_with_token_counts
 
 CleanedDocumentT = TypeVar("CleanedDocumentT", bound=CleanedDocument)
 ChunkT = TypeVar("ChunkT", bound=Chunk)
@@ -47,11 +47,11 @@ class PostChunkingHandler(ChunkingDataHandler):
         data_models_list = []
 
         cleaned_content = data_model.content
-        chunks = chunk_text(
+        chunks, chunks_num_tokens = chunk_text_with_token_counts(
             cleaned_content, chunk_size=self.metadata["chunk_size"], chunk_overlap=self.metadata["chunk_overlap"]
         )
 
-        for chunk in chunks:
+        for chunk, num_tokens in zip(chunks, chunks_num_tokens, strict=True):
             chunk_id = hashlib.md5(chunk.encode()).hexdigest()
             model = PostChunk(
                 id=UUID(chunk_id, version=4),
@@ -62,6 +62,7 @@ class PostChunkingHandler(ChunkingDataHandler):
                 author_full_name=data_model.author_full_name,
                 image=data_model.image if data_model.image else None,
                 metadata=self.metadata,
+                num_tokens=num_tokens,
             )
             data_models_list.append(model)
 
@@ -113,11 +114,11 @@ class RepositoryChunkingHandler(ChunkingDataHandler):
         data_models_list = []
 
         cleaned_content = data_model.content
-        chunks = chunk_text(
+        chunks, chunks_num_tokens = chunk_text_with_token_counts(
             cleaned_content, chunk_size=self.metadata["chunk_size"], chunk_overlap=self.metadata["chunk_overlap"]
         )
 
-        for chunk in chunks:
+        for chunk, num_tokens in zip(chunks, chunks_num_tokens, strict=True):
             chunk_id = hashlib.md5(chunk.encode()).hexdigest()
             model = RepositoryChunk(
                 id=UUID(chunk_id, version=4),
@@ -129,6 +130,7 @@ class RepositoryChunkingHandler(ChunkingDataHandler):
                 author_id=data_model.author_id,
                 author_full_name=data_model.author_full_name,
                 metadata=self.metadata,
+                num_tokens=num_tokens,
             )
             data_models_list.append(model)
 
@@ -1,5 +1,10 @@
+from contextlib import contextmanager
+from typing import Generator
+
 from loguru import logger
 
+from llm_engineering.application.networks import EmbeddingModelSingleton, EmbeddingProcessPool
+from llm_engineering.application.utils import process_map
 from llm_engineering.domain.base import NoSQLBaseDocument, VectorBaseDocument
 from llm_engineering.domain.types import DataCategory
 
@@ -54,6 +59,18 @@ class CleaningDispatcher:
 
         return clean_model
 
+    @classmethod
+    def dispatch_batch(
+        cls, data_models: list[NoSQLBaseDocument], num_workers: int = 0, documents_per_task: int = 32
+    ) -> list[VectorBaseDocument]:
+        """
+        Cleans the documents in `num_workers` worker processes, `documents_per_task` documents at a time.
+        If `num_workers` is 0, the documents are cleaned in the current process. The cleaned documents are
+        returned in input order.
+        """
+
+        return list(process_map(_clean_documents, data_models, num_workers=num_workers, chunk_size=documents_per_task))
+
 
 class ChunkingHandlerFactory:
     @staticmethod
@@ -85,6 +102,18 @@ class ChunkingDispatcher:
 
         return chunk_models
 
+    @classmethod
+    def dispatch_batch(
+        cls, data_models: list[VectorBaseDocument], num_workers: int = 0, documents_per_task: int = 32
+    ) -> list[VectorBaseDocument]:
+        """
+        Chunks the documents in `num_workers` worker processes, `documents_per_task` documents at a time.
+        If `num_workers` is 0, the documents are chunked in the current process. The chunks of all documents
+        are returned flattened, in input order.
+        """
+
+        return list(process_map(_chunk_documents, data_models, num_workers=num_workers, chunk_size=documents_per_task))
+
 
 class EmbeddingHandlerFactory:
     @staticmethod
@@ -104,6 +133,22 @@ class EmbeddingHandlerFactory:
 class EmbeddingDispatcher:
     factory = EmbeddingHandlerFactory
 
+    @classmethod
+    @contextmanager
+    def process_pool(cls, num_workers: int) -> Generator[EmbeddingProcessPool | None, None, None]:
+        """
+        Encodes the data dispatched within the context in `num_workers` worker processes.
+        If `num_workers` is 0, the data is encoded in the current process.
+        """
+
+        if num_workers <= 0:
+            yield None
+
+            return
+
+        with EmbeddingModelSingleton().start_process_pool(num_workers=num_workers) as pool:
+            yield pool
+
     @classmethod
     def dispatch(
         cls, data_model: VectorBaseDocument | list[VectorBaseDocument]
@@ -115,20 +160,36 @@ class EmbeddingDispatcher:
         if len(data_model) == 0:
             return []
 
-        data_category = data_model[0].get_category()
-        assert all(
-            data_model.get_category() == data_category for data_model in data_model
-        ), "Data models must be of the same category."
-        handler = cls.factory.create_handler(data_category)
+        # Chunks gathered across documents of different categories are embedded per category,
+        # where the handler batches them by token length. The results are returned in input order.
+        grouped_indices = {}
+        for index, model in enumerate(data_model):
+            grouped_indices.setdefault(model.get_category(), []).append(index)
+
+        embedded_chunk_model = [None] * len(data_model)
+        for data_category, indices in grouped_indices.items():
+            handler = cls.factory.create_handler(data_category)
+            embedded_chunk_models = handler.embed_batch([data_model[index] for index in indices])
+            for index, embedded_model in zip(indices, embedded_chunk_models, strict=False):
+                embedded_chunk_model[index] = embedded_model
+
+            logger.info(
+                "Data embedded successfully.",
+                data_category=data_category,
+                num=len(indices),
+            )
 
-        embedded_chunk_model = handler.embed_batch(data_model)
+        embedded_chunk_model = [model for model in embedded_chunk_model if model is not None]
 
         if not is_list:
             embedded_chunk_model = embedded_chunk_model[0]
 
-        logger.info(
-            "Data embedded successfully.",
-            data_category=data_category,
-        )
-
         return embedded_chunk_model
+
+
+def _clean_documents(data_models: list[NoSQLBaseDocument]) -> list[VectorBaseDocument]:
+    return [CleaningDispatcher.dispatch(data_model) for data_model in data_models]
+
+
+def _chunk_documents(data_models: list[VectorBaseDocument]) -> list[VectorBaseDocument]:
+    return [chunk for data_model in data_models for chunk in ChunkingDispatcher.dispatch(data_model)]
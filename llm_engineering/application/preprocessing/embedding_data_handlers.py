@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, cast
+from typing import Generic, TypeVar
 
-from llm_engineering.application.networks import EmbeddingModelSingleton
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application.networks import (
+    EmbeddingCache,
+    EmbeddingMicroBatcher,
+    EmbeddingModelSingleton,
+)
 from llm_engineering.domain.chunks import ArticleChunk, Chunk, PostChunk, RepositoryChunk
 from llm_engineering.domain.embedded_chunks import (
     EmbeddedArticleChunk,
@@ -10,11 +18,28 @@ from llm_engineering.domain.embedded_chunks import (
     EmbeddedRepositoryChunk,
 )
 from llm_engineering.domain.queries import EmbeddedQuery, Query
+from llm_engineering.infrastructure.lazy import LazyProxy
+from llm_engineering.settings import settings
+
+from .operations import token_budget_batches
 
 ChunkT = TypeVar("ChunkT", bound=Chunk)
 EmbeddedChunkT = TypeVar("EmbeddedChunkT", bound=EmbeddedChunk)
 
-embedding_model = EmbeddingModelSingleton()
+embedding_model: EmbeddingModelSingleton = LazyProxy(EmbeddingModelSingleton)  # type: ignore[assignment]
+embedding_cache: EmbeddingCache = LazyProxy(  # type: ignore[assignment]
+    lambda: EmbeddingCache(
+        cache_dir=settings.EMBEDDING_CACHE_DIR,
+        max_size_bytes=settings.EMBEDDING_CACHE_MAX_SIZE_MB * 1024 * 1024,
+    )
+)
+query_embedding_batcher: EmbeddingMicroBatcher = LazyProxy(  # type: ignore[assignment]
+    lambda: EmbeddingMicroBatcher(
+        encode=lambda input_text: embedding_model(input_text, to_list=False, batch_size=len(input_text)),
+        max_batch_size=settings.RAG_QUERY_BATCH_MAX_SIZE,
+        max_wait_ms=settings.RAG_QUERY_BATCH_MAX_WAIT_MS,
+    )
+)
 
 
 class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
@@ -23,27 +48,117 @@ class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
     All data transformations logic for the embedding step is done here
     """
 
+    use_cache: bool = True
+
     def embed(self, data_model: ChunkT) -> EmbeddedChunkT:
         return self.embed_batch([data_model])[0]
 
     def embed_batch(self, data_model: list[ChunkT]) -> list[EmbeddedChunkT]:
         embedding_model_input = [data_model.content for data_model in data_model]
-        embeddings = embedding_model(embedding_model_input, to_list=True)
+        num_tokens = [getattr(data_model, "num_tokens", None) for data_model in data_model]
+        if self.use_cache and settings.EMBEDDING_CACHE_ENABLED:
+            embeddings = self._embed_with_cache(embedding_model_input, num_tokens)
+        else:
+            embeddings = self._encode(embedding_model_input, num_tokens)
 
         embedded_chunk = [
-            self.map_model(data_model, cast(list[float], embedding))
-            for data_model, embedding in zip(data_model, embeddings, strict=False)
+            self.map_model(data_model, embedding) for data_model, embedding in zip(data_model, embeddings, strict=False)
         ]
 
         return embedded_chunk
 
+    def _embed_with_cache(
+        self, input_text: list[str], num_tokens: list[int | None] | None = None
+    ) -> list[NDArray[np.float32]]:
+        """
+        Embeds the input text, sending only the cache misses to the embedding model.
+        The embeddings are returned in the same order as the input text.
+        """
+
+        # Each backend, e.g., torch fp32 or ONNX int8, produces slightly different vectors, so they are cached apart.
+        namespace = f"{embedding_model.model_id}:{embedding_model.backend}"
+        keys = [EmbeddingCache.hash_content(text) for text in input_text]
+        embeddings = embedding_cache.get_many(namespace, keys)
+
+        num_tokens = num_tokens or [None] * len(input_text)
+        missing = {}
+        for key, text, text_num_tokens in zip(keys, input_text, num_tokens, strict=True):
+            if key not in embeddings:
+                missing[key] = (text, text_num_tokens)
+        if len(missing) > 0:
+            missing_input_text, missing_num_tokens = zip(*missing.values(), strict=True)
+            missing_embeddings = self._encode(list(missing_input_text), list(missing_num_tokens))
+            if len(missing_embeddings) != len(missing):
+                logger.error("Failed to embed the cache misses.", num_misses=len(missing))
+
+                return []
+
+            new_embeddings = dict(zip(missing.keys(), missing_embeddings, strict=True))
+            embedding_cache.put_many(namespace, new_embeddings)
+            embeddings.update(new_embeddings)
+
+        logger.info(
+            "Embeddings resolved using the cache.",
+            num_hits=len(input_text) - len(missing),
+            num_misses=len(missing),
+        )
+
+        return [embeddings[key] for key in keys]
+
+    def _encode(self, input_text: list[str], num_tokens: list[int | None] | None = None) -> NDArray[np.float32]:
+        """
+        Encodes the input text in length-sorted batches sized by a token budget instead of a fixed count,
+        which minimizes the padding computed by the model. The embeddings are returned in input order.
+        Only the input text without a known number of tokens is tokenized to compute the batches.
+        """
+
+        if len(input_text) == 0:
+            return np.empty((0, embedding_model.embedding_size), dtype=np.float32)
+
+        num_tokens = list(num_tokens) if num_tokens is not None else [None] * len(input_text)
+        unknown_indices = [index for index, text_num_tokens in enumerate(num_tokens) if text_num_tokens is None]
+        if len(unknown_indices) > 0:
+            counted_num_tokens = embedding_model.count_tokens([input_text[index] for index in unknown_indices])
+            for index, text_num_tokens in zip(unknown_indices, counted_num_tokens, strict=True):
+                num_tokens[index] = text_num_tokens
+        batches = token_budget_batches(num_tokens, max_tokens_per_batch=settings.EMBEDDING_MAX_TOKENS_PER_BATCH)
+
+        batches_input_text = ([input_text[index] for index in batch_indices] for batch_indices in batches)
+        if embedding_model.process_pool is not None:
+            batches_embeddings = embedding_model.process_pool.imap(batches_input_text)
+        else:
+            batches_embeddings = (
+                embedding_model(batch_input_text, to_list=False, batch_size=len(batch_input_text))
+                for batch_input_text in batches_input_text
+            )
+
+        embeddings = np.empty((len(input_text), embedding_model.embedding_size), dtype=np.float32)
+        try:
+            for batch_indices, batch_embeddings in zip(batches, batches_embeddings, strict=True):
+                if len(batch_embeddings) != len(batch_indices):
+                    return np.array([])
+
+                embeddings[batch_indices] = batch_embeddings
+        except (RuntimeError, TimeoutError):
+            logger.exception("Failed to encode the input text in the embedding worker processes.")
+
+            return np.array([])
+
+        return embeddings
+
     @abstractmethod
-    def map_model(self, data_model: ChunkT, embedding: list[float]) -> EmbeddedChunkT:
+    def map_model(self, data_model: ChunkT, embedding: NDArray[np.float32]) -> EmbeddedChunkT:
         pass
 
 
 class QueryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: Query, embedding: list[float]) -> EmbeddedQuery:
+    use_cache = False
+
+    def _encode(self, input_text: list[str], num_tokens: list[int | None] | None = None) -> NDArray[np.float32]:
+        # Queries of concurrent RAG requests are coalesced into a single forward pass.
+        return query_embedding_batcher(input_text)
+
+    def map_model(self, data_model: Query, embedding: NDArray[np.float32]) -> EmbeddedQuery:
         return EmbeddedQuery(
             id=data_model.id,
             author_id=data_model.author_id,
@@ -59,7 +174,7 @@ class QueryEmbeddingHandler(EmbeddingDataHandler):
 
 
 class PostEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: PostChunk, embedding: list[float]) -> EmbeddedPostChunk:
+    def map_model(self, data_model: PostChunk, embedding: NDArray[np.float32]) -> EmbeddedPostChunk:
         return EmbeddedPostChunk(
             id=data_model.id,
             content=data_model.content,
@@ -77,7 +192,7 @@ class PostEmbeddingHandler(EmbeddingDataHandler):
 
 
 class ArticleEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: ArticleChunk, embedding: list[float]) -> EmbeddedArticleChunk:
+    def map_model(self, data_model: ArticleChunk, embedding: NDArray[np.float32]) -> EmbeddedArticleChunk:
         return EmbeddedArticleChunk(
             id=data_model.id,
             content=data_model.content,
@@ -96,7 +211,7 @@ class ArticleEmbeddingHandler(EmbeddingDataHandler):
 
 
 class RepositoryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: RepositoryChunk, embedding: list[float]) -> EmbeddedRepositoryChunk:
+    def map_model(self, data_model: RepositoryChunk, embedding: NDArray[np.float32]) -> EmbeddedRepositoryChunk:
         return EmbeddedRepositoryChunk(
             id=data_model.id,
             content=data_model.content,
@@ -1,8 +1,12 @@
-from .chunking import chunk_article, chunk_text
+from .batching import token_budget_batches
+from .chunking import chunk_article, chunk_text, chunk_text_with_token_counts, split_text_on_tokens
 from .cleaning import clean_text
 
 __all__ = [
     "chunk_article",
     "chunk_text",
+    "chunk_text_with_token_counts",
+    "split_text_on_tokens",
     "clean_text",
+    "token_budget_batches",
 ]
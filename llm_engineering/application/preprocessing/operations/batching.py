@@ -0,0 +1,34 @@
+def token_budget_batches(num_tokens: list[int], max_tokens_per_batch: int) -> list[list[int]]:
+    """
+    Groups sequences into length-sorted batches whose padded size fits a token budget.
+
+    Sorting by length before batching keeps sequences of similar length together, which minimizes the padding
+    added to the shorter sequences of each batch. A sequence longer than the budget is placed in its own batch.
+
+    Args:
+        num_tokens (list[int]): The number of tokens of each sequence.
+        max_tokens_per_batch (int): The maximum number of padded tokens of a batch, i.e., batch size x longest sequence.
+
+    Returns:
+        list[list[int]]: The indices of the sequences grouped into batches.
+    """
+
+    assert max_tokens_per_batch > 0, f"'max_tokens_per_batch' should be greater than 0. Got {max_tokens_per_batch}."
+
+    sorted_indices = sorted(range(len(num_tokens)), key=lambda index: num_tokens[index])
+
+    batches = []
+    current_batch = []
+    for index in sorted_indices:
+        # The indices are sorted ascending, so the current sequence is the longest one of the batch.
+        padded_length = max(num_tokens[index], 1)
+        if len(current_batch) > 0 and padded_length * (len(current_batch) + 1) > max_tokens_per_batch:
+            batches.append(current_batch)
+            current_batch = []
+
+        current_batch.append(index)
+
+    if len(current_batch) > 0:
+        batches.append(current_batch)
+
+    return batches
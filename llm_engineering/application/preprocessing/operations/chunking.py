@@ -1,26 +1,126 @@
 import re
+from bisect import bisect_left
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, SentenceTransformersTokenTextSplitter
+from transformers import PreTrainedTokenizerFast
 
 from llm_engineering.application.networks import EmbeddingModelSingleton
+from llm_engineering.infrastructure.lazy import LazyProxy
 
-embedding_model = EmbeddingModelSingleton()
+embedding_model: EmbeddingModelSingleton = LazyProxy(EmbeddingModelSingleton)  # type: ignore[assignment]
 
 
 def chunk_text(text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> list[str]:
-    character_splitter = RecursiveCharacterTextSplitter(separators=["\n\n"], chunk_size=chunk_size, chunk_overlap=0)
-    text_split_by_characters = character_splitter.split_text(text)
+    chunks, _ = chunk_text_with_token_counts(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
-    token_splitter = SentenceTransformersTokenTextSplitter(
+    return chunks
+
+
+def chunk_text_with_token_counts(
+    text: str, chunk_size: int = 500, chunk_overlap: int = 50
+) -> tuple[list[str], list[int]]:
+    """
+    Splits the text into chunks that fit the input of the embedding model.
+
+    Args:
+        text (str): The text to chunk.
+        chunk_size (int): The maximum number of characters of the sections the text is split into at paragraph
+            boundaries before splitting them by tokens. Defaults to 500.
+        chunk_overlap (int): The number of tokens shared by consecutive chunks of the same section. Defaults to 50.
+
+    Returns:
+        tuple[list[str], list[int]]: The chunks and the number of tokens the embedding model sees for each chunk,
+            special tokens included, so the embedding step doesn't have to tokenize the chunks again.
+    """
+
+    tokenizer = embedding_model.tokenizer
+    num_special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+
+    chunks, num_tokens = split_text_on_tokens(
+        text,
+        tokenizer=tokenizer,
+        chunk_size=chunk_size,
+        tokens_per_chunk=embedding_model.max_input_length - num_special_tokens,
         chunk_overlap=chunk_overlap,
-        tokens_per_chunk=embedding_model.max_input_length,
-        model_name=embedding_model.model_id,
     )
-    chunks_by_tokens = []
-    for section in text_split_by_characters:
-        chunks_by_tokens.extend(token_splitter.split_text(section))
 
-    return chunks_by_tokens
+    return chunks, [chunk_num_tokens + num_special_tokens for chunk_num_tokens in num_tokens]
+
+
+def split_text_on_tokens(
+    text: str,
+    tokenizer: PreTrainedTokenizerFast,
+    chunk_size: int,
+    tokens_per_chunk: int,
+    chunk_overlap: int,
+    separator: str = "\n\n",
+) -> tuple[list[str], list[int]]:
+    """
+    Splits the text into overlapping token windows in a single tokenizer pass.
+
+    The text is tokenized once and the offset mapping of the fast tokenizer maps the token windows back to slices
+    of the original text, so the chunks keep their original casing and formatting. The paragraphs delimited by
+    `separator` are greedily merged into sections of at most `chunk_size` characters and the windows never cross
+    a section boundary.
+
+    Args:
+        text (str): The text to split.
+        tokenizer (PreTrainedTokenizerFast): The fast tokenizer of the embedding model.
+        chunk_size (int): The maximum number of characters of a section. Longer paragraphs form their own section.
+        tokens_per_chunk (int): The maximum number of tokens of a chunk, special tokens excluded.
+        chunk_overlap (int): The number of tokens shared by consecutive chunks of the same section.
+        separator (str): The paragraph separator. Defaults to a blank line.
+
+    Returns:
+        tuple[list[str], list[int]]: The chunks and their number of tokens, special tokens excluded.
+    """
+
+    assert tokenizer.is_fast, "Splitting on tokens requires a fast tokenizer that returns offset mappings."
+    assert (
+        0 <= chunk_overlap < tokens_per_chunk
+    ), f"'chunk_overlap' should be in [0, {tokens_per_chunk}). Got {chunk_overlap}."
+
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+    offsets = encoding["offset_mapping"]
+    token_starts = [start for start, _ in offsets]
+
+    chunks = []
+    num_tokens = []
+    for section_start, section_end in _split_sections(text, chunk_size=chunk_size, separator=separator):
+        first_token = bisect_left(token_starts, section_start)
+        last_token = bisect_left(token_starts, section_end)
+
+        window_start = first_token
+        while window_start < last_token:
+            window_end = min(window_start + tokens_per_chunk, last_token)
+            chunks.append(text[offsets[window_start][0] : offsets[window_end - 1][1]])
+            num_tokens.append(window_end - window_start)
+
+            if window_end == last_token:
+                break
+            window_start += tokens_per_chunk - chunk_overlap
+
+    return chunks, num_tokens
+
+
+def _split_sections(text: str, chunk_size: int, separator: str) -> list[tuple[int, int]]:
+    paragraphs = []
+    paragraph_start = 0
+    for match in re.finditer(re.escape(separator), text):
+        paragraphs.append((paragraph_start, match.start()))
+        paragraph_start = match.end()
+    paragraphs.append((paragraph_start, len(text)))
+
+    sections = []
+    for start, end in paragraphs:
+        if text[start:end].strip() == "":
+            continue
+
+        if len(sections) > 0 and end - sections[-1][0] <= chunk_size:
+            sections[-1] = (sections[-1][0], end)
+        else:
+            sections.append((start, end))
+
+    return sections
 
 
 def chunk_document(text: str, min_length: int, max_length: int) -> list[str]:
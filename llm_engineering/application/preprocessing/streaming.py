@@ -0,0 +1,129 @@
+import time
+from typing import Iterable, Iterator
+
+from loguru import logger
+
+from llm_engineering.application.utils import prefetch, process_map
+from llm_engineering.domain.base import NoSQLBaseDocument, VectorBaseDocument
+
+from .dispatchers import ChunkingDispatcher, CleaningDispatcher, EmbeddingDispatcher
+
+
+def stream_feature_engineering(
+    documents: Iterable[NoSQLBaseDocument],
+    num_workers: int = 0,
+    documents_per_task: int = 32,
+    embedding_batch_size: int = 256,
+    max_queue_size: int = 4,
+) -> dict:
+    """
+    Cleans, chunks, embeds and loads the documents into the vector database as a stream.
+
+    The stages are chained generators connected by bounded queues: the documents are cleaned and chunked in
+    `num_workers` worker processes, the chunks are embedded in batches of `embedding_batch_size` in a background
+    thread, and the cleaned documents and embedded chunks are upserted by the caller. Peak memory is bounded
+    by the queue sizes instead of the size of the corpus, and embedding overlaps with the database writes.
+
+    Args:
+        documents (Iterable[NoSQLBaseDocument]): The raw documents, consumed lazily.
+        num_workers (int): The number of clean/chunk worker processes. If 0, they run in a background thread.
+        documents_per_task (int): The number of documents sent to a worker process at once.
+        embedding_batch_size (int): The minimum number of chunks embedded together.
+        max_queue_size (int): The maximum number of batches buffered between two stages.
+
+    Returns:
+        dict: Summary statistics of the run, e.g., to be logged as step metadata.
+    """
+
+    summary = {
+        "num_documents": 0,
+        "num_chunks": 0,
+        "num_embedded_chunks": 0,
+        "num_dropped_chunks": 0,
+        "num_failed_batches": 0,
+        "categories": {},
+    }
+    start_time = time.perf_counter()
+    # The collection of each class is created or checked once per run instead of once per batch.
+    ensured_classes: set[type[VectorBaseDocument]] = set()
+
+    processed_documents = prefetch(
+        process_map(_clean_and_chunk_documents, documents, num_workers=num_workers, chunk_size=documents_per_task),
+        max_size=max_queue_size * documents_per_task,
+    )
+    embedded_batches = prefetch(
+        _embed_batches(processed_documents, embedding_batch_size=embedding_batch_size),
+        max_size=max_queue_size,
+    )
+    for cleaned_documents, num_chunks, embedded_chunks in embedded_batches:
+        summary["num_documents"] += len(cleaned_documents)
+        summary["num_chunks"] += num_chunks
+        summary["num_embedded_chunks"] += len(embedded_chunks)
+        if len(embedded_chunks) < num_chunks:
+            # The embedding handlers return no embeddings for a batch that failed to encode.
+            logger.error(f"Failed to embed {num_chunks - len(embedded_chunks)} of {num_chunks} chunks.")
+
+            summary["num_dropped_chunks"] += num_chunks - len(embedded_chunks)
+        for embedded_chunk in embedded_chunks:
+            category = embedded_chunk.get_category()
+            summary["categories"][category] = summary["categories"].get(category, 0) + 1
+
+        for documents_batch in (cleaned_documents, embedded_chunks):
+            if not _upsert(documents_batch, ensured_classes=ensured_classes):
+                summary["num_failed_batches"] += 1
+
+        logger.info(
+            "Streamed a batch into the vector database.",
+            num_documents=summary["num_documents"],
+            num_embedded_chunks=summary["num_embedded_chunks"],
+        )
+
+    summary["duration_seconds"] = time.perf_counter() - start_time
+
+    return summary
+
+
+def _clean_and_chunk_documents(
+    data_models: list[NoSQLBaseDocument],
+) -> list[tuple[VectorBaseDocument, list[VectorBaseDocument]]]:
+    processed_documents = []
+    for data_model in data_models:
+        cleaned_document = CleaningDispatcher.dispatch(data_model)
+        processed_documents.append((cleaned_document, ChunkingDispatcher.dispatch(cleaned_document)))
+
+    return processed_documents
+
+
+def _embed_batches(
+    processed_documents: Iterable[tuple[VectorBaseDocument, list[VectorBaseDocument]]], embedding_batch_size: int
+) -> Iterator[tuple[list[VectorBaseDocument], int, list[VectorBaseDocument]]]:
+    cleaned_documents = []
+    chunks = []
+    for cleaned_document, document_chunks in processed_documents:
+        cleaned_documents.append(cleaned_document)
+        chunks.extend(document_chunks)
+
+        if len(chunks) >= embedding_batch_size:
+            yield cleaned_documents, len(chunks), EmbeddingDispatcher.dispatch(chunks)
+
+            cleaned_documents = []
+            chunks = []
+
+    if len(cleaned_documents) > 0:
+        yield cleaned_documents, len(chunks), EmbeddingDispatcher.dispatch(chunks)
+
+
+def _upsert(documents: list[VectorBaseDocument], ensured_classes: set[type[VectorBaseDocument]]) -> bool:
+    is_successful = True
+    for document_class, class_documents in VectorBaseDocument.group_by_class(documents).items():
+        if document_class not in ensured_classes:
+            document_class.get_or_create_collection()
+            ensured_classes.add(document_class)
+
+        summary = document_class.bulk_load(class_documents, create_collection=False)
+        if summary["num_failed_batches"] > 0:
+            logger.error(f"Failed to insert documents into {document_class.get_collection_name()}")
+
+            is_successful = False
+
+    return is_successful
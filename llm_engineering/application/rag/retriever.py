@@ -1,4 +1,4 @@
-import concurrent.futures
+import asyncio
 
 import opik
 from loguru import logger
@@ -39,17 +39,39 @@ class ContextRetriever:
             f"Successfully extracted the author_full_name = {query_model.author_full_name} from the query.",
         )
 
+        return self._search_with_metadata(query, query_model, k=k, expand_to_n_queries=expand_to_n_queries)
+
+    @opik.track(name="ContextRetriever.asearch")
+    async def asearch(
+        self,
+        query: str,
+        k: int = 3,
+        expand_to_n_queries: int = 3,
+    ) -> list:
+        """
+        Async version of `search`. The metadata extraction awaits the async LLM and MongoDB calls, while
+        the query expansion, the vector search and the reranking run in a worker thread.
+        """
+
+        query_model = Query.from_str(query)
+
+        query_model = await self._metadata_extractor.agenerate(query_model)
+        logger.info(
+            f"Successfully extracted the author_full_name = {query_model.author_full_name} from the query.",
+        )
+
+        return await asyncio.to_thread(
+            self._search_with_metadata, query, query_model, k=k, expand_to_n_queries=expand_to_n_queries
+        )
+
+    def _search_with_metadata(self, query: str, query_model: Query, k: int, expand_to_n_queries: int) -> list:
         n_generated_queries = self._query_expander.generate(query_model, expand_to_n=expand_to_n_queries)
         logger.info(
             f"Successfully generated {len(n_generated_queries)} search queries.",
         )
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            search_tasks = [executor.submit(self._search, _query_model, k) for _query_model in n_generated_queries]
-
-            n_k_documents = [task.result() for task in concurrent.futures.as_completed(search_tasks)]
-            n_k_documents = utils.misc.flatten(n_k_documents)
-            n_k_documents = list(set(n_k_documents))
+        n_k_documents = self._search_batch(n_generated_queries, k)
+        n_k_documents = list(set(n_k_documents))
 
         logger.info(f"{len(n_k_documents)} documents retrieved successfully")
 
@@ -61,11 +83,23 @@ class ContextRetriever:
         return k_documents
 
     def _search(self, query: Query, k: int = 3) -> list[EmbeddedChunk]:
+        return self._search_batch([query], k)
+
+    def _search_batch(self, queries: list[Query], k: int = 3) -> list[EmbeddedChunk]:
+        """
+        Embeds all queries in a single forward pass and searches every data category for all of them
+        with a single batch request per category.
+        """
+
         assert k >= 3, "k should be >= 3"
 
-        def _search_data_category(
-            data_category_odm: type[EmbeddedChunk], embedded_query: EmbeddedQuery
-        ) -> list[EmbeddedChunk]:
+        if len(queries) == 0:
+            return []
+
+        embedded_queries: list[EmbeddedQuery] = EmbeddingDispatcher.dispatch(queries)
+
+        query_filters = []
+        for embedded_query in embedded_queries:
             if embedded_query.author_id:
                 query_filter = Filter(
                     must=[
@@ -79,22 +113,18 @@ class ContextRetriever:
                 )
             else:
                 query_filter = None
+            query_filters.append(query_filter)
 
-            return data_category_odm.search(
-                query_vector=embedded_query.embedding,
-                limit=k // 3,
-                query_filter=query_filter,
-            )
-
-        embedded_query: EmbeddedQuery = EmbeddingDispatcher.dispatch(query)
-
-        post_chunks = _search_data_category(EmbeddedPostChunk, embedded_query)
-        articles_chunks = _search_data_category(EmbeddedArticleChunk, embedded_query)
-        repositories_chunks = _search_data_category(EmbeddedRepositoryChunk, embedded_query)
-
-        retrieved_chunks = post_chunks + articles_chunks + repositories_chunks
+        retrieved_chunks = EmbeddedChunk.search_batch_collections(
+            [EmbeddedPostChunk, EmbeddedArticleChunk, EmbeddedRepositoryChunk],
+            query_vectors=[embedded_query.embedding for embedded_query in embedded_queries],
+            limit=k // 3,
+            query_filter=query_filters,
+        )
 
-        return retrieved_chunks
+        return utils.misc.flatten(
+            [chunks for category_chunks in retrieved_chunks.values() for chunks in category_chunks]
+        )
 
     def rerank(self, query: str | Query, chunks: list[EmbeddedChunk], keep_top_k: int) -> list[EmbeddedChunk]:
         if isinstance(query, str):
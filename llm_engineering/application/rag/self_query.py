@@ -17,20 +17,42 @@ class SelfQuery(RAGStep):
         if self._mock:
             return query
 
-        prompt = SelfQueryTemplate().create_template()
-        model = ChatOpenAI(model=settings.OPENAI_MODEL_ID, api_key=settings.OPENAI_API_KEY, temperature=0)
+        response = self._build_chain().invoke({"question": query})
+        user_full_name = response.content.strip("\n ")
+
+        if user_full_name == "none":
+            return query
+
+        first_name, last_name = utils.split_user_full_name(user_full_name)
+        user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
+
+        return self._set_author(query, user)
 
-        chain = prompt | model
+    @opik.track(name="SelfQuery.agenerate")
+    async def agenerate(self, query: Query) -> Query:
+        """Async version of `generate`, which doesn't block the event loop on the LLM call or on MongoDB."""
 
-        response = chain.invoke({"question": query})
+        if self._mock:
+            return query
+
+        response = await self._build_chain().ainvoke({"question": query})
         user_full_name = response.content.strip("\n ")
 
         if user_full_name == "none":
             return query
 
         first_name, last_name = utils.split_user_full_name(user_full_name)
-        user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
+        user = await UserDocument.aget_or_create(first_name=first_name, last_name=last_name)
+
+        return self._set_author(query, user)
+
+    def _build_chain(self):
+        prompt = SelfQueryTemplate().create_template()
+        model = ChatOpenAI(model=settings.OPENAI_MODEL_ID, api_key=settings.OPENAI_API_KEY, temperature=0)
+
+        return prompt | model
 
+    def _set_author(self, query: Query, user: UserDocument) -> Query:
         query.author_id = user.id
         query.author_full_name = user.full_name
 
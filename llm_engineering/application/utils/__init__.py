@@ -1,4 +1,5 @@
 from . import misc
+from .parallel import prefetch, process_map
 from .split_user_full_name import split_user_full_name
 
-__all__ = ["misc", "split_user_full_name"]
+__all__ = ["misc", "prefetch", "process_map", "split_user_full_name"]
@@ -0,0 +1,122 @@
+import multiprocessing as mp
+import queue
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from threading import Event, Thread
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+def process_map(
+    func: Callable[[list[T]], list[R]],
+    items: Iterable[T],
+    num_workers: int,
+    chunk_size: int,
+    max_pending_chunks: int | None = None,
+) -> Iterator[R]:
+    """
+    Applies `func` to chunks of `items` in a pool of worker processes and yields the results in input order.
+
+    At most `max_pending_chunks` chunks are in flight at once, so the input iterable is consumed lazily and
+    memory stays bounded regardless of the number of items.
+
+    Args:
+        func (Callable[[list[T]], list[R]]): A picklable, module-level function mapping a chunk of items
+            to a list of results.
+        items (Iterable[T]): The items to process.
+        num_workers (int): The number of worker processes. If 0, the chunks are processed in the current process.
+        chunk_size (int): The number of items sent to a worker at once.
+        max_pending_chunks (int | None): The maximum number of chunks in flight. Defaults to 2 x `num_workers`.
+
+    Yields:
+        R: The results of `func`, flattened, in the same order as the items.
+    """
+
+    assert chunk_size > 0, f"'chunk_size' should be greater than 0. Got {chunk_size}."
+
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+
+    if num_workers <= 0:
+        for chunk in chunks:
+            yield from func(chunk)
+
+        return
+
+    max_pending_chunks = max_pending_chunks or 2 * num_workers
+    # Spawn instead of fork, as forking a process that already runs threads (e.g., torch's) is unsafe.
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp.get_context("spawn")) as executor:
+        pending: deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_pending_chunks:
+                yield from pending.popleft().result()
+
+        while len(pending) > 0:
+            yield from pending.popleft().result()
+
+
+def prefetch(items: Iterable[T], max_size: int) -> Iterator[T]:
+    """
+    Consumes `items` in a background thread, staying at most `max_size` items ahead of the caller.
+
+    Chaining generators through `prefetch` turns them into pipeline stages connected by bounded queues: each stage
+    runs concurrently with the next one, while the number of buffered items, and thus memory, stays bounded.
+    Exceptions raised while producing the items are re-raised in the caller.
+
+    Args:
+        items (Iterable[T]): The items to produce in the background.
+        max_size (int): The maximum number of items buffered between the producer and the caller.
+
+    Yields:
+        T: The items, in the same order.
+    """
+
+    assert max_size > 0, f"'max_size' should be greater than 0. Got {max_size}."
+
+    buffer: queue.Queue[tuple[Any, BaseException | None]] = queue.Queue(maxsize=max_size)
+    is_closed = Event()
+
+    def put(item: Any, error: BaseException | None = None) -> bool:
+        # Put with a timeout, so the producer stops if the caller abandons the iterator.
+        while not is_closed.is_set():
+            try:
+                buffer.put((item, error), timeout=0.1)
+
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_DONE, e)
+
+            return
+
+        put(_DONE)
+
+    Thread(target=produce, name="prefetch", daemon=True).start()
+
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+
+                return
+
+            yield item
+    finally:
+        is_closed.set()
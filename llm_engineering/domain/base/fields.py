@@ -0,0 +1,23 @@
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+
+class FieldLayout(NamedTuple):
+    """
+    Metadata about the fields of a model, computed once per class instead of once per document.
+
+    Attributes:
+        field_names (frozenset[str]): The names of the fields of the model.
+        has_embedding (bool): Whether the model has an `embedding` field.
+    """
+
+    field_names: frozenset[str]
+    has_embedding: bool
+
+
+def build_field_layout(model_class: type[BaseModel]) -> FieldLayout:
+    return FieldLayout(
+        field_names=frozenset(model_class.model_fields),
+        has_embedding="embedding" in model_class.model_fields,
+    )
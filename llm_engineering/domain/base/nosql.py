@@ -1,24 +1,49 @@
+import asyncio
+import contextvars
+import functools
 import uuid
 from abc import ABC
-from typing import Generic, Type, TypeVar
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Generic, Iterable, Iterator, Type, TypeVar
+from uuid import UUID
 
 from loguru import logger
 from pydantic import UUID4, BaseModel, Field
-from pymongo import errors
+from pymongo import IndexModel, ReplaceOne, ReturnDocument, UpdateOne, errors
+from pymongo.database import Database
 
+from llm_engineering.domain.base.fields import build_field_layout
+from llm_engineering.domain.base.registry import DocumentMetadata, DocumentRegistry
 from llm_engineering.domain.exceptions import ImproperlyConfigured
 from llm_engineering.infrastructure.db.mongo import connection
+from llm_engineering.infrastructure.lazy import LazyProxy
 from llm_engineering.settings import settings
 
-_database = connection.get_database(settings.DATABASE_NAME)
+_database: Database = LazyProxy(lambda: connection.get_database(settings.DATABASE_NAME))  # type: ignore[assignment]
+# Runs the blocking pymongo calls of the async methods, so they don't block the event loop.
+_async_executor: ThreadPoolExecutor = LazyProxy(  # type: ignore[assignment]
+    lambda: ThreadPoolExecutor(max_workers=settings.DATABASE_ASYNC_MAX_WORKERS, thread_name_prefix="mongo_async")
+)
 
 
 T = TypeVar("T", bound="NoSQLBaseDocument")
 
+# The metadata of every NoSQLBaseDocument subclass, recorded when the class is created.
+_registry = DocumentRegistry()
+
 
 class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs) -> None:
+        # Called once the fields of the subclass are set up, unlike __init_subclass__.
+        super().__pydantic_init_subclass__(**kwargs)
+
+        _registry.register(cls, cls._build_metadata())
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, self.__class__):
             return False
@@ -44,14 +69,11 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
         exclude_unset = kwargs.pop("exclude_unset", False)
         by_alias = kwargs.pop("by_alias", True)
 
-        parsed = self.model_dump(exclude_unset=exclude_unset, by_alias=by_alias, **kwargs)
+        # The compiled serializer converts the UUIDs into strings in the same single pass as the other fields.
+        parsed = super().model_dump(mode="json", exclude_unset=exclude_unset, by_alias=by_alias, **kwargs)
 
         if "_id" not in parsed and "id" in parsed:
-            parsed["_id"] = str(parsed.pop("id"))
-
-        for key, value in parsed.items():
-            if isinstance(value, uuid.UUID):
-                parsed[key] = str(value)
+            parsed["_id"] = parsed.pop("id")
 
         return parsed
 
@@ -77,21 +99,31 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def get_or_create(cls: Type[T], **filter_options) -> T:
+        """
+        Finds the document matching `filter_options`, or inserts it, atomically in a single round trip.
+
+        Concurrent calls with the same filter can't insert duplicates, as the lookup and the insert are a single
+        upsert. Fields not in `filter_options` take their default values on insert.
+        """
+
         collection = _database[cls.get_collection_name()]
         try:
+            instance = collection.find_one_and_update(
+                filter_options,
+                {"$setOnInsert": cls(**filter_options).to_mongo()},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except errors.DuplicateKeyError:
+            # A concurrent upsert of the same document won the race on a unique index.
             instance = collection.find_one(filter_options)
-            if instance:
-                return cls.from_mongo(instance)
-
-            new_instance = cls(**filter_options)
-            new_instance = new_instance.save()
-
-            return new_instance
         except errors.OperationFailure:
             logger.exception(f"Failed to retrieve document with filter options: {filter_options}")
 
             raise
 
+        return cls.from_mongo(instance)
+
     @classmethod
     def bulk_insert(cls: Type[T], documents: list[T], **kwargs) -> bool:
         collection = _database[cls.get_collection_name()]
@@ -104,6 +136,98 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
             return False
 
+    @classmethod
+    def bulk_upsert(
+        cls: Type[T],
+        documents: Iterable[T],
+        key_fields: list[str] | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> dict:
+        """
+        Inserts the documents or updates the ones that already exist, in unordered bulk writes.
+
+        The documents are written in batches of `batch_size`, with up to `max_concurrency` batches in flight.
+        As the writes are unordered, a failed write, e.g., a duplicate on a unique index, doesn't abort the rest
+        of its batch, so re-ingesting the same documents is safe.
+
+        Args:
+            documents (Iterable[T]): The documents to upsert, consumed lazily.
+            key_fields (list[str] | None): The fields identifying an existing document. By default, documents are
+                matched by ID and replaced. Otherwise, the matched documents are updated and keep their ID.
+            batch_size (int | None): The number of documents per bulk write. Defaults to the settings.
+            max_concurrency (int | None): The maximum number of concurrent bulk writes. Defaults to the settings.
+
+        Returns:
+            dict: The number of inserted, updated and failed documents, in total and per batch.
+        """
+
+        batch_size = batch_size or settings.DATABASE_BULK_BATCH_SIZE
+        max_concurrency = max_concurrency or settings.DATABASE_BULK_MAX_CONCURRENCY
+
+        summary = {"num_inserted": 0, "num_updated": 0, "num_failed": 0, "batches": []}
+
+        def add_to_summary(batch_summary: dict) -> None:
+            summary["batches"].append(batch_summary)
+            for key in ["num_inserted", "num_updated", "num_failed"]:
+                summary[key] += batch_summary[key]
+
+        operations = (cls._to_upsert_operation(document.to_mongo(), key_fields) for document in documents)
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="bulk_upsert") as executor:
+            pending: deque[Future] = deque()
+            for batch in _batch(operations, size=batch_size):
+                pending.append(executor.submit(cls._bulk_write, batch))
+                if len(pending) >= 2 * max_concurrency:
+                    add_to_summary(pending.popleft().result())
+
+            while len(pending) > 0:
+                add_to_summary(pending.popleft().result())
+
+        logger.info(
+            f"Upserted documents of type {cls.__name__}.",
+            num_inserted=summary["num_inserted"],
+            num_updated=summary["num_updated"],
+            num_failed=summary["num_failed"],
+        )
+
+        return summary
+
+    @staticmethod
+    def _to_upsert_operation(data: dict, key_fields: list[str] | None) -> ReplaceOne | UpdateOne:
+        if key_fields is None:
+            return ReplaceOne({"_id": data["_id"]}, data, upsert=True)
+
+        _id = data.pop("_id")
+
+        return UpdateOne(
+            {field: data[field] for field in key_fields},
+            {"$set": data, "$setOnInsert": {"_id": _id}},
+            upsert=True,
+        )
+
+    @classmethod
+    def _bulk_write(cls: Type[T], operations: list[ReplaceOne | UpdateOne]) -> dict:
+        collection = _database[cls.get_collection_name()]
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except errors.BulkWriteError as e:
+            details = e.details
+            logger.warning(
+                f"Failed to write {len(details['writeErrors'])} / {len(operations)} documents of type {cls.__name__}"
+            )
+        except errors.PyMongoError:
+            logger.exception(f"Failed to write {len(operations)} documents of type {cls.__name__}")
+
+            return {"num_inserted": 0, "num_updated": 0, "num_failed": len(operations)}
+
+        # Documents matched by an upsert count as updated, even if their content didn't change.
+        return {
+            "num_inserted": details["nUpserted"],
+            "num_updated": details["nMatched"],
+            "num_failed": len(details["writeErrors"]),
+        }
+
     @classmethod
     def find(cls: Type[T], **filter_options) -> T | None:
         collection = _database[cls.get_collection_name()]
@@ -129,11 +253,168 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
             return []
 
+    @classmethod
+    async def afind(cls: Type[T], **filter_options) -> T | None:
+        """Async version of `find`."""
+
+        return await _run_async(cls.find, **filter_options)
+
+    @classmethod
+    async def abulk_find(cls: Type[T], **filter_options) -> list[T]:
+        """Async version of `bulk_find`."""
+
+        return await _run_async(cls.bulk_find, **filter_options)
+
+    @classmethod
+    async def aget_or_create(cls: Type[T], **filter_options) -> T:
+        """Async version of `get_or_create`."""
+
+        return await _run_async(cls.get_or_create, **filter_options)
+
+    async def asave(self: T, **kwargs) -> T | None:
+        """Async version of `save`."""
+
+        return await _run_async(self.save, **kwargs)
+
+    @classmethod
+    def bulk_iter(
+        cls: Type[T],
+        batch_size: int | None = None,
+        projection: list[str] | None = None,
+        raw: bool = False,
+        **filter_options,
+    ) -> Iterator[T | dict]:
+        """
+        Streams the documents matching `filter_options` through a server-side cursor.
+
+        Only one batch of documents is held in memory at a time, instead of the whole result.
+
+        Args:
+            batch_size (int | None): The number of documents returned per round trip. Defaults to the settings.
+            projection (list[str] | None): The fields to fetch. Documents hydrated from a subset of the fields
+                aren't validated and leave the other fields unset.
+            raw (bool): Whether to yield the documents as stored in MongoDB, as dicts, without hydrating them.
+            **filter_options: The filter of the query.
+
+        Yields:
+            T | dict: The documents, or their raw dicts if `raw` is True.
+
+        Raises:
+            OperationFailure: If the query fails, including in the middle of the stream.
+        """
+
+        collection = _database[cls.get_collection_name()]
+        batch_size = batch_size or settings.DATABASE_CURSOR_BATCH_SIZE
+        try:
+            cursor = collection.find(filter_options, projection=projection, batch_size=batch_size)
+            with cursor:
+                for instance in cursor:
+                    if raw:
+                        yield instance
+                    elif projection is not None:
+                        yield cls.model_construct(id=UUID(instance.pop("_id")), **instance)
+                    else:
+                        yield cls.from_mongo(instance)
+        except errors.OperationFailure:
+            # Re-raised, as ending the stream early would look like a complete result to the consumer.
+            logger.exception(f"Failed to stream documents of type {cls.__name__}")
+
+            raise
+
+    @classmethod
+    def ensure_indexes(cls: Type[T]) -> list[str]:
+        """
+        Creates the indexes declared in the Settings class of this class and of all its subclasses.
+
+        It's idempotent, as MongoDB doesn't rebuild an index that already exists with the same keys and options.
+        An index that can't be created, e.g., a unique index over duplicated values, is logged and skipped.
+
+        Returns:
+            list[str]: The names of the indexes that exist after the call.
+        """
+
+        index_names = []
+        collection_names = set()
+        for document_class in [cls, *_registry.get_classes()]:
+            if not issubclass(document_class, cls):
+                continue
+
+            collection_name = document_class.get_metadata().collection_name
+            if collection_name is None or collection_name in collection_names:
+                continue
+            collection_names.add(collection_name)
+
+            collection = _database[collection_name]
+            for index in document_class.get_indexes():
+                try:
+                    index_names.extend(collection.create_indexes([index]))
+                except errors.OperationFailure:
+                    logger.exception(f"Failed to create the index '{index.document['name']}' of '{collection_name}'.")
+
+        if len(index_names) > 0:
+            logger.info(f"Ensured {len(index_names)} indexes over {len(collection_names)} collections.")
+
+        return index_names
+
+    @classmethod
+    def get_indexes(cls: Type[T]) -> list[IndexModel]:
+        return list(cls.get_metadata().indexes)
+
     @classmethod
     def get_collection_name(cls: Type[T]) -> str:
-        if not hasattr(cls, "Settings") or not hasattr(cls.Settings, "name"):
+        collection_name = cls.get_metadata().collection_name
+        if collection_name is None:
             raise ImproperlyConfigured(
                 "Document should define an Settings configuration class with the name of the collection."
             )
 
-        return cls.Settings.name
+        return collection_name
+
+    @classmethod
+    def get_metadata(cls: Type[T]) -> DocumentMetadata:
+        metadata = _registry.get_metadata(cls)
+        if metadata is None:
+            # Only classes created before the registration hook, i.e., NoSQLBaseDocument itself, get here.
+            metadata = _registry.register(cls, cls._build_metadata())
+
+        return metadata
+
+    @classmethod
+    def _build_metadata(cls: Type[T]) -> DocumentMetadata:
+        config = getattr(cls, "Settings", None)
+
+        return DocumentMetadata(
+            collection_name=getattr(config, "name", None),
+            category=None,
+            use_vector_index=False,
+            field_layout=build_field_layout(cls),
+            hnsw_config=None,
+            quantization_config=None,
+            vectors_on_disk=None,
+            payload_indexes={},
+            indexes=tuple(getattr(config, "indexes", ())),
+        )
+
+
+async def _run_async(function: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs a blocking ODM method in the thread pool of the async methods and awaits its result.
+
+    pymongo's client is thread-safe and pools its connections, so the queries run concurrently up to
+    `settings.DATABASE_ASYNC_MAX_WORKERS`. The context variables, e.g., the current trace, are propagated.
+
+    Motor isn't used, as it would only add a dependency: it also runs pymongo's blocking calls in a thread pool,
+    and the sync and async methods share one client and one set of document classes this way.
+    """
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, function, *args, **kwargs)
+
+    return await loop.run_in_executor(_async_executor, call)
+
+
+def _batch(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING, NamedTuple
+
+from llm_engineering.domain.base.fields import FieldLayout
+from llm_engineering.domain.types import DataCategory
+
+if TYPE_CHECKING:
+    from pymongo import IndexModel
+    from qdrant_client.models import HnswConfigDiff, PayloadSchemaType, QuantizationConfig
+
+
+class DocumentMetadata(NamedTuple):
+    """
+    The metadata of a document class, read once from its configuration class when the class is created.
+
+    Attributes:
+        collection_name (str | None): The name of the collection, or None if the class doesn't define one.
+        category (DataCategory | None): The data category, or None if the class doesn't define one.
+        use_vector_index (bool): Whether the collection has a vector index.
+        field_layout (FieldLayout): The layout of the fields of the class.
+        hnsw_config (HnswConfigDiff | None): The HNSW configuration of the vector index, if overridden.
+        quantization_config (QuantizationConfig | None): The quantization of the vectors, if any.
+        vectors_on_disk (bool | None): Whether the vectors are stored on disk, or None for the server default.
+        payload_indexes (dict[str, PayloadSchemaType]): The schemas of the indexed payload fields, by field name.
+        indexes (tuple[IndexModel, ...]): The MongoDB indexes of the collection.
+    """
+
+    collection_name: str | None
+    category: DataCategory | None
+    use_vector_index: bool
+    field_layout: FieldLayout
+    hnsw_config: "HnswConfigDiff | None"
+    quantization_config: "QuantizationConfig | None"
+    vectors_on_disk: bool | None
+    payload_indexes: "dict[str, PayloadSchemaType]"
+    indexes: "tuple[IndexModel, ...]"
+
+
+class DocumentRegistry:
+    """
+    Maps the document classes of an ODM to their metadata, and the collection names to their classes.
+
+    If several classes share a collection name, e.g., a subclass inheriting the configuration of its parent,
+    the collection name maps to the first class registered.
+    """
+
+    def __init__(self) -> None:
+        self._metadata: dict[type, DocumentMetadata] = {}
+        self._classes_by_collection_name: dict[str, type] = {}
+
+    def register(self, document_class: type, metadata: DocumentMetadata) -> DocumentMetadata:
+        self._metadata[document_class] = metadata
+        if metadata.collection_name is not None:
+            self._classes_by_collection_name.setdefault(metadata.collection_name, document_class)
+
+        return metadata
+
+    def unregister(self, document_class: type) -> None:
+        metadata = self._metadata.pop(document_class, None)
+        if metadata is None or self._classes_by_collection_name.get(metadata.collection_name) is not document_class:
+            return
+
+        del self._classes_by_collection_name[metadata.collection_name]
+        for other_class, other_metadata in self._metadata.items():
+            if other_metadata.collection_name == metadata.collection_name:
+                self._classes_by_collection_name[metadata.collection_name] = other_class
+
+                break
+
+    def get_metadata(self, document_class: type) -> DocumentMetadata | None:
+        return self._metadata.get(document_class)
+
+    def get_classes(self) -> list[type]:
+        return list(self._metadata)
+
+    def get_class(self, collection_name: str) -> type | None:
+        return self._classes_by_collection_name.get(collection_name)
@@ -1,26 +1,51 @@
+import time
 import uuid
 from abc import ABC
-from typing import Any, Callable, Dict, Generic, Type, TypeVar
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Type, TypeVar
 from uuid import UUID
 
 import numpy as np
 from loguru import logger
 from pydantic import UUID4, BaseModel, Field
-from qdrant_client.http import exceptions
-from qdrant_client.http.models import Distance, VectorParams
-from qdrant_client.models import CollectionInfo, PointStruct, Record
-
-from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton
+from qdrant_client.http.models import Distance, PayloadIndexInfo, PayloadSchemaType, VectorParams
+from qdrant_client.models import (
+    CollectionInfo,
+    Filter,
+    HnswConfigDiff,
+    PointStruct,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    Record,
+    SearchParams,
+    SearchRequest,
+)
+
+from llm_engineering.domain.base.fields import FieldLayout, build_field_layout
+from llm_engineering.domain.base.registry import DocumentMetadata, DocumentRegistry
 from llm_engineering.domain.exceptions import ImproperlyConfigured
 from llm_engineering.domain.types import DataCategory
-from llm_engineering.infrastructure.db.qdrant import connection
+from llm_engineering.infrastructure.db.qdrant import QDRANT_ERRORS
+from llm_engineering.infrastructure.db.vector_store import connection, get_bytes_per_dimension
+from llm_engineering.settings import settings
 
 T = TypeVar("T", bound="VectorBaseDocument")
 
+# The metadata of every VectorBaseDocument subclass, recorded when the class is created.
+_registry = DocumentRegistry()
+
 
 class VectorBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs) -> None:
+        # Called once the fields of the subclass are set up, unlike __init_subclass__.
+        super().__pydantic_init_subclass__(**kwargs)
+
+        _registry.register(cls, cls._build_metadata())
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, self.__class__):
             return False
@@ -31,31 +56,76 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         return hash(self.id)
 
     @classmethod
-    def from_record(cls: Type[T], point: Record) -> T:
-        _id = UUID(point.id, version=4)
-        payload = point.payload or {}
+    def from_record(cls: Type[T], point: Record, strict: bool | None = None, partial: bool = False) -> T:
+        """
+        Builds a document from a record read from the vector database.
+
+        The records hold payloads written by `to_point`, so by default they are passed as is to the compiled
+        pydantic-core validator of the class, using the field layout computed once per class. The strict mode goes
+        through the regular constructor instead and rejects payload fields the class doesn't declare, which are
+        otherwise ignored, e.g., to debug a schema drift between the code and the collection.
+
+        The partial mode hydrates records read with a subset of the payload fields: each field of the record is
+        validated on its own and the fields missing from the record are left unset.
 
+        Args:
+            point (Record): The record, e.g., returned by a scroll or a search.
+            strict (bool | None): Whether to use the strict mode. Defaults to the settings.
+            partial (bool): Whether the record holds only some of the payload fields.
+
+        Returns:
+            T: The document.
+        """
+
+        field_layout = cls.get_field_layout()
         attributes = {
-            "id": _id,
-            **payload,
+            "id": point.id,
+            **(point.payload or {}),
         }
-        if cls._has_class_attribute("embedding"):
+        if field_layout.has_embedding and (point.vector is not None or not partial):
             attributes["embedding"] = point.vector or None
 
+        if partial:
+            document = cls.model_construct(id=UUID(str(attributes.pop("id")), version=4))
+            for name, value in attributes.items():
+                if name in field_layout.field_names:
+                    cls.__pydantic_validator__.validate_assignment(document, name, value)
+
+            return document
+
+        if strict is None:
+            strict = settings.VECTOR_DB_STRICT_HYDRATION
+        if not strict:
+            return cls.__pydantic_validator__.validate_python(attributes)
+
+        unknown_fields = attributes.keys() - field_layout.field_names
+        if len(unknown_fields) > 0:
+            raise ValueError(f"Record '{point.id}' has fields not declared by {cls.__name__}: {sorted(unknown_fields)}")
+        attributes["id"] = UUID(point.id, version=4)
+
         return cls(**attributes)
 
     def to_point(self: T, **kwargs) -> PointStruct:
         exclude_unset = kwargs.pop("exclude_unset", False)
         by_alias = kwargs.pop("by_alias", True)
 
-        payload = self.model_dump(exclude_unset=exclude_unset, by_alias=by_alias, **kwargs)
+        exclude = kwargs.pop("exclude", None) or set()
 
-        _id = str(payload.pop("id"))
-        vector = payload.pop("embedding", {})
-        if vector and isinstance(vector, np.ndarray):
+        # The compiled serializer converts the UUIDs and enums in the same single pass as the other fields in the
+        # JSON mode. The embedding is converted straight from its float32 buffer instead of going through it.
+        payload = super().model_dump(
+            mode="json", exclude_unset=exclude_unset, by_alias=by_alias, exclude={*exclude, "embedding"}, **kwargs
+        )
+
+        _id = payload.pop("id")
+        vector = getattr(self, "embedding", None)
+        if vector is None:
+            vector = {}
+        elif isinstance(vector, np.ndarray):
             vector = vector.tolist()
 
-        return PointStruct(id=_id, vector=vector, payload=payload)
+        # The point is built from already serialized values, so validating them again would only copy the vector.
+        return PointStruct.model_construct(id=_id, vector=vector, payload=payload)
 
     def model_dump(self: T, **kwargs) -> dict:
         dict_ = super().model_dump(**kwargs)
@@ -80,7 +150,7 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
     def bulk_insert(cls: Type[T], documents: list["VectorBaseDocument"]) -> bool:
         try:
             cls._bulk_insert(documents)
-        except exceptions.UnexpectedResponse:
+        except QDRANT_ERRORS:
             logger.info(
                 f"Collection '{cls.get_collection_name()}' does not exist. Trying to create the collection and reinsert the documents."
             )
@@ -89,7 +159,7 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
             try:
                 cls._bulk_insert(documents)
-            except exceptions.UnexpectedResponse:
+            except QDRANT_ERRORS:
                 logger.error(f"Failed to insert documents in '{cls.get_collection_name()}'.")
 
                 return False
@@ -102,11 +172,131 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
         connection.upsert(collection_name=cls.get_collection_name(), points=points)
 
+    @classmethod
+    def bulk_load(
+        cls: Type[T],
+        documents: Iterable["VectorBaseDocument"],
+        max_batch_bytes: int | None = None,
+        max_concurrency: int | None = None,
+        max_retries: int | None = None,
+        retry_backoff_seconds: float = 0.5,
+        create_collection: bool = True,
+    ) -> dict:
+        """
+        Upserts the documents in batches sized by payload bytes, with several batches in flight at once.
+
+        Every batch but the last is sent with `wait=False`, so Qdrant acknowledges it as soon as it is written to
+        its WAL. Once all of them are acknowledged, the last batch is sent with `wait=True`. Qdrant applies the
+        operations of a shard in order, so it returns once all the batches are searchable, acting as a consistency
+        barrier. Failed batches are retried with exponential backoff.
+
+        The barrier only holds for a collection with a single shard and a single replica, as Qdrant doesn't order
+        the unacknowledged upserts across shards or replicas. For a sharded or replicated collection, the points
+        of the other batches may become searchable only after this method returns.
+
+        Args:
+            documents (Iterable[VectorBaseDocument]): The documents to upsert, consumed lazily.
+            max_batch_bytes (int | None): The estimated maximum size of a batch. Defaults to the settings.
+            max_concurrency (int | None): The maximum number of concurrent upserts. Defaults to the settings.
+            max_retries (int | None): The number of retries of a failed batch. Defaults to the settings.
+            retry_backoff_seconds (float): The delay before the first retry, doubled after each retry.
+            create_collection (bool): Whether to create or check the collection first. Callers loading many
+                batches into the same collection can do it once with `get_or_create_collection` and skip it here.
+
+        Returns:
+            dict: Summary statistics of the load, including the throughput in points/sec.
+        """
+
+        max_batch_bytes = max_batch_bytes or settings.VECTOR_DB_BULK_MAX_BATCH_BYTES
+        max_concurrency = max_concurrency or settings.VECTOR_DB_BULK_MAX_CONCURRENCY
+        max_retries = settings.VECTOR_DB_BULK_MAX_RETRIES if max_retries is None else max_retries
+
+        if create_collection:
+            cls.get_or_create_collection()
+
+        summary = {"num_points": 0, "num_batches": 0, "num_failed_batches": 0, "num_failed_points": 0}
+        start_time = time.perf_counter()
+
+        def add_to_summary(num_points: int, is_successful: bool) -> None:
+            summary["num_batches"] += 1
+            if is_successful:
+                summary["num_points"] += num_points
+            else:
+                summary["num_failed_batches"] += 1
+                summary["num_failed_points"] += num_points
+
+        points = (document.to_point() for document in documents)
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="bulk_load") as executor:
+            pending: deque[tuple[int, Future]] = deque()
+            last_batch = None
+            # Holds back the last batch, so it's sent only after all the others are acknowledged.
+            bytes_per_dimension = get_bytes_per_dimension()
+            for batch in _batch_by_size(
+                points, max_batch_bytes=max_batch_bytes, bytes_per_dimension=bytes_per_dimension
+            ):
+                if last_batch is not None:
+                    future = executor.submit(
+                        cls._upsert_with_retries, last_batch, False, max_retries, retry_backoff_seconds
+                    )
+                    pending.append((len(last_batch), future))
+                    if len(pending) >= 2 * max_concurrency:
+                        num_points, future = pending.popleft()
+                        add_to_summary(num_points, future.result())
+
+                last_batch = batch
+
+            while len(pending) > 0:
+                num_points, future = pending.popleft()
+                add_to_summary(num_points, future.result())
+
+        if last_batch is not None:
+            add_to_summary(
+                len(last_batch),
+                cls._upsert_with_retries(last_batch, True, max_retries, retry_backoff_seconds),
+            )
+
+        summary["duration_seconds"] = time.perf_counter() - start_time
+        summary["points_per_second"] = summary["num_points"] / max(summary["duration_seconds"], 1e-9)
+
+        logger.info(
+            f"Loaded {summary['num_points']} points into '{cls.get_collection_name()}' "
+            f"at {summary['points_per_second']:.1f} points/sec.",
+            num_batches=summary["num_batches"],
+            num_failed_batches=summary["num_failed_batches"],
+        )
+
+        return summary
+
+    @classmethod
+    def _upsert_with_retries(
+        cls: Type[T], points: list[PointStruct], wait: bool, max_retries: int, retry_backoff_seconds: float
+    ) -> bool:
+        collection_name = cls.get_collection_name()
+        for attempt in range(max_retries + 1):
+            try:
+                connection.upsert(collection_name=collection_name, points=points, wait=wait)
+
+                return True
+            except QDRANT_ERRORS:
+                if attempt == max_retries:
+                    logger.exception(f"Failed to upsert {len(points)} points into '{collection_name}'.")
+
+                    return False
+
+                backoff_seconds = retry_backoff_seconds * 2**attempt
+                logger.warning(
+                    f"Failed to upsert {len(points)} points into '{collection_name}'. "
+                    f"Retrying in {backoff_seconds:.1f} sec."
+                )
+                time.sleep(backoff_seconds)
+
+        return False
+
     @classmethod
     def bulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
         try:
             documents, next_offset = cls._bulk_find(limit=limit, **kwargs)
-        except exceptions.UnexpectedResponse:
+        except QDRANT_ERRORS:
             logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
 
             documents, next_offset = [], None
@@ -134,11 +324,83 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
         return documents, next_offset
 
+    @classmethod
+    def iter_all(
+        cls: Type[T],
+        page_size: int | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+        scroll_filter: Filter | None = None,
+        prefetch: bool = True,
+    ) -> Iterator[T]:
+        """
+        Streams all the documents of the collection, page by page.
+
+        Only one page is held in memory at a time, plus the next one when `prefetch` is enabled: it is fetched
+        in a background thread while the caller processes the current page.
+
+        Args:
+            page_size (int | None): The number of documents fetched per request. Defaults to the settings.
+            with_payload (bool | list[str]): Whether to fetch the payload, or the payload fields to fetch. Documents
+                hydrated from a subset of the fields leave the other fields unset.
+            with_vectors (bool): Whether to fetch the vectors.
+            scroll_filter (Filter | None): A filter on the payload.
+            prefetch (bool): Whether to fetch the next page while the current one is processed.
+
+        Yields:
+            T: The documents of the collection, ordered by ID.
+
+        Raises:
+            UnexpectedResponse | ResponseHandlingException | RpcError: If a page can't be fetched, including in the
+                middle of the stream.
+        """
+
+        page_size = page_size or settings.VECTOR_DB_SCROLL_PAGE_SIZE
+        collection_name = cls.get_collection_name()
+
+        def fetch_page(offset: Any) -> tuple[list[Record], Any]:
+            try:
+                return connection.scroll(
+                    collection_name=collection_name,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=with_payload,
+                    with_vectors=with_vectors,
+                    scroll_filter=scroll_filter,
+                )
+            except QDRANT_ERRORS:
+                logger.exception(f"Failed to scroll documents in '{collection_name}'.")
+
+                raise
+
+        partial = isinstance(with_payload, list)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="iter_all") as executor:
+            next_page = executor.submit(fetch_page, None) if prefetch else None
+            next_offset = None
+            while True:
+                records, next_offset = next_page.result() if prefetch else fetch_page(next_offset)
+                if prefetch and next_offset is not None:
+                    next_page = executor.submit(fetch_page, next_offset)
+
+                for record in records:
+                    yield cls.from_record(record, partial=partial)
+
+                if next_offset is None:
+                    return
+
     @classmethod
     def search(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
+        """
+        Searches the collection for the documents most similar to `query_vector`.
+
+        Besides the arguments of `QdrantClient.search`, it accepts the `hnsw_ef`, `oversampling` and `rescore`
+        search-time knobs, which trade latency for recall on collections with an HNSW index or quantized vectors.
+        """
+
         try:
             documents = cls._search(query_vector=query_vector, limit=limit, **kwargs)
-        except exceptions.UnexpectedResponse:
+        except QDRANT_ERRORS:
             logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
 
             documents = []
@@ -154,19 +416,157 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             limit=limit,
             with_payload=kwargs.pop("with_payload", True),
             with_vectors=kwargs.pop("with_vectors", False),
+            search_params=cls._pop_search_params(kwargs),
             **kwargs,
         )
         documents = [cls.from_record(record) for record in records]
 
         return documents
 
+    @classmethod
+    def search_batch(
+        cls: Type[T],
+        query_vectors: list,
+        limit: int = 10,
+        query_filter: Filter | list[Filter | None] | None = None,
+        **kwargs,
+    ) -> list[list[T]]:
+        """
+        Searches the collection for several query vectors in a single request.
+
+        Args:
+            query_vectors (list): The query vectors.
+            limit (int): The number of documents returned per query vector.
+            query_filter (Filter | list[Filter | None] | None): A filter shared by all queries or one filter per query.
+            **kwargs: Extra parameters of every search request, e.g., `score_threshold`, or the `hnsw_ef`,
+                `oversampling` and `rescore` search-time knobs.
+
+        Returns:
+            list[list[T]]: The documents found for each query vector, in the same order as the query vectors.
+        """
+
+        try:
+            documents = cls._search_batch(query_vectors=query_vectors, limit=limit, query_filter=query_filter, **kwargs)
+        except QDRANT_ERRORS:
+            logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
+
+            documents = [[] for _ in query_vectors]
+
+        return documents
+
+    @classmethod
+    def _search_batch(
+        cls: Type[T],
+        query_vectors: list,
+        limit: int = 10,
+        query_filter: Filter | list[Filter | None] | None = None,
+        **kwargs,
+    ) -> list[list[T]]:
+        if len(query_vectors) == 0:
+            return []
+
+        if not isinstance(query_filter, list):
+            query_filter = [query_filter] * len(query_vectors)
+        assert len(query_filter) == len(query_vectors), "Expected one filter per query vector."
+
+        with_payload = kwargs.pop("with_payload", True)
+        with_vector = kwargs.pop("with_vectors", False)
+        search_params = cls._pop_search_params(kwargs)
+        requests = [
+            SearchRequest(
+                vector=query_vector.tolist() if isinstance(query_vector, np.ndarray) else query_vector,
+                filter=filter_,
+                limit=limit,
+                with_payload=with_payload,
+                with_vector=with_vector,
+                params=search_params,
+                **kwargs,
+            )
+            for query_vector, filter_ in zip(query_vectors, query_filter, strict=True)
+        ]
+        batch_records = connection.search_batch(collection_name=cls.get_collection_name(), requests=requests)
+
+        return [[cls.from_record(record) for record in records] for records in batch_records]
+
+    @classmethod
+    def _pop_search_params(cls: Type[T], kwargs: dict) -> SearchParams | None:
+        """
+        Pops the search-time knobs from `kwargs` and merges them with the defaults from the settings.
+        An explicit `search_params` argument takes precedence over the knobs.
+        """
+
+        hnsw_ef = kwargs.pop("hnsw_ef", None) or settings.QDRANT_SEARCH_HNSW_EF
+        oversampling = kwargs.pop("oversampling", None) or settings.QDRANT_SEARCH_OVERSAMPLING
+        rescore = kwargs.pop("rescore", None)
+
+        search_params = kwargs.pop("search_params", None)
+        if search_params is not None:
+            return search_params
+
+        quantization = None
+        if cls.get_quantization_config() is not None and (oversampling is not None or rescore is not None):
+            # Rescoring the oversampled candidates with the original vectors recovers most of the lost recall.
+            quantization = QuantizationSearchParams(
+                rescore=True if rescore is None else rescore,
+                oversampling=oversampling,
+            )
+
+        if hnsw_ef is None and quantization is None:
+            return None
+
+        return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+    @classmethod
+    def search_batch_collections(
+        cls: Type["VectorBaseDocument"],
+        document_classes: list[type["VectorBaseDocument"]],
+        query_vectors: list,
+        limit: int = 10,
+        query_filter: Filter | list[Filter | None] | None = None,
+        **kwargs,
+    ) -> dict[type["VectorBaseDocument"], list[list["VectorBaseDocument"]]]:
+        """
+        Searches several collections for several query vectors, with a single batch request per collection.
+
+        Qdrant batches searches only within a collection, so the requests of the different collections are sent
+        concurrently.
+
+        Args:
+            document_classes (list[type[VectorBaseDocument]]): The document classes of the collections to search.
+            query_vectors (list): The query vectors.
+            limit (int): The number of documents returned per query vector and collection.
+            query_filter (Filter | list[Filter | None] | None): A filter shared by all queries or one filter per query.
+            **kwargs: Extra parameters of every search request.
+
+        Returns:
+            dict[type[VectorBaseDocument], list[list[VectorBaseDocument]]]: The documents found in each collection,
+                for each query vector.
+        """
+
+        if len(document_classes) == 0:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(document_classes), thread_name_prefix="search_batch") as executor:
+            futures = {
+                document_class: executor.submit(
+                    document_class.search_batch,
+                    query_vectors=query_vectors,
+                    limit=limit,
+                    query_filter=query_filter,
+                    **kwargs,
+                )
+                for document_class in document_classes
+            }
+
+            return {document_class: future.result() for document_class, future in futures.items()}
+
     @classmethod
     def get_or_create_collection(cls: Type[T]) -> CollectionInfo:
         collection_name = cls.get_collection_name()
 
         try:
-            return connection.get_collection(collection_name=collection_name)
-        except exceptions.UnexpectedResponse:
+            collection_info = connection.get_collection(collection_name=collection_name)
+        except QDRANT_ERRORS:
             use_vector_index = cls.get_use_vector_index()
 
             collection_created = cls._create_collection(
@@ -177,6 +577,11 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
             return connection.get_collection(collection_name=collection_name)
 
+        if cls._reconcile_payload_indexes(collection_name, payload_schema=collection_info.payload_schema):
+            collection_info = connection.get_collection(collection_name=collection_name)
+
+        return collection_info
+
     @classmethod
     def create_collection(cls: Type[T]) -> bool:
         collection_name = cls.get_collection_name()
@@ -187,37 +592,102 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
     @classmethod
     def _create_collection(cls, collection_name: str, use_vector_index: bool = True) -> bool:
         if use_vector_index is True:
-            vectors_config = VectorParams(size=EmbeddingModelSingleton().embedding_size, distance=Distance.COSINE)
+            # Imported lazily, so importing the domain doesn't import torch.
+            from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton
+
+            vectors_config = VectorParams(
+                size=EmbeddingModelSingleton().embedding_size,
+                distance=Distance.COSINE,
+                on_disk=cls.get_vectors_on_disk(),
+            )
+            index_config = {
+                "hnsw_config": cls.get_hnsw_config(),
+                "quantization_config": cls.get_quantization_config(),
+            }
         else:
             vectors_config = {}
+            index_config = {}
+
+        collection_created = connection.create_collection(
+            collection_name=collection_name, vectors_config=vectors_config, **index_config
+        )
+        if collection_created:
+            cls._reconcile_payload_indexes(collection_name, payload_schema={})
+
+        return collection_created
+
+    @classmethod
+    def _reconcile_payload_indexes(cls, collection_name: str, payload_schema: dict[str, PayloadIndexInfo]) -> bool:
+        """
+        Creates the payload indexes declared in the Config class that are missing from `payload_schema`,
+        and recreates the ones indexed with a different type. Indexes that are not declared are left untouched.
+
+        Returns:
+            bool: Whether any index was created.
+        """
+
+        is_updated = False
+        for field_name, field_schema in cls.get_payload_indexes().items():
+            index_info = payload_schema.get(field_name)
+            if index_info is not None and index_info.data_type == field_schema:
+                continue
+
+            if index_info is not None:
+                logger.warning(
+                    f"Recreating the '{field_name}' payload index of '{collection_name}' "
+                    f"as {field_schema} instead of {index_info.data_type}."
+                )
+                connection.delete_payload_index(collection_name=collection_name, field_name=field_name, wait=True)
+
+            connection.create_payload_index(
+                collection_name=collection_name, field_name=field_name, field_schema=field_schema, wait=True
+            )
+            logger.info(f"Created the '{field_name}' payload index of '{collection_name}' as {field_schema}.")
+
+            is_updated = True
 
-        return connection.create_collection(collection_name=collection_name, vectors_config=vectors_config)
+        return is_updated
 
     @classmethod
     def get_category(cls: Type[T]) -> DataCategory:
-        if not hasattr(cls, "Config") or not hasattr(cls.Config, "category"):
+        category = cls.get_metadata().category
+        if category is None:
             raise ImproperlyConfigured(
                 "The class should define a Config class with"
                 "the 'category' property that reflects the collection's data category."
             )
 
-        return cls.Config.category
+        return category
 
     @classmethod
     def get_collection_name(cls: Type[T]) -> str:
-        if not hasattr(cls, "Config") or not hasattr(cls.Config, "name"):
+        collection_name = cls.get_metadata().collection_name
+        if collection_name is None:
             raise ImproperlyConfigured(
                 "The class should define a Config class with" "the 'name' property that reflects the collection's name."
             )
 
-        return cls.Config.name
+        return collection_name
 
     @classmethod
     def get_use_vector_index(cls: Type[T]) -> bool:
-        if not hasattr(cls, "Config") or not hasattr(cls.Config, "use_vector_index"):
-            return True
+        return cls.get_metadata().use_vector_index
 
-        return cls.Config.use_vector_index
+    @classmethod
+    def get_hnsw_config(cls: Type[T]) -> HnswConfigDiff | None:
+        return cls.get_metadata().hnsw_config
+
+    @classmethod
+    def get_quantization_config(cls: Type[T]) -> QuantizationConfig | None:
+        return cls.get_metadata().quantization_config
+
+    @classmethod
+    def get_vectors_on_disk(cls: Type[T]) -> bool | None:
+        return cls.get_metadata().vectors_on_disk
+
+    @classmethod
+    def get_payload_indexes(cls: Type[T]) -> dict[str, PayloadSchemaType]:
+        return dict(cls.get_metadata().payload_indexes)
 
     @classmethod
     def group_by_class(
@@ -243,27 +713,72 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def collection_name_to_class(cls: Type["VectorBaseDocument"], collection_name: str) -> type["VectorBaseDocument"]:
-        for subclass in cls.__subclasses__():
-            try:
-                if subclass.get_collection_name() == collection_name:
-                    return subclass
-            except ImproperlyConfigured:
-                pass
+        document_class = _registry.get_class(collection_name)
+        if document_class is None or not issubclass(document_class, cls) or document_class is cls:
+            raise ValueError(f"No subclass found for collection name: {collection_name}")
 
-            try:
-                return subclass.collection_name_to_class(collection_name)
-            except ValueError:
-                continue
+        return document_class
 
-        raise ValueError(f"No subclass found for collection name: {collection_name}")
+    @classmethod
+    def get_field_layout(cls: Type[T]) -> FieldLayout:
+        return cls.get_metadata().field_layout
 
     @classmethod
-    def _has_class_attribute(cls: Type[T], attribute_name: str) -> bool:
-        if attribute_name in cls.__annotations__:
-            return True
+    def get_metadata(cls: Type[T]) -> DocumentMetadata:
+        metadata = _registry.get_metadata(cls)
+        if metadata is None:
+            # Only classes created before the registration hook, i.e., VectorBaseDocument itself, get here.
+            metadata = _registry.register(cls, cls._build_metadata())
 
-        for base in cls.__bases__:
-            if hasattr(base, "_has_class_attribute") and base._has_class_attribute(attribute_name):
-                return True
+        return metadata
 
-        return False
+    @classmethod
+    def _build_metadata(cls: Type[T]) -> DocumentMetadata:
+        config = getattr(cls, "Config", None)
+
+        payload_indexes = getattr(config, "payload_indexes", {})
+
+        return DocumentMetadata(
+            collection_name=getattr(config, "name", None),
+            category=getattr(config, "category", None),
+            use_vector_index=getattr(config, "use_vector_index", True),
+            field_layout=build_field_layout(cls),
+            hnsw_config=getattr(config, "hnsw_config", None),
+            quantization_config=getattr(config, "quantization_config", None),
+            vectors_on_disk=getattr(config, "vectors_on_disk", None),
+            payload_indexes={
+                field_name: PayloadSchemaType(field_schema) for field_name, field_schema in payload_indexes.items()
+            },
+            indexes=(),
+        )
+
+
+def _batch_by_size(
+    points: Iterable[PointStruct], max_batch_bytes: int, bytes_per_dimension: int = 20
+) -> Iterator[list[PointStruct]]:
+    """Groups points into batches whose estimated request size stays below `max_batch_bytes`."""
+
+    batch = []
+    batch_bytes = 0
+    for point in points:
+        point_bytes = _estimate_point_size(point, bytes_per_dimension=bytes_per_dimension)
+        if len(batch) > 0 and batch_bytes + point_bytes > max_batch_bytes:
+            yield batch
+
+            batch = []
+            batch_bytes = 0
+
+        batch.append(point)
+        batch_bytes += point_bytes
+
+    if len(batch) > 0:
+        yield batch
+
+
+def _estimate_point_size(point: PointStruct, bytes_per_dimension: int = 20) -> int:
+    # A JSON-encoded float32 takes up to ~20 bytes, e.g., "-0.012345678901234567,".
+    vector = point.vector
+    vector_bytes = bytes_per_dimension * len(vector) if isinstance(vector, list) else 0
+    payload_bytes = sum(len(key) + len(str(value)) for key, value in (point.payload or {}).items())
+
+    return vector_bytes + payload_bytes
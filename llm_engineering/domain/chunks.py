@@ -14,6 +14,8 @@ class Chunk(VectorBaseDocument, ABC):
     author_id: UUID4
     author_full_name: str
     metadata: dict = Field(default_factory=dict)
+    # The number of tokens the embedding model sees, when known from chunking, so it isn't tokenized again.
+    num_tokens: Optional[int] = None
 
 
 class PostChunk(Chunk):
@@ -1,11 +1,28 @@
 from abc import ABC
-from typing import Optional
+from typing import ClassVar, Optional
 
 from pydantic import UUID4, Field
+from pymongo import ASCENDING, IndexModel
+
+from llm_engineering.infrastructure.lazy import LazyProxy
+from llm_engineering.infrastructure.ttl_cache import TTLCache
+from llm_engineering.settings import settings
 
 from .base import NoSQLBaseDocument
 from .types import DataCategory
 
+# The crawlers look documents up by link before scraping them, and the feature pipeline by author.
+DOCUMENT_INDEXES = [
+    IndexModel("link"),
+    IndexModel("author_id"),
+]
+
+
+# Resolving the author of every query or pipeline run is a repeated lookup of a handful of users.
+_users_cache: TTLCache["UserDocument"] = LazyProxy(  # type: ignore[assignment]
+    lambda: TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
+)
+
 
 class UserDocument(NoSQLBaseDocument):
     first_name: str
@@ -13,11 +30,55 @@ class UserDocument(NoSQLBaseDocument):
 
     class Settings:
         name = "users"
+        indexes: ClassVar[list[IndexModel]] = [
+            IndexModel([("first_name", ASCENDING), ("last_name", ASCENDING)], unique=True),
+        ]
 
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def get_or_create(cls, **filter_options) -> "UserDocument":
+        """
+        Resolves a user by first and last name from the in-process cache, falling back to MongoDB on a miss.
+
+        The cached users are shared between callers, so they must not be mutated.
+        """
+
+        user = cls._get_cached(**filter_options)
+        if user is None:
+            user = super().get_or_create(**filter_options)
+            if filter_options.keys() == {"first_name", "last_name"}:
+                cls._cache(user)
+
+        return user
+
+    @classmethod
+    async def aget_or_create(cls, **filter_options) -> "UserDocument":
+        # Cache hits are answered on the event loop, without a hop to the database threads.
+        return cls._get_cached(**filter_options) or await super().aget_or_create(**filter_options)
+
+    @classmethod
+    def get_by_id(cls, user_id: UUID4) -> Optional["UserDocument"]:
+        user = _users_cache.get(("id", user_id))
+        if user is None and (user := cls.find(_id=str(user_id))) is not None:
+            cls._cache(user)
+
+        return user
+
+    @classmethod
+    def _get_cached(cls, **filter_options) -> Optional["UserDocument"]:
+        if filter_options.keys() != {"first_name", "last_name"}:
+            return None
+
+        return _users_cache.get(("full_name", filter_options["first_name"], filter_options["last_name"]))
+
+    @classmethod
+    def _cache(cls, user: "UserDocument") -> None:
+        _users_cache.put(("full_name", user.first_name, user.last_name), user)
+        _users_cache.put(("id", user.id), user)
+
 
 class Document(NoSQLBaseDocument, ABC):
     content: dict
@@ -32,6 +93,7 @@ class RepositoryDocument(Document):
 
     class Settings:
         name = DataCategory.REPOSITORIES
+        indexes = DOCUMENT_INDEXES
 
 
 class PostDocument(Document):
@@ -40,6 +102,7 @@ class PostDocument(Document):
 
     class Settings:
         name = DataCategory.POSTS
+        indexes = DOCUMENT_INDEXES
 
 
 class ArticleDocument(Document):
@@ -47,3 +110,4 @@ class ArticleDocument(Document):
 
     class Settings:
         name = DataCategory.ARTICLES
+        indexes = DOCUMENT_INDEXES
@@ -1,15 +1,37 @@
 from abc import ABC
 
 from pydantic import UUID4, Field
+from qdrant_client.models import (
+    HnswConfigDiff,
+    PayloadSchemaType,
+    QuantizationConfig,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+)
 
-from llm_engineering.domain.types import DataCategory
+from llm_engineering.domain.types import DataCategory, Embedding
+from llm_engineering.settings import settings
 
 from .base import VectorBaseDocument
 
+# Payload fields filtered on at search time, e.g., by the ContextRetriever.
+CHUNK_PAYLOAD_INDEXES = {
+    "author_id": PayloadSchemaType.KEYWORD,
+    "platform": PayloadSchemaType.KEYWORD,
+    "document_id": PayloadSchemaType.KEYWORD,
+}
+CHUNK_HNSW_CONFIG = HnswConfigDiff(m=16, ef_construct=128)
+# The int8 copy of the vectors kept in RAM is 4x smaller than the float32 originals, which can stay on disk and
+# are only read to rescore the top candidates. Both are opt-in through the settings, as they trade some recall.
+CHUNK_QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+
 
 class EmbeddedChunk(VectorBaseDocument, ABC):
     content: str
-    embedding: list[float] | None
+    embedding: Embedding | None
     platform: str
     document_id: UUID4
     author_id: UUID4
@@ -30,12 +52,30 @@ class EmbeddedChunk(VectorBaseDocument, ABC):
 
         return context
 
+    @classmethod
+    def get_quantization_config(cls) -> QuantizationConfig | None:
+        if not settings.VECTOR_DB_CHUNK_QUANTIZATION:
+            return None
+
+        return super().get_quantization_config()
+
+    @classmethod
+    def get_vectors_on_disk(cls) -> bool | None:
+        if not settings.VECTOR_DB_CHUNK_VECTORS_ON_DISK:
+            return None
+
+        return super().get_vectors_on_disk()
+
 
 class EmbeddedPostChunk(EmbeddedChunk):
     class Config:
         name = "embedded_posts"
         category = DataCategory.POSTS
         use_vector_index = True
+        payload_indexes = CHUNK_PAYLOAD_INDEXES
+        hnsw_config = CHUNK_HNSW_CONFIG
+        quantization_config = CHUNK_QUANTIZATION_CONFIG
+        vectors_on_disk = True
 
 
 class EmbeddedArticleChunk(EmbeddedChunk):
@@ -45,6 +85,10 @@ class EmbeddedArticleChunk(EmbeddedChunk):
         name = "embedded_articles"
         category = DataCategory.ARTICLES
         use_vector_index = True
+        payload_indexes = CHUNK_PAYLOAD_INDEXES
+        hnsw_config = CHUNK_HNSW_CONFIG
+        quantization_config = CHUNK_QUANTIZATION_CONFIG
+        vectors_on_disk = True
 
 
 class EmbeddedRepositoryChunk(EmbeddedChunk):
@@ -55,3 +99,7 @@ class EmbeddedRepositoryChunk(EmbeddedChunk):
         name = "embedded_repositories"
         category = DataCategory.REPOSITORIES
         use_vector_index = True
+        payload_indexes = CHUNK_PAYLOAD_INDEXES
+        hnsw_config = CHUNK_HNSW_CONFIG
+        quantization_config = CHUNK_QUANTIZATION_CONFIG
+        vectors_on_disk = True
@@ -1,4 +1,11 @@
 from enum import StrEnum
+from typing import Annotated, Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 
 
 class DataCategory(StrEnum):
@@ -13,3 +20,41 @@ class DataCategory(StrEnum):
     POSTS = "posts"
     ARTICLES = "articles"
     REPOSITORIES = "repositories"
+
+
+class _EmbeddingAnnotation:
+    """
+    Pydantic schema of an embedding stored as a contiguous float32 NumPy array.
+
+    It accepts both arrays and lists of floats, which keeps the list API working, and it is serialized
+    as a list of floats by `model_dump` and `model_dump_json`.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.serialize),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return handler(core_schema.list_schema(core_schema.float_schema()))
+
+    @staticmethod
+    def validate(value: Any) -> NDArray[np.float32]:
+        # Doesn't copy arrays that are already contiguous float32 vectors.
+        array = np.ascontiguousarray(value, dtype=np.float32)
+        if array.ndim != 1:
+            raise ValueError(f"An embedding should be a 1D vector. Got shape {array.shape}.")
+
+        return array
+
+    @staticmethod
+    def serialize(value: NDArray[np.float32]) -> list[float]:
+        return value.tolist()
+
+
+Embedding = Annotated[NDArray[np.float32], _EmbeddingAnnotation]
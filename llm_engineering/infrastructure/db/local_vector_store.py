@@ -0,0 +1,700 @@
+import json
+import re
+import shutil
+import sqlite3
+from itertools import count
+from pathlib import Path
+from threading import RLock
+from typing import Any
+
+import httpx
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    CollectionConfig,
+    CollectionInfo,
+    CollectionParams,
+    CollectionStatus,
+    Distance,
+    FieldCondition,
+    Filter,
+    HasIdCondition,
+    HnswConfig,
+    IsEmptyCondition,
+    IsNullCondition,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    OptimizersConfig,
+    OptimizersStatusOneOf,
+    PayloadIndexInfo,
+    PayloadSchemaType,
+    PointStruct,
+    Record,
+    ScoredPoint,
+    SearchParams,
+    SearchRequest,
+    UpdateResult,
+    UpdateStatus,
+    VectorParams,
+    WalConfig,
+)
+
+from .vector_store import VectorStore
+
+_DATABASE_FILENAME = "points.sqlite"
+_VECTORS_FILENAME = "vectors.f32"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS points (row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, payload TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS payload_indexes (field_name TEXT PRIMARY KEY, field_schema TEXT NOT NULL);
+"""
+_MAX_SQL_PARAMETERS = 500
+_COLLECTION_NAME_PATTERN = re.compile(r"^[\w-]+$")
+_FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+
+
+class LocalVectorStore(VectorStore):
+    """
+    An in-process vector store persisted in a local directory, for running the ODM without a Qdrant server.
+
+    Each collection is a SQLite database of point IDs and JSON payloads next to a memory-mapped float32 matrix of
+    vectors, normalized for cosine similarity. Payload filters are translated to SQL and payload indexes to SQLite
+    expression indexes. Searches are exact below `ann_min_points` points. Above that, they are approximate: only
+    the vectors of the `num_probes` clusters of an IVF index nearest to the query are scored.
+
+    The store is thread-safe, but a directory should only be opened by a single process at a time.
+    """
+
+    def __init__(self, path: Path, ann_min_points: int = 20000, num_probes: int = 8) -> None:
+        self._path = Path(path)
+        self._ann_min_points = ann_min_points
+        self._num_probes = num_probes
+
+        self._collections: dict[str, _LocalCollection] = {}
+        self._lock = RLock()
+        self._operation_ids = count()
+
+        logger.info(f"Using the local vector store at {self._path}")
+
+    def get_collection(self, collection_name: str) -> CollectionInfo:
+        return self._get_collection(collection_name).info()
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return (self._collection_path(collection_name) / _DATABASE_FILENAME).exists()
+
+    def create_collection(self, collection_name: str, vectors_config: VectorParams | dict, **kwargs) -> bool:
+        """
+        Creates a collection. The HNSW and quantization configs of Qdrant, passed in `kwargs`, are ignored.
+        """
+
+        with self._lock:
+            if self.collection_exists(collection_name):
+                raise _error(409, "Conflict", f"Collection `{collection_name}` already exists!")
+
+            if isinstance(vectors_config, VectorParams):
+                vector_size, distance = vectors_config.size, vectors_config.distance
+            elif not vectors_config:
+                vector_size, distance = 0, Distance.COSINE
+            else:
+                raise ValueError("The local vector store doesn't support named vectors.")
+
+            self._collections[collection_name] = _LocalCollection.create(
+                self._collection_path(collection_name),
+                vector_size=vector_size,
+                distance=distance,
+                ann_min_points=self._ann_min_points,
+                num_probes=self._num_probes,
+            )
+
+        return True
+
+    def delete_collection(self, collection_name: str, **kwargs) -> bool:
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+
+            if not self.collection_exists(collection_name):
+                return False
+
+            shutil.rmtree(self._collection_path(collection_name))
+
+        return True
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: Any, wait: bool = True, **kwargs
+    ) -> UpdateResult:
+        # The index params, e.g., KeywordIndexParams, carry their schema type in `type`.
+        field_schema = PayloadSchemaType(getattr(field_schema, "type", field_schema))
+        self._get_collection(collection_name).create_payload_index(field_name, field_schema)
+
+        return self._update_result()
+
+    def delete_payload_index(self, collection_name: str, field_name: str, wait: bool = True, **kwargs) -> UpdateResult:
+        self._get_collection(collection_name).delete_payload_index(field_name)
+
+        return self._update_result()
+
+    def upsert(self, collection_name: str, points: list[PointStruct], wait: bool = True, **kwargs) -> UpdateResult:
+        self._get_collection(collection_name).upsert(points)
+
+        return self._update_result()
+
+    def scroll(
+        self,
+        collection_name: str,
+        limit: int = 10,
+        offset: Any = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        scroll_filter: Filter | None = None,
+        **kwargs,
+    ) -> tuple[list[Record], str | None]:
+        return self._get_collection(collection_name).scroll(
+            limit=limit,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            scroll_filter=scroll_filter,
+        )
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Any,
+        limit: int = 10,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+        offset: int | None = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        **kwargs,
+    ) -> list[ScoredPoint]:
+        return self._get_collection(collection_name).search(
+            query_vector,
+            limit=limit,
+            query_filter=query_filter,
+            params=search_params,
+            offset=offset or 0,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            score_threshold=score_threshold,
+        )
+
+    def search_batch(self, collection_name: str, requests: list[SearchRequest], **kwargs) -> list[list[ScoredPoint]]:
+        collection = self._get_collection(collection_name)
+
+        return [
+            collection.search(
+                request.vector,
+                limit=request.limit,
+                query_filter=request.filter,
+                params=request.params,
+                offset=request.offset or 0,
+                with_payload=True if request.with_payload is None else request.with_payload,
+                with_vectors=bool(request.with_vector),
+                score_threshold=request.score_threshold,
+            )
+            for request in requests
+        ]
+
+    def close(self, **kwargs) -> None:
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
+
+    def _get_collection(self, collection_name: str) -> "_LocalCollection":
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                if not self.collection_exists(collection_name):
+                    raise _error(404, "Not Found", f"Collection `{collection_name}` doesn't exist!")
+
+                collection = _LocalCollection(
+                    self._collection_path(collection_name),
+                    ann_min_points=self._ann_min_points,
+                    num_probes=self._num_probes,
+                )
+                self._collections[collection_name] = collection
+
+            return collection
+
+    def _collection_path(self, collection_name: str) -> Path:
+        if not _COLLECTION_NAME_PATTERN.match(collection_name):
+            raise ValueError(f"Invalid collection name: {collection_name}")
+
+        return self._path / collection_name
+
+    def _update_result(self) -> UpdateResult:
+        return UpdateResult(operation_id=next(self._operation_ids), status=UpdateStatus.COMPLETED)
+
+
+class _LocalCollection:
+    def __init__(self, path: Path, ann_min_points: int, num_probes: int) -> None:
+        self._path = path
+        self._ann_min_points = ann_min_points
+        self._num_probes = num_probes
+
+        self._lock = RLock()
+        self._database = sqlite3.connect(path / _DATABASE_FILENAME, check_same_thread=False)
+
+        config = dict(self._database.execute("SELECT key, value FROM config").fetchall())
+        self._vector_size = int(config["vector_size"])
+        self._distance = Distance(config["distance"])
+        self._num_rows = self._database.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+
+        self._vectors: np.memmap | None = None
+        self._capacity = 0
+        vectors_path = path / _VECTORS_FILENAME
+        if self._vector_size > 0 and vectors_path.exists():
+            self._map_vectors(capacity=vectors_path.stat().st_size // (4 * self._vector_size))
+
+        self._ivf_index: _IvfIndex | None = None
+
+    @classmethod
+    def create(
+        cls, path: Path, vector_size: int, distance: Distance, ann_min_points: int, num_probes: int
+    ) -> "_LocalCollection":
+        if distance not in (Distance.COSINE, Distance.DOT):
+            raise ValueError(f"The local vector store doesn't support the {distance} distance.")
+
+        path.mkdir(parents=True, exist_ok=True)
+        database = sqlite3.connect(path / _DATABASE_FILENAME)
+        try:
+            database.executescript(_SCHEMA)
+            database.executemany(
+                "INSERT INTO config (key, value) VALUES (?, ?)",
+                [("vector_size", str(vector_size)), ("distance", distance.value)],
+            )
+            database.commit()
+        finally:
+            database.close()
+
+        return cls(path, ann_min_points=ann_min_points, num_probes=num_probes)
+
+    def info(self) -> CollectionInfo:
+        with self._lock:
+            payload_indexes = self._database.execute("SELECT field_name, field_schema FROM payload_indexes").fetchall()
+            num_indexed_vectors = self._ivf_index.num_rows if self._ivf_index is not None else 0
+
+            return CollectionInfo(
+                status=CollectionStatus.GREEN,
+                optimizer_status=OptimizersStatusOneOf.OK,
+                vectors_count=self._num_rows if self._vector_size > 0 else 0,
+                indexed_vectors_count=num_indexed_vectors,
+                points_count=self._num_rows,
+                segments_count=1,
+                config=CollectionConfig(
+                    params=CollectionParams(
+                        vectors=VectorParams(size=self._vector_size, distance=self._distance, on_disk=True)
+                        if self._vector_size > 0
+                        else {},
+                    ),
+                    hnsw_config=HnswConfig(m=16, ef_construct=100, full_scan_threshold=self._ann_min_points),
+                    optimizer_config=OptimizersConfig(
+                        deleted_threshold=0.2,
+                        vacuum_min_vector_number=1000,
+                        default_segment_number=0,
+                        indexing_threshold=self._ann_min_points,
+                        flush_interval_sec=5,
+                    ),
+                    wal_config=WalConfig(wal_capacity_mb=32, wal_segments_ahead=0),
+                ),
+                payload_schema={
+                    field_name: PayloadIndexInfo(data_type=PayloadSchemaType(field_schema), points=self._num_rows)
+                    for field_name, field_schema in payload_indexes
+                },
+            )
+
+    def create_payload_index(self, field_name: str, field_schema: PayloadSchemaType) -> None:
+        with self._lock:
+            self._database.execute(
+                f"CREATE INDEX IF NOT EXISTS {_index_name(field_name)} ON points ({_json_field(field_name)})"
+            )
+            self._database.execute(
+                "INSERT OR REPLACE INTO payload_indexes (field_name, field_schema) VALUES (?, ?)",
+                (field_name, field_schema.value),
+            )
+            self._database.commit()
+
+    def delete_payload_index(self, field_name: str) -> None:
+        with self._lock:
+            self._database.execute(f"DROP INDEX IF EXISTS {_index_name(field_name)}")
+            self._database.execute("DELETE FROM payload_indexes WHERE field_name = ?", (field_name,))
+            self._database.commit()
+
+    def upsert(self, points: list[PointStruct]) -> None:
+        if len(points) == 0:
+            return
+
+        point_ids = [str(point.id) for point in points]
+        vectors = self._prepare_vectors([point.vector for point in points]) if self._vector_size > 0 else None
+
+        with self._lock:
+            point_rows = {}
+            unique_point_ids = list(dict.fromkeys(point_ids))
+            for start in range(0, len(unique_point_ids), _MAX_SQL_PARAMETERS):
+                point_ids_batch = unique_point_ids[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ",".join("?" for _ in point_ids_batch)
+                point_rows.update(
+                    self._database.execute(
+                        f"SELECT id, row FROM points WHERE id IN ({placeholders})", point_ids_batch
+                    ).fetchall()
+                )
+
+            num_rows = self._num_rows
+            rows = np.empty(len(points), dtype=np.int64)
+            inserts = []
+            updates = []
+            for index, (point_id, point) in enumerate(zip(point_ids, points, strict=True)):
+                payload = json.dumps(point.payload or {}, default=str)
+                row = point_rows.get(point_id)
+                if row is None:
+                    row = point_rows[point_id] = num_rows
+                    num_rows += 1
+                    inserts.append((row, point_id, payload))
+                else:
+                    updates.append((payload, row))
+                    if self._ivf_index is not None:
+                        self._ivf_index.mark_dirty(row)
+                rows[index] = row
+
+            if vectors is not None:
+                self._reserve(num_rows)
+                self._vectors[rows] = vectors
+                self._vectors.flush()
+
+            self._database.executemany("INSERT INTO points (row, id, payload) VALUES (?, ?, ?)", inserts)
+            self._database.executemany("UPDATE points SET payload = ? WHERE row = ?", updates)
+            self._database.commit()
+
+            self._num_rows = num_rows
+
+    def scroll(
+        self, limit: int, offset: Any, with_payload: Any, with_vectors: bool, scroll_filter: Filter | None
+    ) -> tuple[list[Record], str | None]:
+        where, parameters = _filter_to_sql(scroll_filter) if scroll_filter is not None else ("1", [])
+        if offset is not None:
+            where = f"({where}) AND id >= ?"
+            parameters.append(str(offset))
+
+        with self._lock:
+            rows = self._database.execute(
+                f"SELECT row, id, payload FROM points WHERE {where} ORDER BY id LIMIT ?", [*parameters, limit + 1]
+            ).fetchall()
+            next_offset = rows[limit][1] if len(rows) > limit else None
+
+            records = [
+                Record(
+                    id=point_id,
+                    payload=_select_payload(payload, with_payload),
+                    vector=self._get_vector(row) if with_vectors else None,
+                )
+                for row, point_id, payload in rows[:limit]
+            ]
+
+        return records, next_offset
+
+    def search(
+        self,
+        query_vector: Any,
+        limit: int,
+        query_filter: Filter | None,
+        params: SearchParams | None,
+        offset: int,
+        with_payload: Any,
+        with_vectors: bool,
+        score_threshold: float | None,
+    ) -> list[ScoredPoint]:
+        if self._vector_size == 0:
+            raise _error(400, "Bad Request", "The collection doesn't store vectors.")
+
+        query = self._prepare_vectors([query_vector])[0]
+
+        with self._lock:
+            if self._num_rows == 0:
+                return []
+
+            candidate_rows = None
+            if query_filter is not None:
+                where, parameters = _filter_to_sql(query_filter)
+                candidate_rows = np.fromiter(
+                    (row for (row,) in self._database.execute(f"SELECT row FROM points WHERE {where}", parameters)),
+                    dtype=np.int64,
+                )
+
+            is_exact = params is not None and bool(params.exact)
+            # Like Qdrant, small collections and selective filters fall back to an exact search.
+            num_candidates = self._num_rows if candidate_rows is None else len(candidate_rows)
+            if not is_exact and num_candidates >= self._ann_min_points:
+                num_probes = params.hnsw_ef if params is not None and params.hnsw_ef else self._num_probes
+                ann_rows = self._get_ivf_index().candidates(query, num_probes=num_probes, num_rows=self._num_rows)
+                if candidate_rows is None:
+                    candidate_rows = ann_rows
+                else:
+                    candidate_rows = np.intersect1d(candidate_rows, ann_rows, assume_unique=True)
+
+            if candidate_rows is None:
+                scores = self._vectors[: self._num_rows] @ query
+            else:
+                scores = self._vectors[candidate_rows] @ query
+
+            num_results = min(offset + limit, len(scores))
+            if num_results <= offset:
+                return []
+
+            top_indices = np.argpartition(-scores, num_results - 1)[:num_results]
+            top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")][offset:]
+            if score_threshold is not None:
+                top_indices = top_indices[scores[top_indices] >= score_threshold]
+
+            top_rows = top_indices if candidate_rows is None else candidate_rows[top_indices]
+            points = self._get_points(top_rows.tolist())
+
+            return [
+                ScoredPoint(
+                    id=points[row][0],
+                    version=0,
+                    score=float(scores[index]),
+                    payload=_select_payload(points[row][1], with_payload),
+                    vector=self._get_vector(row) if with_vectors else None,
+                )
+                for index, row in zip(top_indices.tolist(), top_rows.tolist(), strict=True)
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            self._database.close()
+
+    def _prepare_vectors(self, vectors: list[Any]) -> NDArray[np.float32]:
+        array = np.array(vectors, dtype=np.float32)
+        if array.ndim != 2 or array.shape[1] != self._vector_size:
+            raise _error(400, "Bad Request", f"Wrong input: Vector dimension error: expected dim: {self._vector_size}")
+
+        if self._distance == Distance.COSINE:
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            np.divide(array, norms, out=array, where=norms > 0)
+
+        return array
+
+    def _reserve(self, num_rows: int) -> None:
+        if num_rows <= self._capacity:
+            return
+
+        self._map_vectors(capacity=max(num_rows, 2 * self._capacity, 1024))
+
+    def _map_vectors(self, capacity: int) -> None:
+        vectors_path = self._path / _VECTORS_FILENAME
+        if self._vectors is not None:
+            self._vectors.flush()
+
+        vectors_path.touch(exist_ok=True)
+        with vectors_path.open("r+b") as file:
+            file.truncate(capacity * self._vector_size * 4)
+
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self._vector_size))
+        self._capacity = capacity
+
+    def _get_vector(self, row: int) -> list[float] | None:
+        if self._vector_size == 0:
+            return None
+
+        return self._vectors[row].tolist()
+
+    def _get_points(self, rows: list[int]) -> dict[int, tuple[str, str]]:
+        points = {}
+        for start in range(0, len(rows), _MAX_SQL_PARAMETERS):
+            rows_batch = rows[start : start + _MAX_SQL_PARAMETERS]
+            placeholders = ",".join("?" for _ in rows_batch)
+            for row, point_id, payload in self._database.execute(
+                f"SELECT row, id, payload FROM points WHERE row IN ({placeholders})", rows_batch
+            ):
+                points[row] = (point_id, payload)
+
+        return points
+
+    def _get_ivf_index(self) -> "_IvfIndex":
+        # Rebuilt once the collection doubles, as the rows added since are scored exhaustively.
+        if self._ivf_index is None or self._num_rows > 2 * self._ivf_index.num_rows:
+            logger.info(f"Building the IVF index of {self._path.name} over {self._num_rows} vectors.")
+
+            self._ivf_index = _IvfIndex(self._vectors, num_rows=self._num_rows)
+
+        return self._ivf_index
+
+
+class _IvfIndex:
+    """
+    An inverted file index: the vectors are clustered with spherical k-means and a query only scores the vectors
+    of its nearest clusters. Rows added or updated after the index was built are always scored.
+    """
+
+    def __init__(self, vectors: NDArray[np.float32], num_rows: int, num_iterations: int = 10, seed: int = 42) -> None:
+        self.num_rows = num_rows
+        self._dirty_rows: set[int] = set()
+
+        rng = np.random.default_rng(seed)
+        num_clusters = max(1, int(np.sqrt(num_rows)))
+        sample_rows = np.sort(rng.choice(num_rows, size=min(num_rows, 64 * num_clusters), replace=False))
+        sample = np.asarray(vectors[sample_rows])
+
+        centroids = sample[rng.choice(len(sample), size=num_clusters, replace=False)].copy()
+        for _ in range(num_iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid.
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        self._centroids = centroids
+
+        assignments = np.concatenate(
+            [
+                np.argmax(np.asarray(vectors[start : min(start + 65536, num_rows)]) @ centroids.T, axis=1)
+                for start in range(0, num_rows, 65536)
+            ]
+        )
+        rows_by_cluster = np.argsort(assignments, kind="stable")
+        cluster_sizes = np.bincount(assignments, minlength=num_clusters)
+        self._cluster_rows = np.split(rows_by_cluster, np.cumsum(cluster_sizes)[:-1])
+
+    def mark_dirty(self, row: int) -> None:
+        if row < self.num_rows:
+            self._dirty_rows.add(row)
+
+    def candidates(self, query: NDArray[np.float32], num_probes: int, num_rows: int) -> NDArray[np.int64]:
+        num_probes = min(num_probes, len(self._cluster_rows))
+        probes = np.argpartition(-(self._centroids @ query), num_probes - 1)[:num_probes]
+
+        candidate_rows = [self._cluster_rows[probe] for probe in probes]
+        candidate_rows.append(np.arange(self.num_rows, num_rows, dtype=np.int64))
+        if len(self._dirty_rows) > 0:
+            candidate_rows.append(np.fromiter(self._dirty_rows, dtype=np.int64))
+
+        return np.unique(np.concatenate(candidate_rows))
+
+
+def _filter_to_sql(filter_: Filter) -> tuple[str, list]:
+    clauses = []
+    parameters = []
+    for condition in _as_list(filter_.must):
+        clause, condition_parameters = _condition_to_sql(condition)
+        clauses.append(clause)
+        parameters.extend(condition_parameters)
+
+    should_clauses = []
+    for condition in _as_list(filter_.should):
+        clause, condition_parameters = _condition_to_sql(condition)
+        should_clauses.append(clause)
+        parameters.extend(condition_parameters)
+    if len(should_clauses) > 0:
+        clauses.append(f"({' OR '.join(should_clauses)})")
+
+    for condition in _as_list(filter_.must_not):
+        clause, condition_parameters = _condition_to_sql(condition)
+        clauses.append(f"NOT ({clause})")
+        parameters.extend(condition_parameters)
+
+    if len(clauses) == 0:
+        return "1", parameters
+
+    return " AND ".join(f"({clause})" for clause in clauses), parameters
+
+
+def _condition_to_sql(condition: Any) -> tuple[str, list]:
+    if isinstance(condition, Filter):
+        return _filter_to_sql(condition)
+    elif isinstance(condition, HasIdCondition):
+        point_ids = [str(point_id) for point_id in condition.has_id]
+
+        return f"id IN ({','.join('?' for _ in point_ids)})", point_ids
+    elif isinstance(condition, IsEmptyCondition):
+        return f"{_json_field(condition.is_empty.key)} IS NULL", []
+    elif isinstance(condition, IsNullCondition):
+        return f"json_type(payload, '{_json_path(condition.is_null.key)}') = 'null'", []
+    elif isinstance(condition, FieldCondition):
+        field = _json_field(condition.key)
+        match = condition.match
+        if isinstance(match, MatchValue):
+            return f"{field} = ?", [match.value]
+        elif isinstance(match, MatchAny):
+            return f"{field} IN ({','.join('?' for _ in match.any)})", list(match.any)
+        elif isinstance(match, MatchExcept):
+            return f"{field} NOT IN ({','.join('?' for _ in match.except_)})", list(match.except_)
+        elif match is None and condition.range is not None:
+            clauses = []
+            parameters = []
+            for operator, value in (
+                (">", condition.range.gt),
+                (">=", condition.range.gte),
+                ("<", condition.range.lt),
+                ("<=", condition.range.lte),
+            ):
+                if value is not None:
+                    clauses.append(f"{field} {operator} ?")
+                    parameters.append(value)
+
+            return " AND ".join(clauses) or "1", parameters
+
+    raise ValueError(f"The local vector store doesn't support the filter condition: {condition!r}")
+
+
+def _as_list(conditions: Any) -> list:
+    if conditions is None:
+        return []
+
+    return conditions if isinstance(conditions, list) else [conditions]
+
+
+def _json_path(field_name: str) -> str:
+    # The path is inlined in the SQL, so the expression matches the one of the payload index.
+    if not _FIELD_NAME_PATTERN.match(field_name):
+        raise ValueError(f"Invalid payload field name: {field_name}")
+
+    return f"$.{field_name}"
+
+
+def _json_field(field_name: str) -> str:
+    return f"json_extract(payload, '{_json_path(field_name)}')"
+
+
+def _index_name(field_name: str) -> str:
+    _json_path(field_name)
+
+    return f"payload_index_{field_name.replace('.', '__')}"
+
+
+def _select_payload(payload: str, with_payload: Any) -> dict | None:
+    if with_payload is False or with_payload is None:
+        return None
+
+    payload = json.loads(payload)
+    if with_payload is True:
+        return payload
+
+    # A list of fields or a PayloadSelectorInclude/PayloadSelectorExclude.
+    if isinstance(with_payload, list):
+        return {key: value for key, value in payload.items() if key in with_payload}
+    elif getattr(with_payload, "include", None) is not None:
+        return {key: value for key, value in payload.items() if key in with_payload.include}
+    elif getattr(with_payload, "exclude", None) is not None:
+        return {key: value for key, value in payload.items() if key not in with_payload.exclude}
+
+    return payload
+
+
+def _error(status_code: int, reason_phrase: str, message: str) -> UnexpectedResponse:
+    return UnexpectedResponse(
+        status_code=status_code,
+        reason_phrase=reason_phrase,
+        content=json.dumps({"status": {"error": message}}).encode(),
+        headers=httpx.Headers(),
+    )
@@ -2,6 +2,7 @@ from loguru import logger
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 
+from llm_engineering.infrastructure.lazy import LazyProxy
 from llm_engineering.settings import settings
 
 
@@ -22,4 +23,4 @@ class MongoDatabaseConnector:
         return cls._instance
 
 
-connection = MongoDatabaseConnector()
+connection: MongoClient = LazyProxy(MongoDatabaseConnector)  # type: ignore[assignment]
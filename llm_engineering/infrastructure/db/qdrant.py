@@ -1,9 +1,15 @@
+import grpc
+import httpx
 from loguru import logger
 from qdrant_client import QdrantClient
-from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
 
+from llm_engineering.infrastructure.lazy import LazyProxy
 from llm_engineering.settings import settings
 
+# Errors raised by the client for a failed request, whether it went over HTTP or gRPC.
+QDRANT_ERRORS: tuple[type[Exception], ...] = (UnexpectedResponse, ResponseHandlingException, grpc.RpcError)
+
 
 class QdrantDatabaseConnector:
     _instance: QdrantClient | None = None
@@ -11,10 +17,12 @@ class QdrantDatabaseConnector:
     def __new__(cls, *args, **kwargs) -> QdrantClient:
         if cls._instance is None:
             try:
+                transport_options = cls.transport_options()
                 if settings.USE_QDRANT_CLOUD:
                     cls._instance = QdrantClient(
                         url=settings.QDRANT_CLOUD_URL,
                         api_key=settings.QDRANT_APIKEY,
+                        **transport_options,
                     )
 
                     uri = settings.QDRANT_CLOUD_URL
@@ -22,11 +30,13 @@ class QdrantDatabaseConnector:
                     cls._instance = QdrantClient(
                         host=settings.QDRANT_DATABASE_HOST,
                         port=settings.QDRANT_DATABASE_PORT,
+                        **transport_options,
                     )
 
                     uri = f"{settings.QDRANT_DATABASE_HOST}:{settings.QDRANT_DATABASE_PORT}"
 
-                logger.info(f"Connection to Qdrant DB with URI successful: {uri}")
+                transport = "gRPC" if settings.QDRANT_PREFER_GRPC else "HTTP"
+                logger.info(f"Connection to Qdrant DB with URI successful: {uri} ({transport})")
             except UnexpectedResponse:
                 logger.exception(
                     "Couldn't connect to Qdrant.",
@@ -39,5 +49,38 @@ class QdrantDatabaseConnector:
 
         return cls._instance
 
+    @staticmethod
+    def transport_options(prefer_grpc: bool | None = None) -> dict:
+        """
+        Returns the QdrantClient arguments that configure the transport from the settings.
+
+        With `prefer_grpc`, all the collection and point operations go through the gRPC API, which sends the
+        vectors as packed binary floats instead of JSON. The HTTP connection pool is still used for the
+        few operations gRPC doesn't support.
+
+        Args:
+            prefer_grpc (bool | None): Overrides `QDRANT_PREFER_GRPC`, e.g., to benchmark both transports.
+
+        Returns:
+            dict: The keyword arguments to pass to QdrantClient.
+        """
+
+        max_message_length = settings.QDRANT_GRPC_MAX_MESSAGE_MB * 1024 * 1024
+
+        return {
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+            "grpc_port": settings.QDRANT_GRPC_PORT,
+            "timeout": settings.QDRANT_TIMEOUT_SECONDS,
+            "grpc_options": {
+                "grpc.max_send_message_length": max_message_length,
+                "grpc.max_receive_message_length": max_message_length,
+            },
+            # Forwarded to the underlying httpx client.
+            "limits": httpx.Limits(
+                max_connections=settings.QDRANT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.QDRANT_MAX_CONNECTIONS,
+            ),
+        }
+
 
-connection = QdrantDatabaseConnector()
+connection: QdrantClient = LazyProxy(QdrantDatabaseConnector)  # type: ignore[assignment]
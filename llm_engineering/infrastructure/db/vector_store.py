@@ -0,0 +1,95 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    CollectionInfo,
+    PointStruct,
+    Record,
+    ScoredPoint,
+    SearchRequest,
+)
+
+from llm_engineering.infrastructure.lazy import LazyProxy
+from llm_engineering.settings import settings
+
+
+class VectorStore(ABC):
+    """
+    The storage backend contract of VectorBaseDocument: the subset of the QdrantClient API used by the ODM.
+
+    QdrantClient is registered as a virtual subclass, so the Qdrant server is used as is, while other backends,
+    such as the in-process LocalVectorStore, implement the same methods with the same signatures, return types
+    and errors, e.g., an UnexpectedResponse when a collection doesn't exist.
+    """
+
+    @abstractmethod
+    def get_collection(self, collection_name: str) -> CollectionInfo:
+        pass
+
+    @abstractmethod
+    def create_collection(self, collection_name: str, vectors_config: Any, **kwargs) -> bool:
+        pass
+
+    @abstractmethod
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema: Any, **kwargs) -> Any:
+        pass
+
+    @abstractmethod
+    def delete_payload_index(self, collection_name: str, field_name: str, **kwargs) -> Any:
+        pass
+
+    @abstractmethod
+    def upsert(self, collection_name: str, points: list[PointStruct], wait: bool = True, **kwargs) -> Any:
+        pass
+
+    @abstractmethod
+    def scroll(
+        self, collection_name: str, limit: int = 10, offset: Any = None, **kwargs
+    ) -> tuple[list[Record], Any | None]:
+        pass
+
+    @abstractmethod
+    def search(self, collection_name: str, query_vector: Any, limit: int = 10, **kwargs) -> list[ScoredPoint]:
+        pass
+
+    @abstractmethod
+    def search_batch(self, collection_name: str, requests: list[SearchRequest], **kwargs) -> list[list[ScoredPoint]]:
+        pass
+
+
+VectorStore.register(QdrantClient)
+
+
+def _create_vector_store() -> VectorStore:
+    if settings.VECTOR_DB_BACKEND == "local":
+        from .local_vector_store import LocalVectorStore
+
+        return LocalVectorStore(
+            path=settings.LOCAL_VECTOR_STORE_DIR,
+            ann_min_points=settings.LOCAL_VECTOR_STORE_ANN_MIN_POINTS,
+            num_probes=settings.LOCAL_VECTOR_STORE_NUM_PROBES,
+        )
+    elif settings.VECTOR_DB_BACKEND == "qdrant":
+        from .qdrant import QdrantDatabaseConnector
+
+        return QdrantDatabaseConnector()
+    else:
+        raise ValueError(f"Unsupported vector database backend: {settings.VECTOR_DB_BACKEND}")
+
+
+def get_bytes_per_dimension() -> int:
+    """
+    Returns the estimated size of a vector dimension in a write request to the active backend.
+
+    Qdrant's gRPC API sends the vectors as packed float32s, while its HTTP API encodes them as JSON, which takes
+    up to ~20 bytes per float. The local backend writes them in-process as float32s.
+    """
+
+    if settings.VECTOR_DB_BACKEND == "qdrant" and not settings.QDRANT_PREFER_GRPC:
+        return 20
+
+    return 4
+
+
+connection: VectorStore = LazyProxy(_create_vector_store)  # type: ignore[assignment]
@@ -1,3 +1,5 @@
+import asyncio
+
 import opik
 from fastapi import FastAPI, HTTPException
 from opik import opik_context
@@ -41,6 +43,27 @@ def rag(query: str) -> str:
 
     answer = call_llm_service(query, context)
 
+    _update_rag_trace(query, context, answer)
+
+    return answer
+
+
+@opik.track
+async def arag(query: str) -> str:
+    """Async version of `rag`, which runs the blocking retrieval and LLM calls off the event loop."""
+
+    retriever = ContextRetriever(mock=False)
+    documents = await retriever.asearch(query, k=3)
+    context = EmbeddedChunk.to_context(documents)
+
+    answer = await asyncio.to_thread(call_llm_service, query, context)
+
+    _update_rag_trace(query, context, answer)
+
+    return answer
+
+
+def _update_rag_trace(query: str, context: str, answer: str) -> None:
     opik_context.update_current_trace(
         tags=["rag"],
         metadata={
@@ -53,13 +76,11 @@ def rag(query: str) -> str:
         },
     )
 
-    return answer
-
 
 @app.post("/rag", response_model=QueryResponse)
 async def rag_endpoint(request: QueryRequest):
     try:
-        answer = rag(query=request.query)
+        answer = await arag(query=request.query)
 
         return {"answer": answer}
     except Exception as e:
@@ -0,0 +1,43 @@
+from threading import Lock
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyProxy(Generic[T]):
+    """
+    A thread-safe proxy that creates the wrapped object on first use and forwards everything else to it.
+
+    It lets modules expose resources such as database connections, settings or models as module-level
+    handles without creating them at import time. The proxy's own members are underscore-prefixed, so they
+    don't shadow the attributes of the wrapped object.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._instance: T | None = None
+        self._lock = Lock()
+
+    def _get_instance(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+
+        return self._instance
+
+    @property
+    def _is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_instance(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._get_instance()[key]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._get_instance()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return repr(self._instance) if self._is_initialized else "LazyProxy(<not initialized>)"
@@ -0,0 +1,70 @@
+import importlib
+import json
+import os
+from typing import Any, Type
+
+import numpy as np
+from zenml.enums import ArtifactType
+from zenml.materializers.base_materializer import BaseMaterializer
+
+from llm_engineering.domain.base import VectorBaseDocument
+
+
+class VectorDocumentsMaterializer(BaseMaterializer):
+    """
+    Materializes a list of vector documents as a single float32 matrix with all the embeddings (.npy)
+    plus a JSON file with the remaining fields, instead of serializing every embedding as a JSON list of floats.
+    """
+
+    ASSOCIATED_TYPES = (list,)
+    ASSOCIATED_ARTIFACT_TYPE = ArtifactType.DATA
+
+    EMBEDDINGS_FILENAME = "embeddings.npy"
+    RECORDS_FILENAME = "records.json"
+
+    def load(self, data_type: Type[Any]) -> list[VectorBaseDocument]:
+        with self.artifact_store.open(os.path.join(self.uri, self.EMBEDDINGS_FILENAME), "rb") as f:  # noqa: PTH118
+            embeddings = np.load(f)
+        with self.artifact_store.open(os.path.join(self.uri, self.RECORDS_FILENAME), "r") as f:  # noqa: PTH118
+            records = json.load(f)
+
+        document_classes = {}
+        documents = []
+        for record in records:
+            class_path = record["class"]
+            if class_path not in document_classes:
+                module_name, class_name = class_path.rsplit(".", 1)
+                document_classes[class_path] = getattr(importlib.import_module(module_name), class_name)
+
+            attributes = record["attributes"]
+            if record["embedding_index"] is not None:
+                attributes["embedding"] = embeddings[record["embedding_index"]]
+
+            documents.append(document_classes[class_path](**attributes))
+
+        return documents
+
+    def save(self, data: list[VectorBaseDocument]) -> None:
+        embeddings = []
+        records = []
+        for document in data:
+            embedding = getattr(document, "embedding", None)
+            if embedding is not None:
+                embedding_index = len(embeddings)
+                embeddings.append(embedding)
+            else:
+                embedding_index = None
+
+            records.append(
+                {
+                    "class": f"{document.__class__.__module__}.{document.__class__.__qualname__}",
+                    "embedding_index": embedding_index,
+                    "attributes": document.model_dump(mode="json", exclude={"embedding"}),
+                }
+            )
+
+        embeddings_matrix = np.stack(embeddings) if len(embeddings) > 0 else np.empty((0, 0), dtype=np.float32)
+        with self.artifact_store.open(os.path.join(self.uri, self.EMBEDDINGS_FILENAME), "wb") as f:  # noqa: PTH118
+            np.save(f, embeddings_matrix.astype(np.float32, copy=False))
+        with self.artifact_store.open(os.path.join(self.uri, self.RECORDS_FILENAME), "w") as f:  # noqa: PTH118
+            json.dump(records, f)
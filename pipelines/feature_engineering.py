@@ -4,7 +4,15 @@ from steps import feature_engineering as fe_steps
 
 
 @pipeline
-def feature_engineering(author_full_names: list[str], wait_for: str | list[str] | None = None) -> list[str]:
+def feature_engineering(
+    author_full_names: list[str], wait_for: str | list[str] | None = None, streaming: bool = False
+) -> list[str]:
+    if streaming:
+        # Streams the documents through cleaning, chunking, embedding and loading with bounded memory.
+        last_step = fe_steps.stream_to_vector_db(author_full_names, after=wait_for)
+
+        return [last_step.invocation_id]
+
     raw_documents = fe_steps.query_data_warehouse(author_full_names, after=wait_for)
 
     cleaned_documents = fe_steps.clean_documents(raw_documents)
@@ -3,11 +3,14 @@ from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from llm_engineering.application import utils
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
 from llm_engineering.domain.documents import UserDocument
 
 
 @step
 def get_or_create_user(user_full_name: str) -> Annotated[UserDocument, "user"]:
+    NoSQLBaseDocument.ensure_indexes()
+
     logger.info(f"Getting or creating user: {user_full_name}")
 
     first_name, last_name = utils.split_user_full_name(user_full_name)
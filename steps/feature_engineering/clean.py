@@ -3,16 +3,18 @@ from zenml import get_step_context, step
 
 from llm_engineering.application.preprocessing import CleaningDispatcher
 from llm_engineering.domain.cleaned_documents import CleanedDocument
+from llm_engineering.settings import settings
 
 
 @step
 def clean_documents(
     documents: Annotated[list, "raw_documents"],
 ) -> Annotated[list, "cleaned_documents"]:
-    cleaned_documents = []
-    for document in documents:
-        cleaned_document = CleaningDispatcher.dispatch(document)
-        cleaned_documents.append(cleaned_document)
+    cleaned_documents = CleaningDispatcher.dispatch_batch(
+        documents,
+        num_workers=settings.PREPROCESSING_NUM_WORKERS,
+        documents_per_task=settings.PREPROCESSING_DOCUMENTS_PER_TASK,
+    )
 
     step_context = get_step_context()
     step_context.add_output_metadata(output_name="cleaned_documents", metadata=_get_metadata(cleaned_documents))
@@ -1,8 +1,7 @@
 from loguru import logger
 from typing_extensions import Annotated
-from zenml import step
+from zenml import get_step_context, step
 
-from llm_engineering.application import utils
 from llm_engineering.domain.base import VectorBaseDocument
 
 
@@ -12,15 +11,20 @@ def load_to_vector_db(
 ) -> Annotated[bool, "successful"]:
     logger.info(f"Loading {len(documents)} documents into the vector database.")
 
+    metadata = {}
     grouped_documents = VectorBaseDocument.group_by_class(documents)
     for document_class, documents in grouped_documents.items():
-        logger.info(f"Loading documents into {document_class.get_collection_name()}")
-        for documents_batch in utils.misc.batch(documents, size=4):
-            try:
-                document_class.bulk_insert(documents_batch)
-            except Exception:
-                logger.error(f"Failed to insert documents into {document_class.get_collection_name()}")
+        collection_name = document_class.get_collection_name()
+        logger.info(f"Loading documents into {collection_name}")
 
-                return False
+        try:
+            metadata[collection_name] = document_class.bulk_load(documents)
+        except Exception:
+            logger.exception(f"Failed to insert documents into {collection_name}")
 
-    return True
+            return False
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="successful", metadata=metadata)
+
+    return all(summary["num_failed_batches"] == 0 for summary in metadata.values())
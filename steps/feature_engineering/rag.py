@@ -1,29 +1,32 @@
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
-from llm_engineering.application import utils
 from llm_engineering.application.preprocessing import ChunkingDispatcher, EmbeddingDispatcher
 from llm_engineering.domain.chunks import Chunk
 from llm_engineering.domain.embedded_chunks import EmbeddedChunk
+from llm_engineering.infrastructure.materializers import VectorDocumentsMaterializer
+from llm_engineering.settings import settings
 
 
-@step
+@step(output_materializers={"embedded_documents": VectorDocumentsMaterializer})
 def chunk_and_embed(
     cleaned_documents: Annotated[list, "cleaned_documents"],
 ) -> Annotated[list, "embedded_documents"]:
     metadata = {"chunking": {}, "embedding": {}, "num_documents": len(cleaned_documents)}
 
-    embedded_chunks = []
-    for document in cleaned_documents:
-        chunks = ChunkingDispatcher.dispatch(document)
-        metadata["chunking"] = _add_chunks_metadata(chunks, metadata["chunking"])
+    chunks = ChunkingDispatcher.dispatch_batch(
+        cleaned_documents,
+        num_workers=settings.PREPROCESSING_NUM_WORKERS,
+        documents_per_task=settings.PREPROCESSING_DOCUMENTS_PER_TASK,
+    )
+    metadata["chunking"] = _add_chunks_metadata(chunks, metadata["chunking"])
 
-        for batched_chunks in utils.misc.batch(chunks, 10):
-            batched_embedded_chunks = EmbeddingDispatcher.dispatch(batched_chunks)
-            embedded_chunks.extend(batched_embedded_chunks)
+    # Embed the chunks of all documents together, letting the embedding handlers batch them by token length.
+    with EmbeddingDispatcher.process_pool(num_workers=settings.EMBEDDING_NUM_WORKERS):
+        embedded_chunks = EmbeddingDispatcher.dispatch(chunks)
 
     metadata["embedding"] = _add_embeddings_metadata(embedded_chunks, metadata["embedding"])
-    metadata["num_chunks"] = len(embedded_chunks)
+    metadata["num_chunks"] = len(chunks)
     metadata["num_embedded_chunks"] = len(embedded_chunks)
 
     step_context = get_step_context()
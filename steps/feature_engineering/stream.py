@@ -0,0 +1,49 @@
+from typing import Iterator
+
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from llm_engineering.application import utils
+from llm_engineering.application.preprocessing import EmbeddingDispatcher, stream_feature_engineering
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
+from llm_engineering.domain.documents import ArticleDocument, PostDocument, RepositoryDocument, UserDocument
+from llm_engineering.settings import settings
+
+
+@step
+def stream_to_vector_db(
+    author_full_names: list[str],
+) -> Annotated[bool, "successful"]:
+    with EmbeddingDispatcher.process_pool(num_workers=settings.EMBEDDING_NUM_WORKERS):
+        summary = stream_feature_engineering(
+            _iter_documents(author_full_names),
+            num_workers=settings.PREPROCESSING_NUM_WORKERS,
+            documents_per_task=settings.PREPROCESSING_DOCUMENTS_PER_TASK,
+            embedding_batch_size=settings.STREAMING_EMBEDDING_BATCH_SIZE,
+            max_queue_size=settings.STREAMING_MAX_QUEUE_SIZE,
+        )
+
+    # Only summary statistics are tracked by ZenML, as the documents are never materialized as artifacts.
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="successful", metadata=summary)
+
+    if summary["num_dropped_chunks"] > 0:
+        raise RuntimeError(
+            f"Failed to embed {summary['num_dropped_chunks']} of {summary['num_chunks']} chunks. "
+            "Their documents were loaded without them."
+        )
+
+    return summary["num_failed_batches"] == 0
+
+
+def _iter_documents(author_full_names: list[str]) -> Iterator[NoSQLBaseDocument]:
+    for author_full_name in author_full_names:
+        logger.info(f"Querying data warehouse for user: {author_full_name}")
+
+        first_name, last_name = utils.split_user_full_name(author_full_name)
+        user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
+
+        # The documents are read through one cursor at a time, so at most one batch per cursor is held in memory.
+        for document_class in [ArticleDocument, PostDocument, RepositoryDocument]:
+            yield from document_class.bulk_iter(author_id=str(user.id))
@@ -1,7 +1,6 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from loguru import logger
-from qdrant_client.http import exceptions
 from typing_extensions import Annotated
 from zenml import step
 
@@ -12,6 +11,7 @@ from llm_engineering.domain.cleaned_documents import (
     CleanedPostDocument,
     CleanedRepositoryDocument,
 )
+from llm_engineering.infrastructure.db.qdrant import QDRANT_ERRORS
 
 
 @step
@@ -64,14 +64,10 @@ def __fetch_repositories() -> list[CleanedDocument]:
     return __fetch(CleanedRepositoryDocument)
 
 
-def __fetch(cleaned_document_type: type[CleanedDocument], limit: int = 1) -> list[CleanedDocument]:
+def __fetch(cleaned_document_type: type[CleanedDocument]) -> list[CleanedDocument]:
     try:
-        cleaned_documents, next_offset = cleaned_document_type.bulk_find(limit=limit)
-    except exceptions.UnexpectedResponse:
-        return []
-
-    while next_offset:
-        documents, next_offset = cleaned_document_type.bulk_find(limit=limit, offset=next_offset)
-        cleaned_documents.extend(documents)
+        return list(cleaned_document_type.iter_all())
+    except QDRANT_ERRORS:
+        logger.exception(f"Failed to fetch the documents of '{cleaned_document_type.get_collection_name()}'.")
 
-    return cleaned_documents
+        return []
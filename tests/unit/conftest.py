@@ -0,0 +1,124 @@
+import uuid
+from types import SimpleNamespace
+from typing import ClassVar, Iterator
+
+import pytest
+from qdrant_client.http import exceptions
+from qdrant_client.models import PayloadIndexInfo, PayloadSchemaType, PointStruct, ScoredPoint, SearchRequest
+
+from llm_engineering.domain import embedded_chunks
+from llm_engineering.domain.base import nosql, vector
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.types import DataCategory
+from llm_engineering.infrastructure.db import vector_store
+from llm_engineering.infrastructure.db.local_vector_store import LocalVectorStore
+from llm_engineering.settings import Settings
+
+
+class _Document(VectorBaseDocument):
+    content: str
+    author_id: str = "author"
+    platform: str = "platform"
+
+    class Config:
+        name = "documents"
+        category = DataCategory.POSTS
+        use_vector_index = False
+        payload_indexes: ClassVar[dict[str, PayloadSchemaType | str]] = {
+            "author_id": "keyword",
+            "platform": PayloadSchemaType.KEYWORD,
+        }
+
+
+class FakeConnection:
+    """Records the requests sent to the vector database, which answers as if the collections existed."""
+
+    def __init__(self) -> None:
+        self.payload_schema = {}
+        self.num_upsert_failures = 0
+        self.num_collection_checks = 0
+        self.operations = []
+        self.upserts = []
+        self.search_requests = []
+
+    def get_collection(self, collection_name: str) -> SimpleNamespace:
+        self.num_collection_checks += 1
+
+        return SimpleNamespace(payload_schema=dict(self.payload_schema))
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: PayloadSchemaType, wait: bool
+    ) -> None:
+        self.operations.append(("create", field_name))
+        self.payload_schema[field_name] = PayloadIndexInfo(data_type=field_schema, points=0)
+
+    def delete_payload_index(self, collection_name: str, field_name: str, wait: bool) -> None:
+        self.operations.append(("delete", field_name))
+        self.payload_schema.pop(field_name)
+
+    def upsert(self, collection_name: str, points: list[PointStruct], wait: bool) -> None:
+        if self.num_upsert_failures > 0:
+            self.num_upsert_failures -= 1
+
+            raise exceptions.ResponseHandlingException(TimeoutError("Timed out."))
+
+        self.upserts.append((len(points), wait))
+
+    def search_batch(self, collection_name: str, requests: list[SearchRequest]) -> list[list[ScoredPoint]]:
+        self.search_requests.append((collection_name, len(requests)))
+
+        return [
+            [
+                ScoredPoint(
+                    id=str(uuid.uuid4()),
+                    version=0,
+                    score=1.0,
+                    payload={"content": f"{collection_name}-{request.vector[0]}"},
+                )
+            ]
+            for request in requests
+        ]
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch) -> Settings:
+    """The default settings, read neither from the .env file nor from the ZenML secret store."""
+
+    settings = Settings.model_construct()
+    for module in [vector, vector_store, nosql, embedded_chunks]:
+        monkeypatch.setattr(module, "settings", settings)
+
+    return settings
+
+
+@pytest.fixture(autouse=True, scope="module")
+def unregister_documents(request) -> Iterator[None]:
+    """Removes the document classes defined by the tests from the registries of the ODMs."""
+
+    yield
+
+    for registry in [vector._registry, nosql._registry]:
+        for document_class in registry.get_classes():
+            if document_class.__module__ in [request.module.__name__, __name__]:
+                registry.unregister(document_class)
+
+
+@pytest.fixture
+def document_class() -> type[_Document]:
+    return _Document
+
+
+@pytest.fixture
+def fake_connection(monkeypatch) -> FakeConnection:
+    connection = FakeConnection()
+    monkeypatch.setattr(vector, "connection", connection)
+
+    return connection
+
+
+@pytest.fixture
+def local_vector_store(tmp_path, monkeypatch) -> LocalVectorStore:
+    store = LocalVectorStore(path=tmp_path)
+    monkeypatch.setattr(vector, "connection", store)
+
+    return store
@@ -0,0 +1,63 @@
+import pytest
+
+from llm_engineering.domain.base import NoSQLBaseDocument, VectorBaseDocument
+from llm_engineering.domain.base.registry import DocumentRegistry
+from llm_engineering.domain.cleaned_documents import CleanedDocument, CleanedPostDocument
+from llm_engineering.domain.documents import ArticleDocument, Document
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.domain.queries import Query
+from llm_engineering.domain.types import DataCategory
+
+
+def test_vector_document_metadata_is_recorded_at_class_creation() -> None:
+    metadata = EmbeddedArticleChunk.get_metadata()
+
+    assert metadata.collection_name == "embedded_articles"
+    assert metadata.category == DataCategory.ARTICLES
+    assert metadata.use_vector_index is True
+    assert metadata.field_layout.has_embedding
+    assert metadata.vectors_on_disk is True
+    assert metadata.quantization_config is not None
+    assert EmbeddedArticleChunk.get_payload_indexes()["author_id"] == "keyword"
+    assert Query.get_use_vector_index() is True
+    assert Query.get_payload_indexes() == {}
+
+    with pytest.raises(ImproperlyConfigured):
+        Query.get_collection_name()
+    with pytest.raises(ImproperlyConfigured):
+        CleanedDocument.get_category()
+
+
+def test_collection_name_to_class() -> None:
+    assert VectorBaseDocument.collection_name_to_class("cleaned_posts") is CleanedPostDocument
+    assert CleanedDocument.collection_name_to_class("cleaned_posts") is CleanedPostDocument
+
+    with pytest.raises(ValueError):
+        CleanedDocument.collection_name_to_class("embedded_articles")
+    with pytest.raises(ValueError):
+        VectorBaseDocument.collection_name_to_class("unknown")
+
+
+def test_nosql_document_metadata() -> None:
+    assert ArticleDocument.get_collection_name() == DataCategory.ARTICLES
+    assert [index.document["name"] for index in ArticleDocument.get_indexes()] == ["link_1", "author_id_1"]
+    assert not NoSQLBaseDocument.get_metadata().field_layout.has_embedding
+
+    with pytest.raises(ImproperlyConfigured):
+        Document.get_collection_name()
+
+
+def test_unregister_remaps_the_collection_name() -> None:
+    registry = DocumentRegistry()
+    registry.register(CleanedPostDocument, CleanedPostDocument.get_metadata())
+    registry.register(CleanedDocument, CleanedPostDocument.get_metadata())
+
+    registry.unregister(CleanedPostDocument)
+
+    assert registry.get_classes() == [CleanedDocument]
+    assert registry.get_class("cleaned_posts") is CleanedDocument
+
+    registry.unregister(CleanedDocument)
+
+    assert registry.get_class("cleaned_posts") is None
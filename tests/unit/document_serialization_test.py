@@ -0,0 +1,54 @@
+import uuid
+
+import numpy as np
+
+from llm_engineering.domain.dataset import InstructDataset, InstructDatasetSample
+from llm_engineering.domain.documents import ArticleDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+from llm_engineering.domain.types import DataCategory
+
+
+def test_to_point_serializes_the_payload_in_a_single_pass() -> None:
+    chunk = EmbeddedArticleChunk(
+        content="content",
+        embedding=np.array([0.5, 0.25], dtype=np.float32),
+        platform="medium",
+        document_id=uuid.uuid4(),
+        author_id=uuid.uuid4(),
+        author_full_name="Paul Iusztin",
+        link="https://medium.com/article",
+    )
+
+    point = chunk.to_point()
+
+    assert point.id == str(chunk.id)
+    assert point.vector == [0.5, 0.25]
+    assert point.payload["author_id"] == str(chunk.author_id)
+    assert "id" not in point.payload and "embedding" not in point.payload
+
+
+def test_model_dump_keeps_the_python_mode() -> None:
+    sample = InstructDatasetSample(instruction="question", answer="answer")
+    dataset = InstructDataset(category=DataCategory.ARTICLES, samples=[sample])
+
+    dumped_dataset = dataset.model_dump()
+
+    assert type(dumped_dataset["category"]) is DataCategory
+    assert dumped_dataset["samples"][0]["id"] == str(sample.id)
+
+
+def test_to_mongo_round_trip() -> None:
+    document = ArticleDocument(
+        content={"Title": "title"},
+        platform="medium",
+        author_id=uuid.uuid4(),
+        author_full_name="Paul Iusztin",
+        link="https://medium.com/article",
+    )
+
+    data = document.to_mongo()
+
+    assert data["_id"] == str(document.id)
+    assert data["author_id"] == str(document.author_id)
+    assert "id" not in data
+    assert ArticleDocument.from_mongo(data) == document
@@ -0,0 +1,31 @@
+import numpy as np
+
+from llm_engineering.application.networks.cache import EmbeddingCache
+
+
+def test_embedding_cache_roundtrip(tmp_path) -> None:
+    cache = EmbeddingCache(cache_dir=tmp_path, max_size_bytes=1024 * 1024)
+    key = EmbeddingCache.hash_content("hello world")
+    embedding = np.arange(4, dtype=np.float32)
+
+    cache.put_many("model", {key: embedding})
+
+    assert np.array_equal(cache.get_many("model", [key])[key], embedding)
+    assert cache.get_many("other-model", [key]) == {}
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path) -> None:
+    embedding_size_bytes = 4 * 4
+    cache = EmbeddingCache(cache_dir=tmp_path, max_size_bytes=3 * embedding_size_bytes)
+
+    cache.put_many("model", {"a": np.zeros(4, dtype=np.float32)})
+    cache.put_many("model", {"b": np.zeros(4, dtype=np.float32)})
+    cache.put_many("model", {"c": np.zeros(4, dtype=np.float32)})
+    cache.get_many("model", ["a"])
+    cache.put_many("model", {"d": np.zeros(4, dtype=np.float32)})
+
+    hits = cache.get_many("model", ["a", "b", "c", "d"])
+    assert "a" in hits
+    assert "b" not in hits
+    assert "d" in hits
+    assert cache.size_bytes <= 3 * embedding_size_bytes
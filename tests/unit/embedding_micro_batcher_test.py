@@ -0,0 +1,38 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import numpy as np
+
+from llm_engineering.application.networks.batcher import EmbeddingMicroBatcher
+
+
+def test_micro_batcher_coalesces_concurrent_requests() -> None:
+    batch_sizes = []
+    first_batch_started = Event()
+    release_first_batch = Event()
+
+    def encode(input_text: list[str]) -> np.ndarray:
+        batch_sizes.append(len(input_text))
+        if not first_batch_started.is_set():
+            first_batch_started.set()
+            release_first_batch.wait(timeout=5)
+
+        return np.array([[float(text)] for text in input_text], dtype=np.float32)
+
+    batcher = EmbeddingMicroBatcher(encode=encode, max_batch_size=16, max_wait_ms=0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        first_future = batcher.submit("0")
+        first_batch_started.wait(timeout=5)
+
+        futures = [executor.submit(batcher, [str(i)]) for i in range(1, 9)]
+        while batcher._queue.qsize() < 8:
+            time.sleep(0.001)
+        release_first_batch.set()
+
+        embeddings = [future.result()[0][0] for future in futures]
+    batcher.close()
+
+    assert first_future.result()[0] == 0.0
+    assert embeddings == [float(i) for i in range(1, 9)]
+    assert batch_sizes == [1, 8]
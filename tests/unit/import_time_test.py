@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+from llm_engineering.infrastructure.lazy import LazyProxy
+
+IMPORT_SCRIPT = """
+import json, sys
+
+import llm_engineering
+import llm_engineering.domain
+
+heavy_modules = ["zenml", "torch", "sentence_transformers", "transformers", "chromedriver_autoinstaller"]
+print(json.dumps([name for name in heavy_modules if name in sys.modules]))
+"""
+
+
+def test_cold_import_is_side_effect_free() -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported_modules = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert imported_modules == [], f"Importing llm_engineering imported heavy modules: {imported_modules}"
+
+
+def test_lazy_proxy_creates_the_object_once_on_first_use() -> None:
+    calls = []
+
+    def factory() -> dict:
+        calls.append(1)
+
+        return {"key": "value"}
+
+    proxy = LazyProxy(factory)
+    assert calls == []
+
+    assert proxy["key"] == "value"
+    assert proxy.get("key") == "value"
+    assert calls == [1]
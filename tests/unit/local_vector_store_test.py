@@ -0,0 +1,74 @@
+import numpy as np
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PayloadSchemaType,
+    PointStruct,
+    SearchParams,
+    VectorParams,
+)
+
+from llm_engineering.infrastructure.db.local_vector_store import LocalVectorStore
+
+
+def _create_store(tmp_path, vectors: np.ndarray, **kwargs) -> LocalVectorStore:
+    store = LocalVectorStore(path=tmp_path, **kwargs)
+    store.create_collection("chunks", vectors_config=VectorParams(size=vectors.shape[1], distance=Distance.COSINE))
+    store.upsert(
+        "chunks",
+        points=[
+            PointStruct(id=index, vector=vector.tolist(), payload={"author_id": f"author-{index % 2}"})
+            for index, vector in enumerate(vectors)
+        ],
+    )
+
+    return store
+
+
+def test_local_vector_store_search_with_filter_and_persistence(tmp_path) -> None:
+    vectors = np.eye(4, dtype=np.float32) + 0.1
+    store = _create_store(tmp_path, vectors)
+    store.create_payload_index("chunks", field_name="author_id", field_schema=PayloadSchemaType.KEYWORD)
+    store.close()
+
+    store = LocalVectorStore(path=tmp_path)
+    query_filter = Filter(must=[FieldCondition(key="author_id", match=MatchValue(value="author-1"))])
+    results = store.search("chunks", query_vector=vectors[3].tolist(), limit=2, query_filter=query_filter)
+
+    assert [int(point.id) for point in results] == [3, 1]
+    assert results[0].score > results[1].score
+    assert store.get_collection("chunks").payload_schema["author_id"].data_type == PayloadSchemaType.KEYWORD
+
+
+def test_local_vector_store_approximate_search_finds_the_nearest_neighbours(tmp_path) -> None:
+    vectors = np.random.default_rng(42).standard_normal((2000, 16), dtype=np.float32)
+    store = _create_store(tmp_path, vectors, ann_min_points=500, num_probes=8)
+
+    for index in range(0, 2000, 100):
+        approximate = store.search("chunks", query_vector=vectors[index].tolist(), limit=1)
+        exact = store.search(
+            "chunks", query_vector=vectors[index].tolist(), limit=5, search_params=SearchParams(exact=True)
+        )
+
+        assert int(approximate[0].id) == index
+        assert int(exact[0].id) == index
+        assert [point.score for point in exact] == sorted([point.score for point in exact], reverse=True)
+
+
+def test_odm_runs_on_the_local_vector_store(document_class, local_vector_store) -> None:
+    documents = [document_class(content=f"document {index}", author_id=f"author-{index % 3}") for index in range(25)]
+    summary = document_class.bulk_load(documents, max_batch_bytes=200, max_concurrency=2, max_retries=0)
+    assert summary["num_points"] == 25
+
+    found_documents = []
+    offset = None
+    while True:
+        page, offset = document_class.bulk_find(limit=10, offset=offset)
+        found_documents.extend(page)
+        if offset is None:
+            break
+
+    assert sorted(document.content for document in found_documents) == sorted(doc.content for doc in documents)
+    assert "author_id" in document_class.get_or_create_collection().payload_schema
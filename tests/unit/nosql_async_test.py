@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
+
+
+class _Document(NoSQLBaseDocument):
+    link: str
+
+    class Settings:
+        name = "async_documents"
+
+
+class _FakeCollection:
+    """Blocks every query until released, as a slow MongoDB round trip would."""
+
+    def __init__(self) -> None:
+        self.documents = {}
+        self.released = threading.Event()
+        self.thread_names = set()
+
+    def find_one(self, filter_options: dict) -> dict | None:
+        self.released.wait(timeout=5)
+        self.thread_names.add(threading.current_thread().name)
+
+        for document in self.documents.values():
+            if filter_options.items() <= document.items():
+                return dict(document)
+
+        return None
+
+    def find_one_and_update(self, filter_options: dict, update: dict, **kwargs) -> dict:
+        if (document := self.find_one(filter_options)) is None:
+            document = update["$setOnInsert"]
+            self.documents[document["_id"]] = document
+
+        return dict(document)
+
+    def find(self, filter_options: dict) -> list[dict]:
+        return [dict(document) for document in self.documents.values() if filter_options.items() <= document.items()]
+
+
+def test_async_methods_do_not_block_the_event_loop(monkeypatch) -> None:
+    collection = _FakeCollection()
+    monkeypatch.setattr(nosql, "_database", {"async_documents": collection})
+    monkeypatch.setattr(nosql, "_async_executor", ThreadPoolExecutor(max_workers=2, thread_name_prefix="mongo_async"))
+
+    async def main() -> tuple[_Document, _Document | None, list[_Document]]:
+        pending = asyncio.ensure_future(_Document.aget_or_create(link="link"))
+        # The event loop keeps running while the query waits on the database.
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        collection.released.set()
+        document = await pending
+
+        return document, await _Document.afind(link="link"), await _Document.abulk_find(link="link")
+
+    created, found, bulk_found = asyncio.run(main())
+
+    assert found == created
+    assert bulk_found == [created]
+    assert all(name.startswith("mongo_async") for name in collection.thread_names)
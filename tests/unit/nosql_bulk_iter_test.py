@@ -0,0 +1,91 @@
+import uuid
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.documents import ArticleDocument
+
+
+class _FakeCursor:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.is_closed = False
+
+    def __iter__(self):
+        for document in self.documents:
+            if document.get("fail"):
+                raise OperationFailure("cursor killed")
+
+            yield document
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.is_closed = True
+
+
+class _FakeCollection:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.cursors = []
+
+    def find(self, filter_options: dict, projection: list[str] | None = None, batch_size: int = 0) -> _FakeCursor:
+        documents = [document for document in self.documents if filter_options.items() <= document.items()]
+        if projection is not None:
+            documents = [{key: document[key] for key in ["_id", *projection]} for document in documents]
+
+        cursor = _FakeCursor([dict(document) for document in documents])
+        self.cursors.append((batch_size, cursor))
+
+        return cursor
+
+
+@pytest.fixture
+def collection(monkeypatch, settings) -> _FakeCollection:
+    author_ids = [str(uuid.uuid4()) for _ in range(2)]
+    documents = [
+        ArticleDocument(
+            content={"Content": f"article {index}"},
+            platform="medium",
+            author_id=author_ids[index % 2],
+            author_full_name="Paul Iusztin",
+            link=f"https://medium.com/article-{index}",
+        ).to_mongo()
+        for index in range(5)
+    ]
+    collection = _FakeCollection(documents)
+    monkeypatch.setattr(nosql, "_database", {"articles": collection})
+    settings.DATABASE_CURSOR_BATCH_SIZE = 2
+
+    return collection
+
+
+def test_bulk_iter_streams_documents(collection: _FakeCollection) -> None:
+    author_id = collection.documents[0]["author_id"]
+    documents = list(ArticleDocument.bulk_iter(author_id=author_id))
+
+    assert [document.link for document in documents] == [f"https://medium.com/article-{index}" for index in [0, 2, 4]]
+    assert collection.cursors[0][0] == 2
+    assert collection.cursors[0][1].is_closed
+
+
+def test_bulk_iter_projection_and_raw_mode(collection: _FakeCollection) -> None:
+    documents = list(ArticleDocument.bulk_iter(projection=["link"], batch_size=10))
+
+    assert all(document.model_fields_set == {"id", "link"} for document in documents)
+    assert str(documents[0].id) == collection.documents[0]["_id"]
+    assert list(ArticleDocument.bulk_iter(raw=True)) == collection.documents
+
+
+def test_bulk_iter_raises_when_the_stream_fails(collection: _FakeCollection) -> None:
+    collection.documents[3]["fail"] = True
+
+    streamed_documents = []
+    with pytest.raises(OperationFailure):
+        for document in ArticleDocument.bulk_iter(raw=True):
+            streamed_documents.append(document)
+
+    assert len(streamed_documents) == 3
+    assert collection.cursors[0][1].is_closed
@@ -0,0 +1,83 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
+
+
+class _Document(NoSQLBaseDocument):
+    link: str
+
+    class Settings:
+        name = "upserted_documents"
+
+
+class _FakeCollection:
+    """Stores documents by ID and rejects duplicated links, as a unique index would."""
+
+    def __init__(self) -> None:
+        self.documents = {}
+        self.lock = threading.Lock()
+
+    def bulk_write(self, operations: list[ReplaceOne | UpdateOne], ordered: bool = True) -> SimpleNamespace:
+        assert ordered is False
+
+        details = {"nUpserted": 0, "nMatched": 0, "writeErrors": []}
+        with self.lock:
+            for index, operation in enumerate(operations):
+                filter_, document = operation._filter, operation._doc
+                if isinstance(operation, UpdateOne):
+                    matches = [_id for _id, data in self.documents.items() if data["link"] == filter_["link"]]
+                    _id = matches[0] if matches else document["$setOnInsert"]["_id"]
+                    document = {**self.documents.get(_id, {}), **document["$set"], "_id": _id}
+                else:
+                    _id = filter_["_id"]
+
+                if any(data["link"] == document["link"] and key != _id for key, data in self.documents.items()):
+                    details["writeErrors"].append({"index": index, "code": 11000})
+                    continue
+
+                details["nMatched" if _id in self.documents else "nUpserted"] += 1
+                self.documents[_id] = document
+
+        if len(details["writeErrors"]) > 0:
+            raise BulkWriteError(details)
+
+        return SimpleNamespace(bulk_api_result=details)
+
+
+@pytest.fixture
+def collection(monkeypatch, settings) -> _FakeCollection:
+    collection = _FakeCollection()
+    monkeypatch.setattr(nosql, "_database", {"upserted_documents": collection})
+    settings.DATABASE_BULK_BATCH_SIZE = 3
+    settings.DATABASE_BULK_MAX_CONCURRENCY = 2
+
+    return collection
+
+
+def test_bulk_upsert_is_safe_to_rerun(collection: _FakeCollection) -> None:
+    documents = [_Document(link=f"link-{index}") for index in range(10)]
+    summary = _Document.bulk_upsert(documents)
+
+    assert (summary["num_inserted"], summary["num_updated"], summary["num_failed"]) == (10, 0, 0)
+    assert [batch["num_inserted"] for batch in summary["batches"]] == [3, 3, 3, 1]
+
+    duplicated_link = _Document(link="link-0")
+    summary = _Document.bulk_upsert([*documents, duplicated_link])
+
+    assert (summary["num_inserted"], summary["num_updated"], summary["num_failed"]) == (0, 10, 1)
+    assert len(collection.documents) == 10
+
+
+def test_bulk_upsert_by_key_fields_keeps_the_ids(collection: _FakeCollection) -> None:
+    document = _Document(link="link")
+    _Document.bulk_upsert([document])
+    summary = _Document.bulk_upsert([_Document(link="link")], key_fields=["link"])
+
+    assert (summary["num_inserted"], summary["num_updated"]) == (0, 1)
+    assert list(collection.documents) == [str(document.id)]
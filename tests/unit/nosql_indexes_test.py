@@ -0,0 +1,44 @@
+from typing import ClassVar
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
+
+
+class _Document(NoSQLBaseDocument):
+    link: str
+
+    class Settings:
+        name = "indexed_documents"
+        indexes: ClassVar[list[IndexModel]] = [IndexModel("link"), IndexModel("author_id", unique=True)]
+
+
+class _ChildDocument(_Document):
+    pass
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.index_names = []
+
+    def create_indexes(self, indexes: list[IndexModel]) -> list[str]:
+        index_names = [index.document["name"] for index in indexes]
+        if any(name.startswith("author_id") for name in index_names):
+            raise OperationFailure("E11000 duplicate key error")
+
+        for name in index_names:
+            if name not in self.index_names:
+                self.index_names.append(name)
+
+        return index_names
+
+
+def test_ensure_indexes_is_idempotent_and_skips_failed_indexes(monkeypatch) -> None:
+    database = {"indexed_documents": _FakeCollection()}
+    monkeypatch.setattr(nosql, "_database", database)
+
+    assert _Document.ensure_indexes() == ["link_1"]
+    assert _ChildDocument.ensure_indexes() == ["link_1"]
+    assert database["indexed_documents"].index_names == ["link_1"]
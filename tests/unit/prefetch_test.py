@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from llm_engineering.application.utils import prefetch
+
+
+def test_prefetch_stays_bounded_and_preserves_order() -> None:
+    produced = []
+
+    def items():
+        for number in range(20):
+            produced.append(number)
+            yield number
+
+    results = prefetch(items(), max_size=3)
+    assert next(results) == 0
+
+    time.sleep(0.2)
+    # One item was consumed, `max_size` items are buffered and one is blocked on the full buffer.
+    assert len(produced) == 5
+
+    assert list(results) == list(range(1, 20))
+
+
+def test_prefetch_reraises_producer_errors() -> None:
+    def items():
+        yield 1
+        raise ValueError("Failed to produce.")
+
+    results = prefetch(items(), max_size=2)
+
+    assert next(results) == 1
+    with pytest.raises(ValueError, match="Failed to produce."):
+        next(results)
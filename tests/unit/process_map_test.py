@@ -0,0 +1,29 @@
+import os
+
+from llm_engineering.application.utils import process_map
+
+
+def _square_with_pid(numbers: list[int]) -> list[tuple[int, int]]:
+    return [(number * number, os.getpid()) for number in numbers]
+
+
+def test_process_map_preserves_order_in_worker_processes() -> None:
+    results = list(process_map(_square_with_pid, range(50), num_workers=2, chunk_size=4))
+
+    assert [square for square, _ in results] == [number * number for number in range(50)]
+    assert os.getpid() not in {pid for _, pid in results}
+
+
+def test_process_map_runs_in_current_process_without_workers() -> None:
+    consumed = []
+
+    def items():
+        for number in range(10):
+            consumed.append(number)
+            yield number
+
+    results = process_map(_square_with_pid, items(), num_workers=0, chunk_size=3)
+
+    assert next(results)[0] == 0
+    assert consumed == [0, 1, 2]
+    assert [square for square, _ in results] == [number * number for number in range(1, 10)]
@@ -0,0 +1,41 @@
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+from transformers import PreTrainedTokenizerFast
+
+from llm_engineering.application.preprocessing.operations import split_text_on_tokens
+
+
+def _build_tokenizer(text: str) -> PreTrainedTokenizerFast:
+    vocab = {"[UNK]": 0}
+    for word in text.split():
+        vocab.setdefault(word, len(vocab))
+
+    tokenizer = Tokenizer(WordLevel(vocab=vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, unk_token="[UNK]")
+
+
+def test_split_text_on_tokens_windows_overlap_and_keep_original_text() -> None:
+    text = "A b C d E f G"
+    tokenizer = _build_tokenizer(text)
+
+    chunks, num_tokens = split_text_on_tokens(
+        text, tokenizer=tokenizer, chunk_size=1000, tokens_per_chunk=3, chunk_overlap=1
+    )
+
+    assert chunks == ["A b C", "C d E", "E f G"]
+    assert num_tokens == [3, 3, 3]
+
+
+def test_split_text_on_tokens_respects_paragraph_boundaries() -> None:
+    text = "one two\n\nthree four\n\n\n\nfive six seven"
+    tokenizer = _build_tokenizer(text)
+
+    chunks, num_tokens = split_text_on_tokens(
+        text, tokenizer=tokenizer, chunk_size=20, tokens_per_chunk=10, chunk_overlap=0
+    )
+
+    assert chunks == ["one two\n\nthree four", "five six seven"]
+    assert num_tokens == [4, 3]
@@ -0,0 +1,19 @@
+from llm_engineering.application.preprocessing.operations import token_budget_batches
+
+
+def test_token_budget_batches_groups_similar_lengths() -> None:
+    num_tokens = [250, 1500, 240, 1400, 260]
+
+    batches = token_budget_batches(num_tokens, max_tokens_per_batch=3000)
+
+    assert batches == [[2, 0, 4], [3, 1]]
+
+
+def test_token_budget_batches_covers_every_sequence_once() -> None:
+    num_tokens = [5, 0, 512, 17, 512, 3, 80]
+
+    batches = token_budget_batches(num_tokens, max_tokens_per_batch=256)
+
+    assert sorted(index for batch in batches for index in batch) == list(range(len(num_tokens)))
+    for batch in batches:
+        assert len(batch) == 1 or max(num_tokens[index] for index in batch) * len(batch) <= 256
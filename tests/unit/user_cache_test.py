@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from pymongo import ReturnDocument
+
+from llm_engineering.domain import documents
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.documents import UserDocument
+from llm_engineering.infrastructure.ttl_cache import TTLCache
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.documents = {}
+        self.num_round_trips = 0
+
+    def find_one_and_update(self, filter_options: dict, update: dict, upsert: bool, return_document) -> dict:
+        assert upsert is True
+        assert return_document == ReturnDocument.AFTER
+        self.num_round_trips += 1
+
+        matches = [document for document in self.documents.values() if filter_options.items() <= document.items()]
+        if len(matches) > 0:
+            return dict(matches[0])
+
+        document = update["$setOnInsert"]
+        self.documents[document["_id"]] = document
+
+        return dict(document)
+
+    def find_one(self, filter_options: dict) -> dict | None:
+        self.num_round_trips += 1
+
+        matches = [document for document in self.documents.values() if filter_options.items() <= document.items()]
+
+        return dict(matches[0]) if len(matches) > 0 else None
+
+
+def test_get_or_create_is_a_single_upsert_served_from_the_cache(monkeypatch) -> None:
+    collection = _FakeCollection()
+    monkeypatch.setattr(nosql, "_database", {"users": collection})
+    monkeypatch.setattr(documents, "_users_cache", TTLCache(max_size=10, ttl_seconds=60))
+
+    user = UserDocument.get_or_create(first_name="Paul", last_name="Iusztin")
+    assert collection.num_round_trips == 1
+    assert list(collection.documents) == [str(user.id)]
+
+    assert UserDocument.get_or_create(first_name="Paul", last_name="Iusztin") is user
+    assert UserDocument.get_by_id(user.id) is user
+    assert collection.num_round_trips == 1
+
+    documents._users_cache.clear()
+    assert UserDocument.get_or_create(first_name="Paul", last_name="Iusztin").id == user.id
+    assert len(collection.documents) == 1
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(monkeypatch) -> None:
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr("llm_engineering.infrastructure.ttl_cache.time.monotonic", lambda: now.value)
+
+    cache = TTLCache(max_size=2, ttl_seconds=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+    now.value = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
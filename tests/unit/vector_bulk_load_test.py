@@ -0,0 +1,50 @@
+from qdrant_client.models import PointStruct
+
+from llm_engineering.domain.base.vector import _batch_by_size
+from llm_engineering.infrastructure.db.vector_store import get_bytes_per_dimension
+
+
+def test_batch_by_size_respects_the_byte_budget() -> None:
+    points = [PointStruct(id=index, vector=[0.0] * 10, payload={"content": "x" * 100}) for index in range(10)]
+    point_bytes = 20 * 10 + len("content") + 100
+
+    batches = list(_batch_by_size(points, max_batch_bytes=3 * point_bytes))
+
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert [point.id for batch in batches for point in batch] == list(range(10))
+
+
+def test_bytes_per_dimension_follows_the_backend_and_transport(settings) -> None:
+    assert get_bytes_per_dimension() == 20
+
+    settings.QDRANT_PREFER_GRPC = True
+    assert get_bytes_per_dimension() == 4
+
+    settings.QDRANT_PREFER_GRPC = False
+    settings.VECTOR_DB_BACKEND = "local"
+    assert get_bytes_per_dimension() == 4
+
+
+def test_bulk_load_retries_and_waits_on_the_last_batch(document_class, fake_connection) -> None:
+    fake_connection.num_upsert_failures = 2
+
+    documents = [document_class(content="x" * 100) for _ in range(10)]
+    summary = document_class.bulk_load(
+        documents, max_batch_bytes=300, max_concurrency=2, max_retries=2, retry_backoff_seconds=0
+    )
+
+    assert summary["num_points"] == 10
+    assert summary["num_failed_batches"] == 0
+    assert sum(num_points for num_points, _ in fake_connection.upserts) == 10
+    assert [wait for _, wait in fake_connection.upserts].count(True) == 1
+    assert fake_connection.upserts[-1][1] is True
+
+
+def test_bulk_load_can_skip_the_collection_check(document_class, fake_connection) -> None:
+    document_class.get_or_create_collection()
+    num_collection_checks = fake_connection.num_collection_checks
+    for _ in range(3):
+        document_class.bulk_load([document_class(content="x")], max_concurrency=1, create_collection=False)
+
+    assert fake_connection.num_collection_checks == num_collection_checks
+    assert len(fake_connection.upserts) == 3
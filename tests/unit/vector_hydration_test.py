@@ -0,0 +1,59 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client.models import Record
+
+from llm_engineering.domain.dataset import InstructDataset
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+from llm_engineering.domain.types import DataCategory
+
+
+def _create_record(**payload) -> Record:
+    chunk = EmbeddedArticleChunk(
+        content="content",
+        embedding=[0.1, 0.2, 0.3],
+        platform="medium",
+        document_id=uuid.uuid4(),
+        author_id=uuid.uuid4(),
+        author_full_name="Paul Iusztin",
+        link="https://medium.com/article",
+    )
+    point = chunk.to_point()
+
+    return Record(id=point.id, payload={**point.payload, **payload}, vector=point.vector)
+
+
+def test_fast_hydration_matches_strict_hydration() -> None:
+    record = _create_record()
+
+    chunk = EmbeddedArticleChunk.from_record(record)
+    strict_chunk = EmbeddedArticleChunk.from_record(record, strict=True)
+
+    assert chunk.model_dump() == strict_chunk.model_dump()
+    assert chunk.model_fields_set == strict_chunk.model_fields_set
+    assert isinstance(chunk.author_id, uuid.UUID)
+    assert chunk.embedding.dtype == np.float32
+
+
+def test_strict_hydration_rejects_undeclared_fields(settings) -> None:
+    record = _create_record(legacy_field="value")
+
+    assert EmbeddedArticleChunk.from_record(record).content == "content"
+
+    settings.VECTOR_DB_STRICT_HYDRATION = True
+    with pytest.raises(ValueError, match="legacy_field"):
+        EmbeddedArticleChunk.from_record(record)
+
+
+def test_hydration_of_nested_models() -> None:
+    record = Record(
+        id=str(uuid.uuid4()),
+        payload={"category": "articles", "samples": [{"instruction": "question", "answer": "answer"}]},
+    )
+
+    dataset = InstructDataset.from_record(record)
+
+    assert not InstructDataset.get_field_layout().has_embedding
+    assert dataset.category == DataCategory.ARTICLES
+    assert dataset.samples[0].answer == "answer"
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from qdrant_client.models import Distance, FieldCondition, Filter, MatchValue, VectorParams
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.types import DataCategory, Embedding
+from llm_engineering.infrastructure.db.local_vector_store import LocalVectorStore
+
+
+class _EmbeddedDocument(VectorBaseDocument):
+    content: str
+    embedding: Embedding | None
+
+    class Config:
+        name = "embedded_documents"
+        category = DataCategory.POSTS
+
+
+@pytest.fixture
+def documents(document_class, local_vector_store, settings) -> list[VectorBaseDocument]:
+    settings.VECTOR_DB_SCROLL_PAGE_SIZE = 4
+
+    documents = [document_class(content=f"document {index}", platform=f"platform-{index % 2}") for index in range(11)]
+    document_class.bulk_load(documents, max_batch_bytes=1024, max_concurrency=1, max_retries=0)
+
+    return documents
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_streams_every_page(document_class, documents: list[VectorBaseDocument], prefetch: bool) -> None:
+    iterated_documents = list(document_class.iter_all(prefetch=prefetch))
+
+    assert sorted(document.id for document in iterated_documents) == sorted(document.id for document in documents)
+
+
+def test_iter_all_projects_and_filters(document_class, documents: list[VectorBaseDocument]) -> None:
+    scroll_filter = Filter(must=[FieldCondition(key="platform", match=MatchValue(value="platform-1"))])
+    iterated_documents = list(
+        document_class.iter_all(page_size=2, with_payload=["content"], scroll_filter=scroll_filter)
+    )
+
+    assert len(iterated_documents) == 5
+    assert all(document.content.startswith("document") for document in iterated_documents)
+    assert all("platform" not in document.model_fields_set for document in iterated_documents)
+
+
+def test_iter_all_projects_fields_with_vectors(local_vector_store: LocalVectorStore) -> None:
+    local_vector_store.create_collection(
+        "embedded_documents", vectors_config=VectorParams(size=3, distance=Distance.COSINE)
+    )
+    documents = [_EmbeddedDocument(content=f"document {index}", embedding=np.eye(3)[index]) for index in range(3)]
+    _EmbeddedDocument.bulk_load(documents, max_batch_bytes=1024, max_concurrency=1, max_retries=0)
+
+    iterated_documents = {
+        document.id: document for document in _EmbeddedDocument.iter_all(with_payload=["content"], with_vectors=True)
+    }
+
+    for document in documents:
+        iterated_document = iterated_documents[document.id]
+        assert iterated_document.content == document.content
+        assert iterated_document.embedding.dtype == np.float32
+        np.testing.assert_allclose(iterated_document.embedding, document.embedding)
+        assert iterated_document.model_fields_set == {"id", "content", "embedding"}
+
+    iterated_document = next(_EmbeddedDocument.iter_all(with_payload=["content"]))
+    assert iterated_document.model_fields_set == {"id", "content"}
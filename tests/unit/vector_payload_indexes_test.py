@@ -0,0 +1,22 @@
+from qdrant_client.models import PayloadIndexInfo, PayloadSchemaType
+
+
+def test_get_or_create_collection_reconciles_payload_indexes(document_class, fake_connection) -> None:
+    fake_connection.payload_schema = {
+        "author_id": PayloadIndexInfo(data_type=PayloadSchemaType.INTEGER, points=0),
+        "content": PayloadIndexInfo(data_type=PayloadSchemaType.TEXT, points=0),
+    }
+
+    collection_info = document_class.get_or_create_collection()
+
+    assert fake_connection.operations == [("delete", "author_id"), ("create", "author_id"), ("create", "platform")]
+    assert {name: info.data_type for name, info in collection_info.payload_schema.items()} == {
+        "author_id": PayloadSchemaType.KEYWORD,
+        "platform": PayloadSchemaType.KEYWORD,
+        "content": PayloadSchemaType.TEXT,
+    }
+
+    fake_connection.operations.clear()
+    document_class.get_or_create_collection()
+
+    assert fake_connection.operations == []
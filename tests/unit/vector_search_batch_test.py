@@ -0,0 +1,32 @@
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.types import DataCategory
+
+
+class _PostDocument(VectorBaseDocument):
+    content: str
+
+    class Config:
+        name = "posts"
+        category = DataCategory.POSTS
+
+
+class _ArticleDocument(VectorBaseDocument):
+    content: str
+
+    class Config:
+        name = "articles"
+        category = DataCategory.ARTICLES
+
+
+def test_search_batch_collections_sends_one_request_per_collection(fake_connection) -> None:
+    results = VectorBaseDocument.search_batch_collections(
+        [_PostDocument, _ArticleDocument], query_vectors=[[0.0], [1.0], [2.0]], limit=1
+    )
+
+    assert sorted(fake_connection.search_requests) == [("articles", 3), ("posts", 3)]
+    assert [[document.content for document in documents] for documents in results[_PostDocument]] == [
+        ["posts-0.0"],
+        ["posts-1.0"],
+        ["posts-2.0"],
+    ]
+    assert all(isinstance(documents[0], _ArticleDocument) for documents in results[_ArticleDocument])
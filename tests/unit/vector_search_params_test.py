@@ -0,0 +1,46 @@
+from qdrant_client.models import BinaryQuantization, BinaryQuantizationConfig, SearchParams
+
+from llm_engineering.domain import embedded_chunks
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedPostChunk
+from llm_engineering.domain.types import DataCategory
+
+
+class _QuantizedDocument(VectorBaseDocument):
+    content: str
+
+    class Config:
+        name = "quantized_documents"
+        category = DataCategory.POSTS
+        quantization_config = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+
+
+def test_search_params_from_knobs(document_class) -> None:
+    assert document_class._pop_search_params({}) is None
+    assert document_class._pop_search_params({"oversampling": 2.0}) is None
+
+    kwargs = {"hnsw_ef": 128, "oversampling": 2.0, "score_threshold": 0.5}
+    search_params = _QuantizedDocument._pop_search_params(kwargs)
+
+    assert kwargs == {"score_threshold": 0.5}
+    assert search_params.hnsw_ef == 128
+    assert search_params.quantization.oversampling == 2.0
+    assert search_params.quantization.rescore is True
+
+
+def test_explicit_search_params_take_precedence(document_class, settings) -> None:
+    settings.QDRANT_SEARCH_HNSW_EF = 64
+
+    assert document_class._pop_search_params({}) == SearchParams(hnsw_ef=64)
+    assert document_class._pop_search_params({"search_params": SearchParams(exact=True)}) == SearchParams(exact=True)
+
+
+def test_chunk_quantization_and_on_disk_vectors_are_opt_in(settings) -> None:
+    assert EmbeddedPostChunk.get_quantization_config() is None
+    assert EmbeddedPostChunk.get_vectors_on_disk() is None
+
+    settings.VECTOR_DB_CHUNK_QUANTIZATION = True
+    settings.VECTOR_DB_CHUNK_VECTORS_ON_DISK = True
+
+    assert EmbeddedPostChunk.get_quantization_config() == embedded_chunks.CHUNK_QUANTIZATION_CONFIG
+    assert EmbeddedPostChunk.get_vectors_on_disk() is True
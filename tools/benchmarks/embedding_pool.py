@@ -0,0 +1,78 @@
+import random
+import time
+
+import click
+from loguru import logger
+
+from llm_engineering.application.networks import EmbeddingModelSingleton
+from llm_engineering.application.preprocessing.operations import token_budget_batches
+from llm_engineering.settings import settings
+
+
+@click.command(help="Benchmark the embedding throughput (chunks/sec) against the number of worker processes.")
+@click.option(
+    "--num-chunks",
+    default=2000,
+    type=int,
+    help="Number of synthetic chunks to embed.",
+)
+@click.option(
+    "--num-workers",
+    "num_workers_list",
+    default="0,1,2,4,8",
+    help="Comma-separated list of worker counts to benchmark. 0 encodes in the current process.",
+)
+@click.option(
+    "--max-tokens-per-batch",
+    default=settings.EMBEDDING_MAX_TOKENS_PER_BATCH,
+    type=int,
+    help="Token budget of a single forward pass.",
+)
+def main(num_chunks: int, num_workers_list: str, max_tokens_per_batch: int) -> None:
+    embedding_model = EmbeddingModelSingleton()
+    chunks = __generate_chunks(num_chunks)
+
+    num_tokens = embedding_model.count_tokens(chunks)
+    batches = [
+        [chunks[index] for index in batch_indices]
+        for batch_indices in token_budget_batches(num_tokens, max_tokens_per_batch=max_tokens_per_batch)
+    ]
+    logger.info(f"Embedding {num_chunks} chunks ({sum(num_tokens)} tokens) in {len(batches)} batches.")
+
+    for num_workers in [int(n) for n in num_workers_list.split(",")]:
+        if num_workers == 0:
+            start_time = time.perf_counter()
+            for batch in batches:
+                embedding_model(batch, to_list=False, batch_size=len(batch))
+            elapsed_time = time.perf_counter() - start_time
+        else:
+            with embedding_model.start_process_pool(num_workers=num_workers) as pool:
+                # Wait for every worker to load its model and warm up with one batch per worker, so neither is measured.
+                pool.wait_until_ready()
+                list(pool.imap(batches[:1] * pool.num_workers))
+
+                start_time = time.perf_counter()
+                for _ in pool.imap(batches):
+                    pass
+                elapsed_time = time.perf_counter() - start_time
+
+        logger.info(
+            f"num_workers={num_workers}: {num_chunks / elapsed_time:.1f} chunks/sec ({elapsed_time:.2f} sec total)"
+        )
+
+
+def __generate_chunks(num_chunks: int) -> list[str]:
+    # Mix short post-like chunks with long repository-like chunks, as in the feature pipeline.
+    rng = random.Random(42)
+    vocabulary = ["retrieval", "augmented", "generation", "vector", "database", "embedding", "model", "chunk", "query"]
+
+    chunks = []
+    for _ in range(num_chunks):
+        num_words = rng.choice([180, 1100])
+        chunks.append(" ".join(rng.choice(vocabulary) for _ in range(num_words)))
+
+    return chunks
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import time
+import uuid
+
+import click
+import numpy as np
+from loguru import logger
+from pymongo import IndexModel
+from pymongo.collection import Collection
+
+from llm_engineering.infrastructure.db.mongo import connection
+from llm_engineering.settings import settings
+
+
+@click.command(help="Benchmark the latency of MongoDB lookups by link and author against the collection size.")
+@click.option(
+    "--collection-sizes",
+    "collection_sizes_list",
+    default="1000,10000,100000",
+    help="Comma-separated list of collection sizes to benchmark.",
+)
+@click.option(
+    "--num-queries",
+    default=200,
+    type=int,
+    help="Number of timed lookups per collection size and index setup.",
+)
+def main(collection_sizes_list: str, num_queries: int) -> None:
+    database = connection.get_database(settings.DATABASE_NAME)
+    rng = np.random.default_rng(42)
+    author_ids = [str(uuid.uuid4()) for _ in range(100)]
+
+    for collection_size in [int(n) for n in collection_sizes_list.split(",")]:
+        collection = database[f"benchmark_indexes_{uuid.uuid4().hex[:8]}"]
+        try:
+            collection.insert_many(
+                (
+                    {
+                        "_id": str(uuid.uuid4()),
+                        "link": f"https://medium.com/article-{index}",
+                        "author_id": author_ids[index % len(author_ids)],
+                        "content": {"Content": "retrieval augmented generation " * 30},
+                    }
+                    for index in range(collection_size)
+                ),
+                ordered=False,
+            )
+            queries = {
+                "find(link)": [
+                    {"link": f"https://medium.com/article-{index}"}
+                    for index in rng.integers(0, collection_size, num_queries)
+                ],
+                "find(author_id)": [{"author_id": str(author_id)} for author_id in rng.choice(author_ids, num_queries)],
+            }
+
+            latencies = {"without index": __time_lookups(collection, queries)}
+            collection.create_indexes([IndexModel("link"), IndexModel("author_id")])
+            latencies["with index"] = __time_lookups(collection, queries)
+        finally:
+            collection.drop()
+
+        for setup, setup_latencies in latencies.items():
+            for query_name, query_latencies in setup_latencies.items():
+                logger.info(
+                    f"collection_size={collection_size} {setup}: {query_name} "
+                    f"p50={np.percentile(query_latencies, 50):.2f}ms p95={np.percentile(query_latencies, 95):.2f}ms"
+                )
+
+
+def __time_lookups(collection: Collection, queries: dict[str, list[dict]]) -> dict[str, list[float]]:
+    latencies = {}
+    for query_name, filters in queries.items():
+        list(collection.find(filters[0], projection={"_id": 1}))  # Warm up.
+
+        latencies[query_name] = []
+        for filter_ in filters:
+            start_time = time.perf_counter()
+            list(collection.find(filter_, projection={"_id": 1}))
+            latencies[query_name].append((time.perf_counter() - start_time) * 1000)
+
+    return latencies
+
+
+if __name__ == "__main__":
+    main()
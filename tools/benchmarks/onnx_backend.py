@@ -0,0 +1,113 @@
+import time
+
+import click
+import numpy as np
+from loguru import logger
+from sentence_transformers.SentenceTransformer import SentenceTransformer
+from sentence_transformers.cross_encoder import CrossEncoder
+from transformers.modeling_outputs import BaseModelOutput, SequenceClassifierOutput
+
+from llm_engineering.application.networks.onnx_backend import InferenceBackend, cosine_drift, load_onnx_model
+from llm_engineering.settings import settings
+
+
+@click.command(help="Benchmark the latency and the parity against torch of the ONNX inference backends.")
+@click.option(
+    "--num-runs",
+    default=100,
+    type=int,
+    help="Number of timed single-query runs per backend.",
+)
+@click.option(
+    "--num-documents",
+    default=30,
+    type=int,
+    help="Number of documents reranked per query by the cross-encoder.",
+)
+def main(num_runs: int, num_documents: int) -> None:
+    queries = [f"How do I integrate a vector database number {i} with a large language model?" for i in range(num_runs)]
+    documents = [
+        f"Chunk {i}: retrieval-augmented generation retrieves the most similar chunks from Qdrant "
+        "and passes them as context to the LLM, which reduces hallucinations and grounds the answer."
+        for i in range(num_documents)
+    ]
+
+    reference_embeddings = None
+    reference_scores = None
+    for backend in InferenceBackend:
+        embedding_model = __load_embedding_model(backend)
+        embeddings = embedding_model.encode(queries)
+        embedding_latencies = __time_runs(lambda query, model=embedding_model: model.encode(query), queries)
+
+        cross_encoder_model = __load_cross_encoder_model(backend)
+        pairs = [(queries[0], document) for document in documents]
+        scores = cross_encoder_model.predict(pairs)
+        reranking_latencies = __time_runs(
+            lambda query, model=cross_encoder_model: model.predict([(query, document) for document in documents]),
+            queries,
+        )
+
+        if backend == InferenceBackend.TORCH:
+            reference_embeddings, reference_scores = embeddings, scores
+
+        parity = cosine_drift(reference_embeddings, embeddings)
+        max_abs_score_drift = float(np.abs(reference_scores - scores).max())
+
+        logger.info(
+            f"backend={backend}: "
+            f"embedding p50={np.percentile(embedding_latencies, 50):.2f}ms p95={np.percentile(embedding_latencies, 95):.2f}ms, "
+            f"reranking p50={np.percentile(reranking_latencies, 50):.2f}ms p95={np.percentile(reranking_latencies, 95):.2f}ms, "
+            f"mean_cosine_drift={parity['mean_cosine_drift']:.2e} max_cosine_drift={parity['max_cosine_drift']:.2e}, "
+            f"{max_abs_score_drift=:.2e}"
+        )
+
+
+def __load_embedding_model(backend: InferenceBackend) -> SentenceTransformer:
+    model = SentenceTransformer(settings.TEXT_EMBEDDING_MODEL_ID, device="cpu")
+    model.eval()
+
+    if backend != InferenceBackend.TORCH:
+        transformer = model[0]
+        transformer.auto_model = load_onnx_model(
+            transformer.auto_model,
+            tokenizer=model.tokenizer,
+            model_id=settings.TEXT_EMBEDDING_MODEL_ID,
+            backend=backend,
+            cache_dir=settings.RAG_MODEL_ONNX_CACHE_DIR,
+            output_class=BaseModelOutput,
+        )
+
+    return model
+
+
+def __load_cross_encoder_model(backend: InferenceBackend) -> CrossEncoder:
+    model = CrossEncoder(model_name=settings.RERANKING_CROSS_ENCODER_MODEL_ID, device="cpu")
+    model.model.eval()
+
+    if backend != InferenceBackend.TORCH:
+        model.model = load_onnx_model(
+            model.model,
+            tokenizer=model.tokenizer,
+            model_id=settings.RERANKING_CROSS_ENCODER_MODEL_ID,
+            backend=backend,
+            cache_dir=settings.RAG_MODEL_ONNX_CACHE_DIR,
+            output_class=SequenceClassifierOutput,
+        )
+
+    return model
+
+
+def __time_runs(run, queries: list[str]) -> list[float]:
+    run(queries[0])  # Warm up.
+
+    latencies = []
+    for query in queries:
+        start_time = time.perf_counter()
+        run(query)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+
+    return latencies
+
+
+if __name__ == "__main__":
+    main()
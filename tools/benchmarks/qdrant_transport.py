@@ -0,0 +1,89 @@
+import time
+import uuid
+
+import click
+import numpy as np
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from llm_engineering.infrastructure.db.qdrant import QdrantDatabaseConnector
+from llm_engineering.settings import settings
+
+
+@click.command(help="Benchmark bulk upsert throughput and search latency of the HTTP and gRPC Qdrant transports.")
+@click.option(
+    "--num-points",
+    default=20000,
+    type=int,
+    help="Number of synthetic points to upsert.",
+)
+@click.option(
+    "--batch-size",
+    default=256,
+    type=int,
+    help="Number of points per upsert request.",
+)
+@click.option(
+    "--num-queries",
+    default=200,
+    type=int,
+    help="Number of timed searches.",
+)
+@click.option(
+    "--embedding-size",
+    default=384,
+    type=int,
+    help="Size of the synthetic vectors. Defaults to the size of the default embedding model.",
+)
+def main(num_points: int, batch_size: int, num_queries: int, embedding_size: int) -> None:
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((num_points, embedding_size), dtype=np.float32)
+    query_vectors = rng.standard_normal((num_queries, embedding_size), dtype=np.float32)
+    payload_content = "retrieval augmented generation " * 30
+
+    for transport, prefer_grpc in [("HTTP", False), ("gRPC", True)]:
+        client = QdrantClient(
+            host=settings.QDRANT_DATABASE_HOST,
+            port=settings.QDRANT_DATABASE_PORT,
+            **QdrantDatabaseConnector.transport_options(prefer_grpc=prefer_grpc),
+        )
+        collection_name = f"benchmark_{transport.lower()}_{uuid.uuid4().hex[:8]}"
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=embedding_size, distance=Distance.COSINE),
+        )
+
+        try:
+            start_time = time.perf_counter()
+            for batch_start in range(0, num_points, batch_size):
+                points = [
+                    PointStruct(
+                        id=str(uuid.uuid4()),
+                        vector=vector.tolist(),
+                        payload={"content": payload_content, "author_id": str(index % 10)},
+                    )
+                    for index, vector in enumerate(vectors[batch_start : batch_start + batch_size], start=batch_start)
+                ]
+                client.upsert(collection_name=collection_name, points=points, wait=True)
+            upsert_duration = time.perf_counter() - start_time
+
+            client.search(collection_name=collection_name, query_vector=query_vectors[0].tolist(), limit=10)  # Warm up.
+            search_latencies = []
+            for query_vector in query_vectors:
+                start_time = time.perf_counter()
+                client.search(collection_name=collection_name, query_vector=query_vector.tolist(), limit=10)
+                search_latencies.append((time.perf_counter() - start_time) * 1000)
+        finally:
+            client.delete_collection(collection_name=collection_name)
+            client.close()
+
+        logger.info(
+            f"transport={transport}: "
+            f"upsert {num_points / upsert_duration:.1f} points/sec ({upsert_duration:.2f} sec total), "
+            f"search p50={np.percentile(search_latencies, 50):.2f}ms p95={np.percentile(search_latencies, 95):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+import uuid
+
+import click
+import numpy as np
+from loguru import logger
+from qdrant_client.models import Record
+
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+
+
+@click.command(help="Benchmark the hydration throughput (records/sec) of vector DB records in both modes.")
+@click.option(
+    "--num-records",
+    default=20000,
+    type=int,
+    help="Number of synthetic records to hydrate.",
+)
+@click.option(
+    "--embedding-size",
+    default=384,
+    type=int,
+    help="Size of the synthetic vectors. Defaults to the size of the default embedding model.",
+)
+@click.option(
+    "--with-vectors/--without-vectors",
+    default=False,
+    help="Whether the records hold their vectors, as with `with_vectors=True`.",
+)
+def main(num_records: int, embedding_size: int, with_vectors: bool) -> None:
+    records = __generate_records(num_records, embedding_size=embedding_size, with_vectors=with_vectors)
+
+    for mode, strict in [("strict", True), ("fast", False)]:
+        EmbeddedArticleChunk.from_record(records[0], strict=strict)  # Warm up.
+
+        start_time = time.perf_counter()
+        for record in records:
+            EmbeddedArticleChunk.from_record(record, strict=strict)
+        elapsed_time = time.perf_counter() - start_time
+
+        logger.info(f"mode={mode}: {num_records / elapsed_time:.1f} records/sec ({elapsed_time:.2f} sec total)")
+
+
+def __generate_records(num_records: int, embedding_size: int, with_vectors: bool) -> list[Record]:
+    rng = np.random.default_rng(42)
+    author_ids = [str(uuid.uuid4()) for _ in range(10)]
+    content = "retrieval augmented generation " * 30
+
+    records = []
+    for index in range(num_records):
+        payload = {
+            "content": content,
+            "platform": "medium",
+            "document_id": str(uuid.uuid4()),
+            "author_id": author_ids[index % len(author_ids)],
+            "author_full_name": "Paul Iusztin",
+            "metadata": {"chunk_size": 500, "chunk_overlap": 50},
+            "link": f"https://medium.com/article-{index}",
+        }
+        vector = rng.standard_normal(embedding_size, dtype=np.float32).tolist() if with_vectors else None
+        records.append(Record(id=str(uuid.uuid4()), payload=payload, vector=vector))
+
+    return records
+
+
+if __name__ == "__main__":
+    main()
@@ -52,19 +52,33 @@ def __export(data_dir: Path) -> None:
 
 
 def __export_data_category(data_dir: Path, category_class: type[NoSQLBaseDocument]) -> None:
-    data = category_class.bulk_find()
-    serialized_data = [d.to_mongo() for d in data]
     export_file = data_dir / f"{category_class.__name__}.json"
 
-    logger.info(f"Exporting {len(serialized_data)} items of {category_class.__name__} to {export_file}...")
-    with export_file.open("w") as f:
-        json.dump(serialized_data, f)
+    logger.info(f"Exporting {category_class.__name__} to {export_file}...")
+    # The documents are streamed as stored in MongoDB, so memory is bounded by the cursor's batch size.
+    # They are written to a temporary file first, so a failed query doesn't leave a truncated export behind.
+    partial_export_file = export_file.with_suffix(".json.partial")
+    num_items = 0
+    with partial_export_file.open("w") as f:
+        f.write("[")
+        for document in category_class.bulk_iter(raw=True):
+            if num_items > 0:
+                f.write(", ")
+            json.dump(document, f)
+
+            num_items += 1
+        f.write("]")
+    partial_export_file.replace(export_file)
+
+    logger.info(f"Exported {num_items} items of {category_class.__name__} to {export_file}.")
 
 
 def __import(data_dir: Path) -> None:
     logger.info(f"Importing data warehouse from {data_dir}...")
     assert data_dir.is_dir(), f"{data_dir} is not a directory or it doesn't exists."
 
+    NoSQLBaseDocument.ensure_indexes()
+
     data_category_classes = {
         "ArticleDocument": ArticleDocument,
         "PostDocument": PostDocument,
@@ -91,8 +105,12 @@ def __import_data_category(file: Path, category_class: type[NoSQLBaseDocument])
 
     logger.info(f"Importing {len(data)} items of {category_class.__name__} from {file}...")
     if len(data) > 0:
-        deserialized_data = [category_class.from_mongo(d) for d in data]
-        category_class.bulk_insert(deserialized_data)
+        deserialized_data = (category_class.from_mongo(d) for d in data)
+        summary = category_class.bulk_upsert(deserialized_data)
+        logger.info(
+            f"Imported {category_class.__name__}: {summary['num_inserted']} inserted, "
+            f"{summary['num_updated']} updated, {summary['num_failed']} failed."
+        )
 
 
 if __name__ == "__main__":
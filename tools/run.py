@@ -5,16 +5,6 @@ import click
 from loguru import logger
 
 from llm_engineering import settings
-from pipelines import (
-    digital_data_etl,
-    end_to_end_data,
-    evaluating,
-    export_artifact_to_json,
-    feature_engineering,
-    generate_datasets,
-    training,
-    upload_processing,
-)
 
 
 @click.command(
@@ -151,6 +141,18 @@ def main(
         or run_upload_processing
     ), "Please specify an action to run."
 
+    # The pipelines are imported here, so `--help` doesn't pay for importing ZenML and the models.
+    from pipelines import (
+        digital_data_etl,
+        end_to_end_data,
+        evaluating,
+        export_artifact_to_json,
+        feature_engineering,
+        generate_datasets,
+        training,
+        upload_processing,
+    )
+
     if export_settings:
         logger.info("Exporting settings to ZenML secrets.")
         settings.export()